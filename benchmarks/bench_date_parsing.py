@@ -0,0 +1,73 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import datetime
+import random
+import time
+from typing import List
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_row_parser import PaymentsRowParser
+from tests.helpers import CreatePaymentConfig
+
+
+ROWS_NUM = 100000
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%d %b %Y")
+DISTINCT_DATES_NUMS = (300, ROWS_NUM)
+
+
+def _CreateDates(date_format: str,
+                 distinct_dates_num: int) -> List[str]:
+    rnd = random.Random(0)
+    first_date = datetime.date(1800, 1, 1).toordinal()
+    dates = [datetime.date.fromordinal(first_date + i * 3).strftime(date_format) for i in range(distinct_dates_num)]
+    return [rnd.choice(dates) for _ in range(ROWS_NUM)]
+
+
+def main() -> None:
+    """Compare the per-row cost of parsing expiration dates with strptime and with the row parser."""
+    users = [User(f"user{i}") for i in range(ROWS_NUM)]
+
+    print(f"{'Format':>10} {'Distinct':>9} {'strptime (us)':>14} {'Row parser (us)':>16}")
+    for date_format in DATE_FORMATS:
+        # Escape the percent sign, as in the configuration file
+        config = CreatePaymentConfig(payment_date_format=date_format.replace("%", "%%"),
+                                     payment_check_dup_email="false")
+        for distinct_dates_num in DISTINCT_DATES_NUMS:
+            dates = _CreateDates(date_format, distinct_dates_num)
+
+            start_time = time.perf_counter()
+            for date_str in dates:
+                datetime.datetime.strptime(date_str, date_format).date()
+            strptime_sec = time.perf_counter() - start_time
+
+            # Users are already built, so that only date parsing and duplicated users checking are measured
+            row_parser = PaymentsRowParser(config, None)
+            start_time = time.perf_counter()
+            for i, date_str in enumerate(dates):
+                row_parser.ParseWithUser(i, "", users[i], date_str)
+            parser_sec = time.perf_counter() - start_time
+
+            print(f"{date_format:>10} {distinct_dates_num:>9} {strptime_sec * 1e6 / ROWS_NUM:>14.2f} "
+                  f"{parser_sec * 1e6 / ROWS_NUM:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import os
+import tempfile
+import time
+from typing import List, Tuple
+
+from benchmarks.helpers import CreateXlsxFile
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.payment.payments_excel_loader import PaymentsExcelLoader
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+ROWS_NUM = 20000
+TICK_SEC = 0.01
+
+
+async def _LoadWithTicker(config: ConfigObject) -> Tuple[float, List[float]]:
+    loader = PaymentsExcelLoader(config, LoggerStub())  # type: ignore[arg-type]
+    lags: List[float] = []
+    loading = True
+
+    async def ticker() -> None:
+        while loading:
+            start_time = time.perf_counter()
+            await asyncio.sleep(TICK_SEC)
+            lags.append(time.perf_counter() - start_time - TICK_SEC)
+
+    ticker_task = asyncio.ensure_future(ticker())
+    start_time = time.perf_counter()
+    payments = await loader.LoadAll()
+    load_sec = time.perf_counter() - start_time
+    loading = False
+    await ticker_task
+
+    assert payments.Count() == ROWS_NUM
+    return load_sec, lags
+
+
+def main() -> None:
+    """Measure the event loop latency while loading an xlsx file, with and without the process pool."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name = os.path.join(tmp_dir, "payments.xlsx")
+        CreateXlsxFile(file_name, ROWS_NUM)
+
+        print(f"{'Mode':>12} {'Load (s)':>9} {'Mean lag (ms)':>14} {'Max lag (ms)':>13}")
+        for process_pool in (False, True):
+            config = CreatePaymentConfig(payment_excel_file=file_name,
+                                         payment_excel_process_pool=str(process_pool))
+            # Warm up, so that the worker process is already spawned
+            asyncio.run(_LoadWithTicker(config))
+            load_sec, lags = asyncio.run(_LoadWithTicker(config))
+
+            print(f"{'process pool' if process_pool else 'event loop':>12} {load_sec:>9.2f} "
+                  f"{sum(lags) * 1e3 / len(lags):>14.1f} {max(lags) * 1e3:>13.1f}")
+
+    if PaymentsExcelLoader.process_pool is not None:
+        PaymentsExcelLoader.process_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import datetime
+import random
+import time
+from typing import List, Tuple
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentsData
+from tests.helpers import CreatePaymentConfig
+
+
+ROWS_NUMS = (10000, 20000, 40000, 80000)
+DUP_EMAIL_RATIO = 0.05
+
+
+def _CreateRows(rows_num: int) -> List[Tuple[str, User, datetime.date]]:
+    rnd = random.Random(0)
+    first_date = datetime.date(2020, 1, 1).toordinal()
+    return [
+        (f"email{rnd.randrange(rows_num) if rnd.random() < DUP_EMAIL_RATIO else i}@test.com",
+         User(f"user{i}"),
+         datetime.date.fromordinal(first_date + rnd.randrange(3650)))
+        for i in range(rows_num)
+    ]
+
+
+def main() -> None:
+    """Load payments data of increasing size with duplicated email checking, the time per row shall be constant."""
+    config = CreatePaymentConfig(payment_check_dup_email="true")
+
+    print(f"{'Rows':>8} {'Load (ms)':>10} {'Per row (us)':>13} {'Lookups (ms)':>13}")
+    for rows_num in ROWS_NUMS:
+        rows = _CreateRows(rows_num)
+        payments = PaymentsData(config)
+
+        start_time = time.perf_counter()
+        for email, user, expiration in rows:
+            payments.AddPayment(email, user, expiration)
+        load_sec = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for email, _, _ in rows:
+            payments.GetByEmail(email)
+        lookup_sec = time.perf_counter() - start_time
+
+        print(f"{rows_num:>8} {load_sec * 1e3:>10.1f} {load_sec * 1e6 / rows_num:>13.2f} {lookup_sec * 1e3:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import datetime
+import gc
+import random
+import tracemalloc
+from typing import Iterator, Tuple
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data_factory import PaymentsDataFactory
+from tests.helpers import CreatePaymentConfig
+
+
+ROWS_NUM = 200000
+STORAGE_TYPES = ("dict", "compact")
+
+
+def _IterRows() -> Iterator[Tuple[str, User, datetime.date]]:
+    rnd = random.Random(0)
+    first_date = datetime.date(2020, 1, 1).toordinal()
+    for i in range(ROWS_NUM):
+        yield (f"email{i}@test.com",
+               User(f"user{i}"),
+               datetime.date.fromordinal(first_date + rnd.randrange(3650)))
+
+
+def main() -> None:
+    """Compare the memory used by payments data with the different storage types."""
+    print(f"{'Storage':>8} {'Retained (MB)':>14} {'Peak (MB)':>10} {'Per row (B)':>12}")
+    for storage_type in STORAGE_TYPES:
+        config = CreatePaymentConfig(payment_storage_type=storage_type)
+
+        gc.collect()
+        tracemalloc.start()
+        payments = PaymentsDataFactory(config).CreateData()
+        for email, user, expiration in _IterRows():
+            payments.AddPayment(email, user, expiration)
+        gc.collect()
+        retained_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert payments.Count() == ROWS_NUM
+        print(f"{storage_type:>8} {retained_bytes / 2**20:>14.1f} {peak_bytes / 2**20:>10.1f} "
+              f"{retained_bytes / ROWS_NUM:>12.0f}")
+        del payments
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import datetime
+import random
+
+import openpyxl
+
+
+EXTRA_COLS_NUM = 5
+
+
+def CreateXlsxFile(file_name: str,
+                   rows_num: int) -> None:
+    """
+    Create a payments Excel file (xlsx), with payment data in the first three columns followed by extra columns.
+
+    Args:
+        file_name: File name.
+        rows_num: Number of payment rows.
+    """
+    rnd = random.Random(0)
+    first_date = datetime.date(2020, 1, 1).toordinal()
+
+    wb = openpyxl.Workbook(write_only=True)
+    sheet = wb.create_sheet()
+    sheet.append(["Email", "User", "Expiration"] + [f"Extra {i}" for i in range(EXTRA_COLS_NUM)])
+    for i in range(rows_num):
+        sheet.append([f"email{i}@test.com",
+                      f"@user{i}",
+                      datetime.datetime.fromordinal(first_date + rnd.randrange(3650))]
+                     + [f"extra value {i}"] * EXTRA_COLS_NUM)
+    wb.save(file_name)
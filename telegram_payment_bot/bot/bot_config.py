@@ -19,14 +19,17 @@
 # THE SOFTWARE.
 
 import logging
+import re
 from reprlib import Repr
 
 from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
 from telegram_payment_bot.config.config_object import ConfigObject
 from telegram_payment_bot.config.config_typing import ConfigSectionsType
+from telegram_payment_bot.database.database_pool_factory import DatabasePoolFactory
 from telegram_payment_bot.email.emailer_auth_types import EmailerAuthenticationTypes
 from telegram_payment_bot.google.google_cred_types import GoogleCredTypes
 from telegram_payment_bot.payment.payment_types import PaymentTypes
+from telegram_payment_bot.payment.payments_storage_types import PaymentsStorageTypes
 from telegram_payment_bot.utils.key_value_converter import KeyValueConverter
 from telegram_payment_bot.utils.utils import Utils
 
@@ -36,6 +39,7 @@ class _BotConfigUtils:
 
     COL_MIN_VAL: str = "A"
     COL_MAX_VAL: str = "Z"
+    SQL_IDENTIFIER_REGEX: str = r"[A-Za-z_][A-Za-z0-9_]*"
 
     @staticmethod
     def Repr(val, max_string=100):
@@ -57,11 +61,27 @@ class _BotConfigUtils:
         with open(file_name, encoding="utf-8") as fin:
             return fin.read()
 
+    @staticmethod
+    def IsSqlIdentifierValid(config: ConfigObject,
+                             identifier: str) -> bool:
+        """
+        Check if a SQL identifier (e.g. a table name) is valid, since identifiers cannot be passed as query parameters.
+
+        Args:
+            config: Configuration object.
+            identifier: Identifier to validate.
+
+        Returns:
+            True if the identifier is valid, False otherwise.
+        """
+        return re.fullmatch(_BotConfigUtils.SQL_IDENTIFIER_REGEX, identifier) is not None
+
     @staticmethod
     def AreColumnIndexesValid(config: ConfigObject,
                               curr_col: str) -> bool:
         """
         Check if column indexes are valid.
+        For SQL databases, columns are column names.
 
         Args:
             config: Configuration object.
@@ -70,7 +90,10 @@ class _BotConfigUtils:
         Returns:
             True if column indexes are valid, False otherwise.
         """
-        if len(curr_col) != 1 or curr_col < _BotConfigUtils.COL_MIN_VAL or curr_col > _BotConfigUtils.COL_MAX_VAL:
+        if config.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.SQL_DATABASE:
+            if not _BotConfigUtils.IsSqlIdentifierValid(config, curr_col):
+                return False
+        elif len(curr_col) != 1 or curr_col < _BotConfigUtils.COL_MIN_VAL or curr_col > _BotConfigUtils.COL_MAX_VAL:
             return False
 
         columns = []
@@ -175,6 +198,120 @@ BotConfig: ConfigSectionsType = {
             "name": "payment_excel_file",
             "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.EXCEL_FILE,
         },
+        {
+            "type": BotConfigTypes.PAYMENT_EXCEL_READ_ONLY,
+            "name": "payment_excel_read_only",
+            "conv_fct": Utils.StrToBool,
+            "def_val": True,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.EXCEL_FILE,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_EXCEL_CHECK_HASH,
+            "name": "payment_excel_check_hash",
+            "conv_fct": Utils.StrToBool,
+            "def_val": False,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.EXCEL_FILE,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_EXCEL_PROCESS_POOL,
+            "name": "payment_excel_process_pool",
+            "conv_fct": Utils.StrToBool,
+            "def_val": False,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.EXCEL_FILE,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_CSV_FILE,
+            "name": "payment_csv_file",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.CSV_FILE,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_CSV_DELIMITER,
+            "name": "payment_csv_delimiter",
+            "def_val": ",",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.CSV_FILE,
+            "valid_if": lambda cfg, val: len(val) == 1,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_SQLITE_FILE,
+            "name": "payment_sqlite_file",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.SQLITE,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_SQLITE_TABLE,
+            "name": "payment_sqlite_table",
+            "def_val": "payments",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.SQLITE,
+            "valid_if": _BotConfigUtils.IsSqlIdentifierValid,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_DB_URL,
+            "name": "payment_db_url",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.SQL_DATABASE,
+            "valid_if": lambda cfg, val: DatabasePoolFactory.IsUrlSupported(val),
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_DB_TABLE,
+            "name": "payment_db_table",
+            "def_val": "payments",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.SQL_DATABASE,
+            "valid_if": _BotConfigUtils.IsSqlIdentifierValid,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_DB_POOL_SIZE,
+            "name": "payment_db_pool_size",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 4,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.SQL_DATABASE,
+            "valid_if": lambda cfg, val: val > 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_DB_ORDER_COL,
+            "name": "payment_db_order_col",
+            "def_val": "",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.SQL_DATABASE,
+            "valid_if": lambda cfg, val: val == "" or _BotConfigUtils.IsSqlIdentifierValid(cfg, val),
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_HTTP_URL,
+            "name": "payment_http_url",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.HTTP_JSON,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_HTTP_USER_URL,
+            "name": "payment_http_user_url",
+            "def_val": "",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.HTTP_JSON,
+            "valid_if": lambda cfg, val: val == "" or "{user}" in val,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_HTTP_TOKEN,
+            "name": "payment_http_token",
+            "def_val": "",
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.HTTP_JSON,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_HTTP_MAX_CONN,
+            "name": "payment_http_max_conn",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 4,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.HTTP_JSON,
+            "valid_if": lambda cfg, val: val > 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_HTTP_TIMEOUT_SEC,
+            "name": "payment_http_timeout_sec",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 30,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.HTTP_JSON,
+            "valid_if": lambda cfg, val: val > 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_SOURCES,
+            "name": "payment_sources",
+            "conv_fct": lambda val: [file_name.strip() for file_name in val.split(",")],
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.MULTI_SOURCE,
+            "valid_if": lambda cfg, val: all(file_name != "" for file_name in val),
+        },
         {
             "type": BotConfigTypes.PAYMENT_GOOGLE_SHEET_ID,
             "name": "payment_google_sheet_id",
@@ -198,6 +335,45 @@ BotConfig: ConfigSectionsType = {
             "name": "payment_google_cred_path",
             "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.GOOGLE_SHEET,
         },
+        {
+            "type": BotConfigTypes.PAYMENT_GOOGLE_FETCH_COLS_ONLY,
+            "name": "payment_google_fetch_cols_only",
+            "conv_fct": Utils.StrToBool,
+            "def_val": True,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.GOOGLE_SHEET,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_GOOGLE_QUOTA_MIN,
+            "name": "payment_google_quota_min",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 60,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.GOOGLE_SHEET,
+            "valid_if": lambda cfg, val: val > 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_GOOGLE_MAX_RETRIES,
+            "name": "payment_google_max_retries",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 5,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.GOOGLE_SHEET,
+            "valid_if": lambda cfg, val: val >= 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_GOOGLE_PAGE_SIZE,
+            "name": "payment_google_page_size",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 0,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.GOOGLE_SHEET,
+            "valid_if": lambda cfg, val: val >= 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_GOOGLE_PAGE_CONCURRENCY,
+            "name": "payment_google_page_concurrency",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 4,
+            "load_if": lambda cfg: cfg.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.GOOGLE_SHEET,
+            "valid_if": lambda cfg, val: val > 0,
+        },
         {
             "type": BotConfigTypes.PAYMENT_USE_USER_ID,
             "name": "payment_use_user_id",
@@ -237,6 +413,41 @@ BotConfig: ConfigSectionsType = {
             "name": "payment_date_format",
             "def_val": "%d/%m/%Y",
         },
+        {
+            "type": BotConfigTypes.PAYMENT_STORAGE_TYPE,
+            "name": "payment_storage_type",
+            "def_val": PaymentsStorageTypes.DICT,
+            "conv_fct": lambda val: PaymentsStorageTypes[val.upper()],
+            "print_fct": lambda val: val.name.upper(),
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_CACHE_TTL_SEC,
+            "name": "payment_cache_ttl_sec",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 60,
+            "valid_if": lambda cfg, val: val >= 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_CACHE_STALE_SEC,
+            "name": "payment_cache_stale_sec",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 300,
+            "valid_if": lambda cfg, val: val >= 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_WATCH_PERIOD_SEC,
+            "name": "payment_watch_period_sec",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 0,
+            "valid_if": lambda cfg, val: val >= 0,
+        },
+        {
+            "type": BotConfigTypes.PAYMENT_ROWS_CACHE_SIZE,
+            "name": "payment_rows_cache_size",
+            "conv_fct": Utils.StrToInt,
+            "def_val": 0,
+            "valid_if": lambda cfg, val: val >= 0,
+        },
     ],
     "email": [
         {
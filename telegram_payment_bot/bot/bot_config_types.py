@@ -45,16 +45,43 @@ class BotConfigTypes(ConfigTypes):
     PAYMENT_CHECK_DUP_EMAIL = auto()
     PAYMENT_TYPE = auto()
     PAYMENT_EXCEL_FILE = auto()
+    PAYMENT_EXCEL_READ_ONLY = auto()
+    PAYMENT_EXCEL_CHECK_HASH = auto()
+    PAYMENT_EXCEL_PROCESS_POOL = auto()
+    PAYMENT_CSV_FILE = auto()
+    PAYMENT_CSV_DELIMITER = auto()
+    PAYMENT_SQLITE_FILE = auto()
+    PAYMENT_SQLITE_TABLE = auto()
+    PAYMENT_DB_URL = auto()
+    PAYMENT_DB_TABLE = auto()
+    PAYMENT_DB_POOL_SIZE = auto()
+    PAYMENT_DB_ORDER_COL = auto()
+    PAYMENT_HTTP_URL = auto()
+    PAYMENT_HTTP_USER_URL = auto()
+    PAYMENT_HTTP_TOKEN = auto()
+    PAYMENT_HTTP_MAX_CONN = auto()
+    PAYMENT_HTTP_TIMEOUT_SEC = auto()
+    PAYMENT_SOURCES = auto()
     PAYMENT_GOOGLE_SHEET_ID = auto()
     PAYMENT_GOOGLE_CRED_TYPE = auto()
     PAYMENT_GOOGLE_CRED = auto()
     PAYMENT_GOOGLE_CRED_PATH = auto()
+    PAYMENT_GOOGLE_FETCH_COLS_ONLY = auto()
+    PAYMENT_GOOGLE_QUOTA_MIN = auto()
+    PAYMENT_GOOGLE_MAX_RETRIES = auto()
+    PAYMENT_GOOGLE_PAGE_SIZE = auto()
+    PAYMENT_GOOGLE_PAGE_CONCURRENCY = auto()
     PAYMENT_USE_USER_ID = auto()
     PAYMENT_WORKSHEET_IDX = auto()
     PAYMENT_EMAIL_COL = auto()
     PAYMENT_USER_COL = auto()
     PAYMENT_EXPIRATION_COL = auto()
     PAYMENT_DATE_FORMAT = auto()
+    PAYMENT_STORAGE_TYPE = auto()
+    PAYMENT_CACHE_TTL_SEC = auto()
+    PAYMENT_CACHE_STALE_SEC = auto()
+    PAYMENT_WATCH_PERIOD_SEC = auto()
+    PAYMENT_ROWS_CACHE_SIZE = auto()
     # Email
     EMAIL_ENABLED = auto()
     EMAIL_AUTH_TYPE = auto()
@@ -73,7 +73,9 @@ BotHandlersConfig: BotHandlersConfigType = {
             "filters": filters.command(["paybot_check_username"]),
         },
         {
-            "callback": lambda self, client, message: self.DispatchCommand(client, message, CommandTypes.REMOVE_NO_USERNAME_CMD),
+            "callback": lambda self, client, message: self.DispatchCommand(
+                client, message, CommandTypes.REMOVE_NO_USERNAME_CMD, payments_repository=self.payments_repository
+            ),
             "filters": filters.command(["paybot_remove_username"]),
         },
         {
@@ -85,21 +87,35 @@ BotHandlersConfig: BotHandlersConfigType = {
             "filters": filters.command(["paybot_is_check_on_join"]),
         },
         {
-            "callback": lambda self, client, message: self.DispatchCommand(client, message, CommandTypes.CHECK_PAYMENTS_DATA_CMD),
+            "callback": lambda self, client, message: self.DispatchCommand(
+                client, message, CommandTypes.CHECK_PAYMENTS_DATA_CMD, payments_repository=self.payments_repository
+            ),
             "filters": filters.command(["paybot_check_data"]),
         },
         {
-            "callback": lambda self, client, message: self.DispatchCommand(client, message, CommandTypes.EMAIL_NO_PAYMENT_CMD),
+            "callback": lambda self, client, message: self.DispatchCommand(
+                client, message, CommandTypes.EMAIL_NO_PAYMENT_CMD, payments_repository=self.payments_repository
+            ),
             "filters": filters.command(["paybot_email_payment"]),
         },
         {
-            "callback": lambda self, client, message: self.DispatchCommand(client, message, CommandTypes.CHECK_NO_PAYMENT_CMD),
+            "callback": lambda self, client, message: self.DispatchCommand(
+                client, message, CommandTypes.CHECK_NO_PAYMENT_CMD, payments_repository=self.payments_repository
+            ),
             "filters": filters.command(["paybot_check_payment"]),
         },
         {
-            "callback": lambda self, client, message: self.DispatchCommand(client, message, CommandTypes.REMOVE_NO_PAYMENT_CMD),
+            "callback": lambda self, client, message: self.DispatchCommand(
+                client, message, CommandTypes.REMOVE_NO_PAYMENT_CMD, payments_repository=self.payments_repository
+            ),
             "filters": filters.command(["paybot_remove_payment"]),
         },
+        {
+            "callback": lambda self, client, message: self.DispatchCommand(
+                client, message, CommandTypes.RELOAD_PAYMENTS_CMD, payments_repository=self.payments_repository
+            ),
+            "filters": filters.command(["paybot_reload_payments"]),
+        },
         {
             "callback": lambda self, client, message: self.DispatchCommand(
                 client, message, CommandTypes.PAYMENT_TASK_START_CMD, payments_check_scheduler=self.payments_check_scheduler
@@ -141,7 +157,9 @@ BotHandlersConfig: BotHandlersConfigType = {
             "filters": filters.group_chat_created,
         },
         {
-            "callback": lambda self, client, message: self.HandleMessage(client, message, MessageTypes.NEW_CHAT_MEMBERS),
+            "callback": lambda self, client, message: self.HandleMessage(
+                client, message, MessageTypes.NEW_CHAT_MEMBERS, payments_repository=self.payments_repository
+            ),
             "filters": filters.new_chat_members,
         },
         {
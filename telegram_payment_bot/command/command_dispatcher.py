@@ -42,6 +42,7 @@ from telegram_payment_bot.command.commands import (
     PaymentTaskRemoveChatCmd,
     PaymentTaskStartCmd,
     PaymentTaskStopCmd,
+    ReloadPaymentsCmd,
     RemoveNoPaymentCmd,
     RemoveNoUsernameCmd,
     SetCheckPaymentsOnJoinCmd,
@@ -76,6 +77,7 @@ class CommandTypes(Enum):
     EMAIL_NO_PAYMENT_CMD = auto()
     CHECK_NO_PAYMENT_CMD = auto()
     REMOVE_NO_PAYMENT_CMD = auto()
+    RELOAD_PAYMENTS_CMD = auto()
     PAYMENT_TASK_START_CMD = auto()
     PAYMENT_TASK_STOP_CMD = auto()
     PAYMENT_TASK_ADD_CHAT_CMD = auto()
@@ -106,6 +108,7 @@ class CommandDispatcherConst:
         CommandTypes.EMAIL_NO_PAYMENT_CMD: EmailNoPaymentCmd,
         CommandTypes.CHECK_NO_PAYMENT_CMD: CheckNoPaymentCmd,
         CommandTypes.REMOVE_NO_PAYMENT_CMD: RemoveNoPaymentCmd,
+        CommandTypes.RELOAD_PAYMENTS_CMD: ReloadPaymentsCmd,
         CommandTypes.PAYMENT_TASK_START_CMD: PaymentTaskStartCmd,
         CommandTypes.PAYMENT_TASK_STOP_CMD: PaymentTaskStopCmd,
         CommandTypes.PAYMENT_TASK_INFO_CMD: PaymentTaskInfoCmd,
@@ -42,7 +42,6 @@ from telegram_payment_bot.payment.payments_check_scheduler import (
 )
 from telegram_payment_bot.payment.payments_data import PaymentErrorTypes
 from telegram_payment_bot.payment.payments_emailer import PaymentsEmailer
-from telegram_payment_bot.payment.payments_loader_factory import PaymentsLoaderFactory
 
 
 def GroupChatOnly(exec_cmd_fct: Callable[..., Any]) -> Callable[..., Any]:
@@ -314,7 +313,9 @@ class RemoveNoUsernameCmd(CommandBase):
         finished = False
         kicked_members = ChatMembersList()
         while not finished:
-            curr_kicked_members = await MembersKicker(self.client, self.config, self.logger).KickAllWithNoUsername(self.cmd_data.Chat())
+            curr_kicked_members = await MembersKicker(
+                self.client, self.config, self.logger, kwargs["payments_repository"]
+            ).KickAllWithNoUsername(self.cmd_data.Chat())
             if curr_kicked_members.Any():
                 kicked_members.AddMultiple(curr_kicked_members)
                 finished = self.config.GetValue(BotConfigTypes.APP_TEST_MODE)
@@ -387,8 +388,7 @@ class CheckPaymentsDataCmd(CommandBase):
         """
         await self._SendMessage(self.translator.GetSentence("CHECK_PAYMENTS_DATA_NOTICE_CMD"))
 
-        payments_loader = PaymentsLoaderFactory(self.config, self.logger).CreateLoader()
-        payments_data_err = await payments_loader.CheckForErrors()
+        payments_data_err = await kwargs["payments_repository"].CheckForErrors()
 
         if payments_data_err.Any():
             msg = self.translator.GetSentence("CHECK_PAYMENTS_DATA_COMPLETED_CMD", errors_count=payments_data_err.Count())
@@ -403,6 +403,12 @@ class CheckPaymentsDataCmd(CommandBase):
                         row_index=payment_err.Row(),
                         expiration_date=payment_err.ExpirationDate(),
                     )
+                elif payment_err.Type() == PaymentErrorTypes.CROSS_SOURCE_CONFLICT_ERR:
+                    msg += self.translator.GetSentence(
+                        "CHECK_PAYMENTS_DATA_CONFLICT_ERR_CMD",
+                        user=payment_err.User(),
+                        expiration_date=payment_err.ExpirationDate(),
+                    )
         else:
             msg = self.translator.GetSentence("CHECK_PAYMENTS_DATA_ALL_OK_CMD")
 
@@ -435,7 +441,8 @@ class EmailNoPaymentCmd(CommandBase):
                 expired_payments = await PaymentsEmailer(
                     self.client,
                     self.config,
-                    self.logger
+                    self.logger,
+                    kwargs["payments_repository"]
                 ).EmailAllWithExpiringPayment(days_left)
 
                 if expired_payments.Any():
@@ -482,7 +489,9 @@ class CheckNoPaymentCmd(CommandBase):
             )
         )
 
-        expired_members = await MembersPaymentGetter(self.client, self.config, self.logger).GetAllMembersWithExpiringPayment(
+        expired_members = await MembersPaymentGetter(
+            self.client, self.config, self.logger, kwargs["payments_repository"]
+        ).GetAllMembersWithExpiringPayment(
             self.cmd_data.Chat(), days_left
         )
 
@@ -548,7 +557,9 @@ class RemoveNoPaymentCmd(CommandBase):
         finished = False
         kicked_members = ChatMembersList()
         while not finished:
-            curr_kicked_members = await MembersKicker(self.client, self.config, self.logger).KickAllWithExpiredPayment(self.cmd_data.Chat())
+            curr_kicked_members = await MembersKicker(
+                self.client, self.config, self.logger, kwargs["payments_repository"]
+            ).KickAllWithExpiredPayment(self.cmd_data.Chat())
             if curr_kicked_members.Any():
                 kicked_members.AddMultiple(curr_kicked_members)
                 finished = self.config.GetValue(BotConfigTypes.APP_TEST_MODE)
@@ -564,6 +575,27 @@ class RemoveNoPaymentCmd(CommandBase):
             await self._NewInviteLink()
 
 
+class ReloadPaymentsCmd(CommandBase):
+    """Command for reloading payments data."""
+
+    @override
+    async def _ExecuteCommand(self,
+                              **kwargs: Any) -> None:
+        """
+        Execute the reload payments command.
+
+        Args:
+            **kwargs: Additional keyword arguments
+        """
+        await self._SendMessage(self.translator.GetSentence("RELOAD_PAYMENTS_NOTICE_CMD"))
+
+        payments = await kwargs["payments_repository"].Reload()
+
+        await self._SendMessage(
+            self.translator.GetSentence("RELOAD_PAYMENTS_COMPLETED_CMD", payments_count=payments.Count())
+        )
+
+
 class PaymentTaskStartCmd(CommandBase):
     """Command for starting payment task."""
 
@@ -0,0 +1,91 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, List, Tuple
+
+
+class DatabasePoolBaseConst:
+    """Constants for database pool base class."""
+
+    FETCH_CHUNK_SIZE: int = 1000
+
+
+class DatabasePoolBase(ABC):
+    """
+    Base class for database connection pools.
+    Queries are executed on a free connection of the pool, so that they can run concurrently.
+    """
+
+    @abstractmethod
+    async def Fetch(self,
+                    query: str,
+                    *params: Any) -> List[Tuple[Any, ...]]:
+        """
+        Execute a query and get all the returned rows.
+
+        Args:
+            query: Query string, with placeholders got by Placeholder.
+            *params: Query parameters.
+
+        Returns:
+            Returned rows.
+        """
+
+    @abstractmethod
+    def Iterate(self,
+                query: str,
+                *params: Any) -> AsyncIterator[Tuple[Any, ...]]:
+        """
+        Execute a query and iterate over the returned rows, fetching them in chunks.
+
+        Args:
+            query: Query string, with placeholders got by Placeholder.
+            *params: Query parameters.
+
+        Returns:
+            Asynchronous iterator over the returned rows.
+        """
+
+    @abstractmethod
+    def Placeholder(self,
+                    idx: int) -> str:
+        """
+        Get the placeholder of a query parameter.
+
+        Args:
+            idx: Parameter index (1-based).
+
+        Returns:
+            Placeholder string.
+        """
+
+    @abstractmethod
+    def RowIdExpression(self) -> str:
+        """
+        Get the expression of the physical row identifier, used for ordering rows when no column is specified.
+
+        Returns:
+            Expression string.
+        """
+
+    @abstractmethod
+    async def Close(self) -> None:
+        """Close all connections."""
@@ -0,0 +1,148 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+from typing import Any, AsyncIterator, List, Optional, Tuple
+
+from typing_extensions import override
+
+from telegram_payment_bot.database.database_pool_base import DatabasePoolBase, DatabasePoolBaseConst
+
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None  # type: ignore
+
+
+class PostgresDatabasePool(DatabasePoolBase):
+    """
+    Pool of PostgreSQL database connections, based on asyncpg.
+    The pool is created at the first query. Statements are prepared on the server and cached by each connection.
+    """
+
+    url: str
+    size: int
+    pool_task: Optional[asyncio.Future]
+
+    def __init__(self,
+                 url: str,
+                 size: int) -> None:
+        """
+        Constructor.
+
+        Args:
+            url: Database URL.
+            size: Maximum number of connections.
+        """
+        self.url = url
+        self.size = size
+        self.pool_task = None
+
+    @override
+    async def Fetch(self,
+                    query: str,
+                    *params: Any) -> List[Tuple[Any, ...]]:
+        """
+        Execute a query and get all the returned rows.
+
+        Args:
+            query: Query string, with placeholders got by Placeholder.
+            *params: Query parameters.
+
+        Returns:
+            Returned rows.
+        """
+        pool = await self.__GetPool()
+        async with pool.acquire() as conn:
+            stmt = await conn.prepare(query)
+            return [tuple(record) for record in await stmt.fetch(*params)]
+
+    @override
+    async def Iterate(self,
+                      query: str,
+                      *params: Any) -> AsyncIterator[Tuple[Any, ...]]:
+        """
+        Execute a query and iterate over the returned rows, fetching them in chunks with a server-side cursor.
+
+        Args:
+            query: Query string, with placeholders got by Placeholder.
+            *params: Query parameters.
+
+        Returns:
+            Asynchronous iterator over the returned rows.
+        """
+        pool = await self.__GetPool()
+        async with pool.acquire() as conn:
+            # Cursors can only be used inside a transaction
+            async with conn.transaction():
+                stmt = await conn.prepare(query)
+                async for record in stmt.cursor(*params, prefetch=DatabasePoolBaseConst.FETCH_CHUNK_SIZE):
+                    yield tuple(record)
+
+    @override
+    def Placeholder(self,
+                    idx: int) -> str:
+        """
+        Get the placeholder of a query parameter.
+
+        Args:
+            idx: Parameter index (1-based).
+
+        Returns:
+            Placeholder string.
+        """
+        return f"${idx}"
+
+    @override
+    def RowIdExpression(self) -> str:
+        """
+        Get the expression of the physical row identifier, used for ordering rows when no column is specified.
+
+        Returns:
+            Expression string.
+        """
+        return "ctid"
+
+    @override
+    async def Close(self) -> None:
+        """Close all connections, waiting for the ones in use to be released."""
+        pool_task = self.pool_task
+        self.pool_task = None
+        if pool_task is not None and pool_task.done() and not pool_task.cancelled() and pool_task.exception() is None:
+            await pool_task.result().close()
+
+    async def __GetPool(self) -> Any:
+        """
+        Get the connection pool, creating it the first time.
+        Concurrent callers wait for the same pool creation.
+
+        Returns:
+            Connection pool.
+
+        Raises:
+            ImportError: If asyncpg is not installed.
+        """
+        if asyncpg is None:
+            raise ImportError("asyncpg is required for connecting to PostgreSQL databases")
+
+        if self.pool_task is None or (self.pool_task.done() and self.pool_task.exception() is not None):
+            self.pool_task = asyncio.ensure_future(asyncpg.create_pool(self.url, min_size=1, max_size=self.size))
+        return await asyncio.shield(self.pool_task)
@@ -0,0 +1,200 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import datetime
+import os
+import sqlite3
+import threading
+from typing import Any, AsyncIterator, List, Optional, Tuple
+from urllib.request import pathname2url
+
+from typing_extensions import override
+
+from telegram_payment_bot.database.database_pool_base import DatabasePoolBase, DatabasePoolBaseConst
+from telegram_payment_bot.misc.async_helpers import to_thread
+
+
+class SqliteDatabasePool(DatabasePoolBase):
+    """
+    Pool of SQLite database connections.
+    Queries are executed in a thread, connections are created when needed, up to the pool size, and reused.
+    Statements are prepared once and cached by each connection.
+    The database is opened in read-only mode, so that it is never modified (nor created, if not existent).
+    """
+
+    file_name: str
+    size: int
+    free_conns: List[sqlite3.Connection]
+    free_conns_lock: threading.Lock
+    semaphore: Optional[asyncio.Semaphore]
+
+    def __init__(self,
+                 file_name: str,
+                 size: int) -> None:
+        """
+        Constructor.
+
+        Args:
+            file_name: Database file name.
+            size: Maximum number of connections.
+        """
+        self.file_name = file_name
+        self.size = size
+        self.free_conns = []
+        self.free_conns_lock = threading.Lock()
+        self.semaphore = None
+
+    @override
+    async def Fetch(self,
+                    query: str,
+                    *params: Any) -> List[Tuple[Any, ...]]:
+        """
+        Execute a query and get all the returned rows.
+
+        Args:
+            query: Query string, with placeholders got by Placeholder.
+            *params: Query parameters.
+
+        Returns:
+            Returned rows.
+        """
+        async with self.__GetSemaphore():
+            conn = await to_thread(self.__Acquire)
+            try:
+                return await to_thread(lambda: conn.execute(query, self.__ConvertParams(params)).fetchall())
+            finally:
+                self.__Release(conn)
+
+    @override
+    async def Iterate(self,
+                      query: str,
+                      *params: Any) -> AsyncIterator[Tuple[Any, ...]]:
+        """
+        Execute a query and iterate over the returned rows, fetching them in chunks.
+
+        Args:
+            query: Query string, with placeholders got by Placeholder.
+            *params: Query parameters.
+
+        Returns:
+            Asynchronous iterator over the returned rows.
+        """
+        async with self.__GetSemaphore():
+            conn = await to_thread(self.__Acquire)
+            try:
+                cursor = await to_thread(conn.execute, query, self.__ConvertParams(params))
+                while True:
+                    rows = await to_thread(cursor.fetchmany, DatabasePoolBaseConst.FETCH_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+            finally:
+                self.__Release(conn)
+
+    @override
+    def Placeholder(self,
+                    idx: int) -> str:
+        """
+        Get the placeholder of a query parameter.
+
+        Args:
+            idx: Parameter index (1-based).
+
+        Returns:
+            Placeholder string.
+        """
+        return "?"
+
+    @override
+    def RowIdExpression(self) -> str:
+        """
+        Get the expression of the physical row identifier, used for ordering rows when no column is specified.
+
+        Returns:
+            Expression string.
+        """
+        return "rowid"
+
+    @override
+    async def Close(self) -> None:
+        """Close all free connections (connections in use are not closed)."""
+        with self.free_conns_lock:
+            free_conns = self.free_conns
+            self.free_conns = []
+        for conn in free_conns:
+            conn.close()
+
+    def __GetSemaphore(self) -> asyncio.Semaphore:
+        """
+        Get the semaphore limiting the concurrent queries, creating it the first time (i.e. inside the event loop).
+
+        Returns:
+            Semaphore.
+        """
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.size)
+        return self.semaphore
+
+    def __Acquire(self) -> sqlite3.Connection:
+        """
+        Acquire a free connection, creating it if none (blocking).
+
+        Returns:
+            Database connection.
+
+        Raises:
+            FileNotFoundError: If the database file does not exist.
+        """
+        with self.free_conns_lock:
+            if self.free_conns:
+                return self.free_conns.pop()
+
+        if not os.path.isfile(self.file_name):
+            raise FileNotFoundError(f"Database file '{self.file_name}' not found")
+        # Connections are used by different threads of the pool, but never concurrently
+        return sqlite3.connect(f"file:{pathname2url(os.path.abspath(self.file_name))}?mode=ro",
+                               uri=True,
+                               check_same_thread=False)
+
+    def __Release(self,
+                  conn: sqlite3.Connection) -> None:
+        """
+        Release a connection, making it free again.
+
+        Args:
+            conn: Database connection.
+        """
+        with self.free_conns_lock:
+            self.free_conns.append(conn)
+
+    @staticmethod
+    def __ConvertParams(params: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        """
+        Convert query parameters to types supported by SQLite (i.e. dates to ISO format).
+
+        Args:
+            params: Query parameters.
+
+        Returns:
+            Converted query parameters.
+        """
+        return tuple(param.isoformat() if isinstance(param, datetime.date) else param for param in params)
@@ -0,0 +1,183 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import random
+import socket
+import time
+from typing import Awaitable, Callable, Tuple, Type, TypeVar
+
+from googleapiclient.errors import HttpError
+
+
+T = TypeVar("T")
+
+
+class GoogleRequestLimiterConst:
+    """Constants for Google request limiter class."""
+
+    RETRY_HTTP_STATUSES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    RETRY_EXCEPTIONS: Tuple[Type[Exception], ...] = (ConnectionError, TimeoutError, socket.timeout)
+    BACKOFF_BASE_SEC: float = 1.0
+    BACKOFF_MAX_SEC: float = 64.0
+
+
+class GoogleRequestStats:
+    """Counters of Google requests."""
+
+    requests: int
+    throttled: int
+    throttled_time_sec: float
+    retries: int
+    failures: int
+
+    def __init__(self) -> None:
+        """Constructor."""
+        self.requests = 0
+        self.throttled = 0
+        self.throttled_time_sec = 0.0
+        self.retries = 0
+        self.failures = 0
+
+    def ToString(self) -> str:
+        """
+        Convert to string representation.
+
+        Returns:
+            String representation.
+        """
+        return (f"requests: {self.requests}, throttled: {self.throttled} ({self.throttled_time_sec:.1f}s), "
+                f"retries: {self.retries}, failures: {self.failures}")
+
+    def __str__(self) -> str:
+        """
+        Convert to string representation.
+
+        Returns:
+            String representation.
+        """
+        return self.ToString()
+
+
+class GoogleRequestLimiter:
+    """
+    Limiter for Google requests.
+    Requests are throttled by a token bucket sized to the per-minute quota, and retried with exponential backoff
+    and jitter when the server is overloaded (HTTP 429 or 5xx) or the connection fails.
+    """
+
+    quota_per_min: int
+    max_retries: int
+    tokens: float
+    last_refill_time: float
+    stats: GoogleRequestStats
+
+    def __init__(self,
+                 quota_per_min: int,
+                 max_retries: int) -> None:
+        """
+        Constructor.
+
+        Args:
+            quota_per_min: Maximum number of requests per minute.
+            max_retries: Maximum number of retries for a single request.
+        """
+        self.quota_per_min = quota_per_min
+        self.max_retries = max_retries
+        self.tokens = float(quota_per_min)
+        self.last_refill_time = time.monotonic()
+        self.stats = GoogleRequestStats()
+
+    def Stats(self) -> GoogleRequestStats:
+        """
+        Get request counters.
+
+        Returns:
+            Request counters.
+        """
+        return self.stats
+
+    async def Execute(self,
+                      request_fct: Callable[[], Awaitable[T]]) -> T:
+        """
+        Execute a request, throttling and retrying it if needed.
+
+        Args:
+            request_fct: Function returning the request awaitable, called for each attempt.
+
+        Returns:
+            The request result.
+
+        Raises:
+            Exception: If the request fails with a non-retryable error, or retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            await self.__AcquireToken()
+            self.stats.requests += 1
+            try:
+                return await request_fct()
+            except Exception as ex:
+                if not self.__IsRetryable(ex) or attempt >= self.max_retries:
+                    self.stats.failures += 1
+                    raise
+
+            # Exponential backoff with full jitter
+            backoff_sec = min(GoogleRequestLimiterConst.BACKOFF_MAX_SEC,
+                              GoogleRequestLimiterConst.BACKOFF_BASE_SEC * (2 ** attempt))
+            attempt += 1
+            self.stats.retries += 1
+            await asyncio.sleep(random.uniform(0, backoff_sec))
+
+    async def __AcquireToken(self) -> None:
+        """Acquire a token from the bucket, waiting until one is available."""
+        refill_rate = self.quota_per_min / 60.0
+        start_time = time.monotonic()
+        throttled = False
+        while True:
+            now = time.monotonic()
+            self.tokens = min(float(self.quota_per_min), self.tokens + (now - self.last_refill_time) * refill_rate)
+            self.last_refill_time = now
+
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                break
+
+            throttled = True
+            await asyncio.sleep((1.0 - self.tokens) / refill_rate)
+
+        if throttled:
+            self.stats.throttled += 1
+            self.stats.throttled_time_sec += time.monotonic() - start_time
+
+    @staticmethod
+    def __IsRetryable(ex: Exception) -> bool:
+        """
+        Get if a request error is retryable.
+
+        Args:
+            ex: Request error.
+
+        Returns:
+            True if retryable, False otherwise.
+        """
+        if isinstance(ex, HttpError):
+            return ex.resp.status in GoogleRequestLimiterConst.RETRY_HTTP_STATUSES
+        return isinstance(ex, GoogleRequestLimiterConst.RETRY_EXCEPTIONS)
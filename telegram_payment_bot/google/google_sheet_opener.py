@@ -18,15 +18,18 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from typing import Optional
+from typing import Any, Callable, TypeVar
 
 import pygsheets
+from pygsheets.client import Client
 
-from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
 from telegram_payment_bot.config.config_object import ConfigObject
-from telegram_payment_bot.google.google_cred_types import GoogleCredTypes
+from telegram_payment_bot.google.google_request_limiter import GoogleRequestStats
+from telegram_payment_bot.google.google_sheet_pool import GoogleSheetHandle, GoogleSheetPool
 from telegram_payment_bot.logger.logger import Logger
-from telegram_payment_bot.misc.async_helpers import to_thread
+
+
+T = TypeVar("T")
 
 
 class GoogleSheetOpener:
@@ -34,7 +37,6 @@ class GoogleSheetOpener:
 
     config: ConfigObject
     logger: Logger
-    google_sheet: Optional[pygsheets.Spreadsheet]
 
     def __init__(self,
                  config: ConfigObject,
@@ -48,7 +50,6 @@ class GoogleSheetOpener:
         """
         self.config = config
         self.logger = logger
-        self.google_sheet = None
 
     async def OpenWorksheet(self,
                             worksheet_idx: int) -> pygsheets.Worksheet:
@@ -61,39 +62,69 @@ class GoogleSheetOpener:
         Returns:
             The worksheet object.
         """
-        await self.__OpenGoogleSheet()
-        assert self.google_sheet is not None
-        return self.google_sheet[worksheet_idx]
-
-    async def __OpenGoogleSheet(self) -> None:
-        """Open Google Sheet using configured credentials."""
-        if self.google_sheet is not None:
-            return
-
-        # Get configuration
-        sheet_id = self.config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_SHEET_ID)
-        cred_file = self.config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_CRED)
-        cred_type = self.config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_CRED_TYPE)
-
-        # Log
-        self.logger.GetLogger().info(f"Credential file: {cred_file}")
-        self.logger.GetLogger().info(f"Credential type: {cred_type}")
-        self.logger.GetLogger().info(f"Opening Google Sheet ID \"{sheet_id}\"...")
-
-        # Authorize and open Google Sheet
-        if cred_type == GoogleCredTypes.OAUTH2:
-            cred_path = self.config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_CRED_PATH)
-            self.logger.GetLogger().info(f"Credential path: {cred_path}")
-
-            google_client = await to_thread(
-                pygsheets.authorize,
-                client_secret=cred_file,
-                credentials_directory=cred_path,
-                local=True
-            )
-        elif cred_type == GoogleCredTypes.SERVICE_ACCOUNT:
-            google_client = await to_thread(pygsheets.authorize, service_file=cred_file)
-        else:
-            raise ValueError("Invalid credential type")
-
-        self.google_sheet = await to_thread(google_client.open_by_key, sheet_id)
+        handle = await self.__GetHandle()
+        return await handle.Execute(lambda: handle.google_sheet[worksheet_idx])
+
+    async def GetModifiedTime(self) -> str:
+        """
+        Get the last time the Google Sheet was modified.
+
+        Returns:
+            Modified time in RFC 3339 format.
+        """
+        handle = await self.__GetHandle()
+        return await handle.Execute(lambda: handle.google_sheet.updated)
+
+    async def Execute(self,
+                      fct: Callable[..., T],
+                      *args: Any,
+                      **kwargs: Any) -> T:
+        """
+        Execute a blocking Google Sheet request in a thread.
+        Requests to the same Google Sheet are serialized, since its client is shared.
+
+        Args:
+            fct: Function to execute.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            The return value of the function.
+        """
+        return await (await self.__GetHandle()).Execute(fct, *args, **kwargs)
+
+    async def ExecuteOnFreeClient(self,
+                                  fct: Callable[[Client], T]) -> T:
+        """
+        Execute a blocking Google Sheet request in a thread, on a client not used by other requests.
+        It allows running more requests concurrently.
+
+        Args:
+            fct: Function to execute, called with the client.
+
+        Returns:
+            The return value of the function.
+        """
+        return await (await self.__GetHandle()).ExecuteOnFreeClient(fct)
+
+    def GetRequestStats(self) -> GoogleRequestStats:
+        """
+        Get the counters of Google requests.
+
+        Returns:
+            Request counters.
+        """
+        return GoogleSheetPool.GetLimiter(self.config).Stats()
+
+    def Invalidate(self) -> None:
+        """Invalidate the shared Google Sheet, so that it is authorized and opened again when needed."""
+        GoogleSheetPool.Invalidate(self.config)
+
+    async def __GetHandle(self) -> GoogleSheetHandle:
+        """
+        Get the shared Google Sheet handle.
+
+        Returns:
+            Google Sheet handle.
+        """
+        return await GoogleSheetPool.GetHandle(self.config, self.logger)
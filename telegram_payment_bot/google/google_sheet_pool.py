@@ -0,0 +1,341 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import datetime
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import google_auth_httplib2
+import httplib2
+import pygsheets
+from google.auth.exceptions import GoogleAuthError
+from pygsheets.client import Client
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.google.google_cred_types import GoogleCredTypes
+from telegram_payment_bot.google.google_request_limiter import GoogleRequestLimiter
+from telegram_payment_bot.logger.logger import Logger
+from telegram_payment_bot.misc.async_helpers import to_thread
+
+
+T = TypeVar("T")
+
+
+class GoogleSheetPoolConst:
+    """Constants for Google Sheet pool class."""
+
+    TOKEN_CHECK_PERIOD_SEC: float = 60.0
+    TOKEN_REFRESH_MARGIN_SEC: float = 300.0
+
+
+class GoogleSheetHandle:
+    """
+    Authorized Google Sheet, shared by all the users of the same credentials and sheet.
+    Requests are serialized, since the underlying HTTP client is not thread-safe, and go through the request limiter.
+    Requests that need to run concurrently use additional clients, sharing the same credentials.
+    """
+
+    google_sheet: pygsheets.Spreadsheet
+    limiter: GoogleRequestLimiter
+    lock: threading.Lock
+    free_clients: List[Client]
+    free_clients_lock: threading.Lock
+
+    def __init__(self,
+                 google_sheet: pygsheets.Spreadsheet,
+                 limiter: GoogleRequestLimiter) -> None:
+        """
+        Constructor.
+
+        Args:
+            google_sheet: Google Sheet.
+            limiter: Request limiter.
+        """
+        self.google_sheet = google_sheet
+        self.limiter = limiter
+        self.lock = threading.Lock()
+        self.free_clients = []
+        self.free_clients_lock = threading.Lock()
+
+    async def Execute(self,
+                      fct: Callable[..., T],
+                      *args: Any,
+                      **kwargs: Any) -> T:
+        """
+        Execute a blocking request in a thread.
+
+        Args:
+            fct: Function to execute.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            The return value of the function.
+        """
+        return await self.limiter.Execute(lambda: to_thread(self.__ExecuteLocked, fct, *args, **kwargs))
+
+    async def ExecuteOnFreeClient(self,
+                                  fct: Callable[[Client], T]) -> T:
+        """
+        Execute a blocking request in a thread, on a client not used by other requests, so that it can run concurrently.
+        Clients are created when needed, so their number is bounded by the number of concurrent requests.
+
+        Args:
+            fct: Function to execute, called with the client.
+
+        Returns:
+            The return value of the function.
+        """
+        return await self.limiter.Execute(lambda: to_thread(self.__ExecuteOnFreeClient, fct))
+
+    def IsTokenExpiring(self) -> bool:
+        """
+        Get if the access token is going to expire soon.
+
+        Returns:
+            True if the access token is going to expire soon, False otherwise.
+        """
+        expiry = getattr(self.google_sheet.client.oauth, "expiry", None)
+        if expiry is None:
+            return False
+
+        # Credentials expiry is a naive UTC datetime
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return (expiry - now).total_seconds() < GoogleSheetPoolConst.TOKEN_REFRESH_MARGIN_SEC
+
+    def RefreshToken(self) -> None:
+        """Refresh the access token (blocking)."""
+        self.__ExecuteLocked(self.google_sheet.client.oauth.refresh,
+                             google_auth_httplib2.Request(httplib2.Http()))
+
+    def __ExecuteOnFreeClient(self,
+                              fct: Callable[[Client], T]) -> T:
+        """
+        Execute a blocking request on a free client.
+
+        Args:
+            fct: Function to execute, called with the client.
+
+        Returns:
+            The return value of the function.
+        """
+        with self.free_clients_lock:
+            client = self.free_clients.pop() if self.free_clients else None
+        if client is None:
+            client = Client(self.google_sheet.client.oauth, retries=0, check=False)
+
+        try:
+            return fct(client)
+        finally:
+            with self.free_clients_lock:
+                self.free_clients.append(client)
+
+    def __ExecuteLocked(self,
+                        fct: Callable[..., T],
+                        *args: Any,
+                        **kwargs: Any) -> T:
+        """
+        Execute a blocking request, serialized with the other ones.
+
+        Args:
+            fct: Function to execute.
+            *args: Positional arguments for the function.
+            **kwargs: Keyword arguments for the function.
+
+        Returns:
+            The return value of the function.
+        """
+        with self.lock:
+            return fct(*args, **kwargs)
+
+
+class GoogleSheetPool:
+    """
+    Process-wide pool of authorized Google Sheets, keyed by credential file and sheet ID.
+    Requests are limited per credential file, since quota is counted per user (and project) of the credentials.
+    Access tokens are refreshed in background before they expire.
+    """
+
+    handles: Dict[Tuple[str, str], GoogleSheetHandle] = {}
+    handles_lock: threading.Lock = threading.Lock()
+    limiters: Dict[str, GoogleRequestLimiter] = {}
+    limiters_lock: threading.Lock = threading.Lock()
+    refresh_task: Optional[asyncio.Future] = None
+
+    @classmethod
+    async def GetHandle(cls,
+                        config: ConfigObject,
+                        logger: Logger) -> GoogleSheetHandle:
+        """
+        Get the handle of the configured Google Sheet, opening it if not already open.
+
+        Args:
+            config: Configuration object.
+            logger: Logger object.
+
+        Returns:
+            Google Sheet handle.
+        """
+        key = cls.__GetKey(config)
+        handle = cls.handles.get(key)
+        if handle is None:
+            handle = await cls.GetLimiter(config).Execute(lambda: to_thread(cls.__GetOrOpen, key, config, logger))
+
+        if cls.refresh_task is None or cls.refresh_task.done():
+            cls.refresh_task = asyncio.ensure_future(cls.__RefreshTokens(logger))
+
+        return handle
+
+    @classmethod
+    def GetLimiter(cls,
+                   config: ConfigObject) -> GoogleRequestLimiter:
+        """
+        Get the request limiter of the configured credentials, shared by all Google Sheets opened with them.
+        The limiter is created with the quota of the first configuration using the credentials.
+
+        Args:
+            config: Configuration object.
+
+        Returns:
+            Request limiter.
+        """
+        cred_file = config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_CRED)
+        with cls.limiters_lock:
+            limiter = cls.limiters.get(cred_file)
+            if limiter is None:
+                limiter = GoogleRequestLimiter(config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_QUOTA_MIN),
+                                               config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_MAX_RETRIES))
+                cls.limiters[cred_file] = limiter
+            return limiter
+
+    @classmethod
+    def Invalidate(cls,
+                   config: ConfigObject) -> None:
+        """
+        Invalidate the handle of the configured Google Sheet, so that it is authorized and opened again when needed.
+
+        Args:
+            config: Configuration object.
+        """
+        with cls.handles_lock:
+            cls.handles.pop(cls.__GetKey(config), None)
+
+    @staticmethod
+    def __GetKey(config: ConfigObject) -> Tuple[str, str]:
+        """
+        Get the pool key of the configured Google Sheet.
+
+        Args:
+            config: Configuration object.
+
+        Returns:
+            Tuple of (credential file, sheet ID).
+        """
+        return (config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_CRED),
+                config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_SHEET_ID))
+
+    @classmethod
+    def __GetOrOpen(cls,
+                    key: Tuple[str, str],
+                    config: ConfigObject,
+                    logger: Logger) -> GoogleSheetHandle:
+        """
+        Get a handle from the pool, opening the Google Sheet if not present (blocking).
+
+        Args:
+            key: Pool key.
+            config: Configuration object.
+            logger: Logger object.
+
+        Returns:
+            Google Sheet handle.
+        """
+        with cls.handles_lock:
+            handle = cls.handles.get(key)
+            if handle is None:
+                handle = GoogleSheetHandle(cls.__OpenGoogleSheet(config, logger), cls.GetLimiter(config))
+                cls.handles[key] = handle
+            return handle
+
+    @staticmethod
+    def __OpenGoogleSheet(config: ConfigObject,
+                          logger: Logger) -> pygsheets.Spreadsheet:
+        """
+        Open Google Sheet using configured credentials (blocking).
+
+        Args:
+            config: Configuration object.
+            logger: Logger object.
+
+        Returns:
+            Google Sheet.
+        """
+        # Get configuration
+        sheet_id = config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_SHEET_ID)
+        cred_file = config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_CRED)
+        cred_type = config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_CRED_TYPE)
+
+        # Log
+        logger.GetLogger().info(f"Credential file: {cred_file}")
+        logger.GetLogger().info(f"Credential type: {cred_type}")
+        logger.GetLogger().info(f"Opening Google Sheet ID \"{sheet_id}\"...")
+
+        # Authorize and open Google Sheet
+        # Retries are disabled in the client, since they are handled by the request limiter without blocking
+        if cred_type == GoogleCredTypes.OAUTH2:
+            cred_path = config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_CRED_PATH)
+            logger.GetLogger().info(f"Credential path: {cred_path}")
+
+            google_client = pygsheets.authorize(
+                client_secret=cred_file,
+                credentials_directory=cred_path,
+                local=True,
+                retries=0,
+                check=False
+            )
+        elif cred_type == GoogleCredTypes.SERVICE_ACCOUNT:
+            google_client = pygsheets.authorize(service_file=cred_file, retries=0, check=False)
+        else:
+            raise ValueError("Invalid credential type")
+
+        return google_client.open_by_key(sheet_id)
+
+    @classmethod
+    async def __RefreshTokens(cls,
+                              logger: Logger) -> None:
+        """
+        Periodically refresh the access tokens that are going to expire.
+
+        Args:
+            logger: Logger object.
+        """
+        while True:
+            await asyncio.sleep(GoogleSheetPoolConst.TOKEN_CHECK_PERIOD_SEC)
+
+            for handle in list(cls.handles.values()):
+                if not handle.IsTokenExpiring():
+                    continue
+                try:
+                    await to_thread(handle.RefreshToken)
+                    logger.GetLogger().info("Google access token refreshed")
+                except GoogleAuthError:
+                    logger.GetLogger().exception("An error occurred while refreshing Google access token")
@@ -18,12 +18,18 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from typing import List
+import asyncio
+from collections import deque
+from itertools import zip_longest
+from typing import AsyncIterator, Deque, List, Optional, Sequence
+
+import pygsheets
+from pygsheets import GridRange
 
 from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.google.google_request_limiter import GoogleRequestStats
 from telegram_payment_bot.google.google_sheet_opener import GoogleSheetOpener
 from telegram_payment_bot.logger.logger import Logger
-from telegram_payment_bot.misc.async_helpers import to_thread
 
 
 class GoogleSheetRowsGetter:
@@ -43,6 +49,28 @@ class GoogleSheetRowsGetter:
         """
         self.google_sheet_opener = GoogleSheetOpener(config, logger)
 
+    async def GetModifiedTime(self) -> str:
+        """
+        Get the last time the Google Sheet was modified, to detect changes without downloading rows.
+
+        Returns:
+            Modified time in RFC 3339 format.
+        """
+        return await self.google_sheet_opener.GetModifiedTime()
+
+    def GetRequestStats(self) -> GoogleRequestStats:
+        """
+        Get the counters of Google requests.
+
+        Returns:
+            Request counters.
+        """
+        return self.google_sheet_opener.GetRequestStats()
+
+    def Invalidate(self) -> None:
+        """Invalidate the shared Google Sheet, so that it is authorized and opened again when needed."""
+        self.google_sheet_opener.Invalidate()
+
     async def GetRows(self,
                       worksheet_idx: int) -> List[List[str]]:
         """
@@ -55,9 +83,141 @@ class GoogleSheetRowsGetter:
             List of rows, where each row is a list of strings.
         """
         worksheet = await self.google_sheet_opener.OpenWorksheet(worksheet_idx)
-        return await to_thread(
+        return await self.google_sheet_opener.Execute(
             worksheet.get_all_values,
             include_tailing_empty_rows=False,
             include_tailing_empty=False,
             returnas="matrix"
         )
+
+    async def GetRowsByColumns(self,
+                               worksheet_idx: int,
+                               cols: Sequence[str]) -> List[List[str]]:
+        """
+        Get all rows from a worksheet, fetching only the specified columns with a single request.
+
+        Args:
+            worksheet_idx: Worksheet index.
+            cols: Column letters (e.g., 'A', 'B').
+
+        Returns:
+            List of rows, where each row is a list of strings with the values of the specified columns, in the same order.
+        """
+        columns = await self.GetColumns(worksheet_idx, cols)
+        return [list(row) for row in zip_longest(*columns, fillvalue="")]
+
+    async def GetRowsPaged(self,
+                           worksheet_idx: int,
+                           page_size: int,
+                           max_concurrency: int,
+                           cols: Optional[Sequence[str]] = None) -> AsyncIterator[List[List[str]]]:
+        """
+        Get all rows from a worksheet page by page, fetching up to the specified number of pages concurrently.
+        Pages are returned in order as soon as they are available, so they can be processed while the next ones are
+        fetched. Empty rows at the end of the worksheet are not returned, like in GetRows.
+
+        Args:
+            worksheet_idx: Worksheet index.
+            page_size: Number of rows for each page.
+            max_concurrency: Maximum number of pages fetched concurrently.
+            cols: Column letters (e.g., 'A', 'B') to fetch only the specified columns, like in GetRowsByColumns.
+                  If None, all columns are fetched.
+
+        Returns:
+            Asynchronous iterator over pages, where each page is a list of rows.
+        """
+        worksheet = await self.google_sheet_opener.OpenWorksheet(worksheet_idx)
+        # Refresh worksheet properties to get the current number of rows
+        await self.google_sheet_opener.Execute(worksheet.refresh)
+        rows_num = worksheet.rows
+
+        first_rows = iter(range(1, rows_num + 1, page_size))
+        pending_pages: Deque[asyncio.Future] = deque()
+
+        def fetch_next_page() -> None:
+            first_row = next(first_rows, None)
+            if first_row is not None:
+                pending_pages.append(asyncio.ensure_future(
+                    self.__GetPage(worksheet, first_row, min(first_row + page_size - 1, rows_num), cols)
+                ))
+
+        for _ in range(max_concurrency):
+            fetch_next_page()
+
+        try:
+            empty_rows: List[List[str]] = []
+            while pending_pages:
+                rows = await pending_pages.popleft()
+                fetch_next_page()
+
+                # Hold back empty rows until some non-empty row follows, to skip the ones at the end of the worksheet
+                last_row_idx = max((i for i, row in enumerate(rows) if any(row)), default=-1)
+                if last_row_idx >= 0:
+                    yield empty_rows + rows[:last_row_idx + 1]
+                    empty_rows = []
+                empty_rows += rows[last_row_idx + 1:]
+        finally:
+            for pending_page in pending_pages:
+                pending_page.cancel()
+
+    async def GetColumns(self,
+                         worksheet_idx: int,
+                         cols: Sequence[str]) -> List[List[str]]:
+        """
+        Get whole columns from a worksheet, with a single request.
+
+        Args:
+            worksheet_idx: Worksheet index.
+            cols: Column letters (e.g., 'A', 'B').
+
+        Returns:
+            List of columns, where each column is a list of strings.
+        """
+        worksheet = await self.google_sheet_opener.OpenWorksheet(worksheet_idx)
+        values = await self.google_sheet_opener.Execute(
+            worksheet.get_values_batch,
+            [f"{col}:{col}" for col in cols],
+            majdim="COLUMNS"
+        )
+        return [col_values[0] if col_values else [] for col_values in values]
+
+    async def __GetPage(self,
+                        worksheet: pygsheets.Worksheet,
+                        first_row: int,
+                        last_row: int,
+                        cols: Optional[Sequence[str]]) -> List[List[str]]:
+        """
+        Get a page of rows from a worksheet.
+
+        Args:
+            worksheet: Worksheet.
+            first_row: First row index (1-based).
+            last_row: Last row index (1-based, included).
+            cols: Column letters to fetch only the specified columns, None to fetch all columns.
+
+        Returns:
+            List of rows, padded with empty rows up to the page size.
+        """
+        if cols:
+            ranges = [f"{col}{first_row}:{col}{last_row}" for col in cols]
+            major_dim = "COLUMNS"
+        else:
+            ranges = [f"{first_row}:{last_row}"]
+            major_dim = "ROWS"
+        labels = [GridRange.create(curr_range, worksheet).label for curr_range in ranges]
+
+        values = await self.google_sheet_opener.ExecuteOnFreeClient(
+            lambda client: client.get_range(worksheet.spreadsheet.id,
+                                            value_ranges=labels,
+                                            major_dimension=major_dim)
+        )
+
+        if cols:
+            rows = [list(row) for row in zip_longest(*[col_values[0] if col_values else [] for col_values in values],
+                                                     fillvalue="")]
+            empty_row = [""] * len(cols)
+        else:
+            rows = values[0]
+            empty_row = []
+
+        return rows + [list(empty_row) for _ in range(last_row - first_row + 1 - len(rows))]
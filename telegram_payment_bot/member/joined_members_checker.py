@@ -27,6 +27,7 @@ from telegram_payment_bot.config.config_object import ConfigObject
 from telegram_payment_bot.logger.logger import Logger
 from telegram_payment_bot.member.members_kicker import MembersKicker
 from telegram_payment_bot.misc.helpers import UserHelper
+from telegram_payment_bot.payment.payments_repository import PaymentsRepository
 from telegram_payment_bot.translator.translation_loader import TranslationLoader
 
 
@@ -44,7 +45,8 @@ class JoinedMembersChecker:
                  client: pyrogram.Client,
                  config: ConfigObject,
                  logger: Logger,
-                 translator: TranslationLoader) -> None:
+                 translator: TranslationLoader,
+                 payments_repository: PaymentsRepository) -> None:
         """
         Initialize the joined members checker.
 
@@ -53,13 +55,14 @@ class JoinedMembersChecker:
             config: Configuration object.
             logger: Logger instance.
             translator: Translation loader instance.
+            payments_repository: Payments repository.
         """
         self.client = client
         self.config = config
         self.logger = logger
         self.translator = translator
         self.auth_users_msg_sender = AuthorizedUsersMessageSender(client, config, logger)
-        self.member_kicker = MembersKicker(client, config, logger)
+        self.member_kicker = MembersKicker(client, config, logger, payments_repository)
 
     async def CheckNewUsers(self,
                             chat: pyrogram.types.Chat,
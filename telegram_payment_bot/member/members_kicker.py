@@ -29,6 +29,7 @@ from telegram_payment_bot.member.members_payment_getter import MembersPaymentGet
 from telegram_payment_bot.member.members_username_getter import MembersUsernameGetter
 from telegram_payment_bot.misc.ban_helper import BanHelper
 from telegram_payment_bot.misc.chat_members import ChatMembersList
+from telegram_payment_bot.payment.payments_repository import PaymentsRepository
 
 
 class MembersKickerConst:
@@ -50,7 +51,8 @@ class MembersKicker:
     def __init__(self,
                  client: pyrogram.Client,
                  config: ConfigObject,
-                 logger: Logger) -> None:
+                 logger: Logger,
+                 payments_repository: PaymentsRepository) -> None:
         """
         Initialize the members kicker.
 
@@ -58,12 +60,13 @@ class MembersKicker:
             client: Pyrogram client instance.
             config: Configuration object.
             logger: Logger instance.
+            payments_repository: Payments repository.
         """
         self.client = client
         self.config = config
         self.logger = logger
         self.ban_helper = BanHelper(client)
-        self.members_payment_getter = MembersPaymentGetter(client, config, logger)
+        self.members_payment_getter = MembersPaymentGetter(client, config, logger, payments_repository)
         self.members_username_getter = MembersUsernameGetter(client, config)
 
     async def KickAllWithExpiredPayment(self,
@@ -18,7 +18,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from typing import Any, Dict, Optional
+from typing import List
 
 import pyrogram
 
@@ -27,9 +27,8 @@ from telegram_payment_bot.logger.logger import Logger
 from telegram_payment_bot.misc.chat_members import ChatMembersGetter, ChatMembersList
 from telegram_payment_bot.misc.helpers import MemberHelper
 from telegram_payment_bot.misc.user import User
-from telegram_payment_bot.payment.payments_data import PaymentsData, SinglePayment
-from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
-from telegram_payment_bot.payment.payments_loader_factory import PaymentsLoaderFactory
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase
+from telegram_payment_bot.payment.payments_repository import PaymentsRepository
 
 
 class MembersPaymentGetter:
@@ -38,14 +37,13 @@ class MembersPaymentGetter:
     client: pyrogram.Client
     config: ConfigObject
     logger: Logger
-    payments_loader: PaymentsLoaderBase
-    payments_cache: Optional[PaymentsData]
-    single_payment_cache: Optional[Dict[str, Any]]
+    payments_repository: PaymentsRepository
 
     def __init__(self,
                  client: pyrogram.Client,
                  config: ConfigObject,
-                 logger: Logger) -> None:
+                 logger: Logger,
+                 payments_repository: PaymentsRepository) -> None:
         """
         Initialize the members payment getter.
 
@@ -53,18 +51,12 @@ class MembersPaymentGetter:
             client: Pyrogram client instance.
             config: Configuration object.
             logger: Logger instance.
+            payments_repository: Payments repository.
         """
         self.client = client
         self.config = config
         self.logger = logger
-        self.payments_loader = PaymentsLoaderFactory(config, logger).CreateLoader()
-        self.payments_cache = None
-        self.single_payment_cache = None
-
-    def ReloadPayment(self):
-        """Reload payment data by clearing the cache."""
-        self.payments_cache = None
-        self.single_payment_cache = None
+        self.payments_repository = payments_repository
 
     async def GetAllMembersWithOkPayment(self,
                                          chat: pyrogram.types.Chat) -> ChatMembersList:
@@ -105,14 +97,9 @@ class MembersPaymentGetter:
         if payments.Empty():
             return ChatMembersList()
 
-        return await ChatMembersGetter(self.client).FilterMembers(
+        return await ChatMembersGetter(self.client).FilterMembersBatch(
             chat,
-            lambda member: (
-                MemberHelper.IsValidMember(member) and
-                member.user is not None and
-                (member.user.username is None or
-                 payments.IsExpiredByUser(User.FromUserObject(self.config, member.user)))
-            )
+            lambda members: self.__GetExpiringMembersMask(payments, members, 0)
         )
 
     async def GetAllMembersWithExpiringPayment(self,
@@ -133,27 +120,22 @@ class MembersPaymentGetter:
         if payments.Empty():
             return ChatMembersList()
 
-        return await ChatMembersGetter(self.client).FilterMembers(
+        return await ChatMembersGetter(self.client).FilterMembersBatch(
             chat,
-            lambda member: (
-                MemberHelper.IsValidMember(member) and
-                member.user is not None and
-                (member.user.username is None or
-                 payments.IsExpiringInDaysByUser(User.FromUserObject(self.config, member.user), days))
-            )
+            lambda members: self.__GetExpiringMembersMask(payments, members, days)
         )
 
-    async def GetAllEmailsWithExpiredPayment(self) -> PaymentsData:
+    async def GetAllEmailsWithExpiredPayment(self) -> PaymentsDataBase:
         """
         Get all emails with expired payments.
 
         Returns:
-            PaymentsData containing expired payments.
+            Payments data containing expired payments.
         """
-        return (await self.__GetAllPayments()).FilterExpired()
+        return await self.payments_repository.GetExpired()
 
     async def GetAllEmailsWithExpiringPayment(self,
-                                              days: int) -> PaymentsData:
+                                              days: int) -> PaymentsDataBase:
         """
         Get all emails with payments expiring within specified days.
 
@@ -161,9 +143,9 @@ class MembersPaymentGetter:
             days: Number of days to check for expiration.
 
         Returns:
-            PaymentsData containing expiring payments.
+            Payments data containing expiring payments.
         """
-        return (await self.__GetAllPayments()).FilterExpiringInDays(days)
+        return await self.payments_repository.GetExpiringInDays(days)
 
     async def IsSingleMemberExpired(self,
                                     chat: pyrogram.types.Chat,
@@ -182,36 +164,42 @@ class MembersPaymentGetter:
         if chat_members is None:
             return False
 
-        single_payment = await self.__GetSinglePayment(user)
+        single_payment = await self.payments_repository.GetSingleByUser(User.FromUserObject(self.config, user))
         return single_payment.IsExpired() if single_payment is not None else True
 
-    async def __GetAllPayments(self) -> PaymentsData:
+    async def __GetAllPayments(self) -> PaymentsDataBase:
         """
-        Get all payments, loading them if not cached.
+        Get all payments from the repository.
 
         Returns:
-            PaymentsData containing all payments.
+            Payments data containing all payments.
         """
-        if self.payments_cache is None:
-            self.payments_cache = await self.payments_loader.LoadAll()
+        return await self.payments_repository.GetAll()
 
-        return self.payments_cache
-
-    async def __GetSinglePayment(self,
-                                 user: pyrogram.types.User) -> Optional[SinglePayment]:
+    def __GetExpiringMembersMask(self,
+                                 payments: PaymentsDataBase,
+                                 members: List[pyrogram.types.ChatMember],
+                                 days: int) -> List[bool]:
         """
-        Get a single user's payment, loading it if not cached.
+        Get which chat members have a payment expiring within specified days or no username, checking all payments at once.
+        Only the payments of the members are looked up, so payments data is never filtered as a whole.
 
         Args:
-            user: User to get payment for.
+            payments: All payments.
+            members: Chat members.
+            days: Number of days to check for expiration (0 for expired payments).
 
         Returns:
-            SinglePayment for the user, or None if not found.
+            List of flags, True if the corresponding member has an expiring payment or no username, False otherwise.
         """
-        if self.single_payment_cache is None or self.single_payment_cache["user_id"] != user.id:
-            self.single_payment_cache = {
-                "payment": await self.payments_loader.LoadSingleByUser(User.FromUserObject(self.config, user)),
-                "user_id": user.id,
-            }
+        mask = [MemberHelper.IsValidMember(member) and member.user is not None for member in members]
+
+        with_username_idxs = [i for i, member in enumerate(members) if mask[i] and member.user.username is not None]
+        expiring_mask = payments.GetExpiringInDaysMask(
+            [User.FromUserObject(self.config, members[i].user) for i in with_username_idxs],
+            days
+        )
+        for i, expiring in zip(with_username_idxs, expiring_mask):
+            mask[i] = expiring
 
-        return self.single_payment_cache["payment"]
+        return mask
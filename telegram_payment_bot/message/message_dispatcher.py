@@ -163,4 +163,5 @@ class MessageDispatcher:
             await JoinedMembersChecker(client,
                                        self.config,
                                        self.logger,
-                                       self.translator).CheckNewUsers(message.chat, message.new_chat_members)
+                                       self.translator,
+                                       kwargs["payments_repository"]).CheckNewUsers(message.chat, message.new_chat_members)
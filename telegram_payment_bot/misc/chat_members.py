@@ -18,7 +18,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Sequence
 
 import pyrogram
 from pyrogram.enums import ChatMembersFilter
@@ -136,14 +136,26 @@ class ChatMembersGetter:
         filtered_members = [member async for member in self.client.get_chat_members(chat.id, filter=filter_type)]
         if filter_fct is not None:
             filtered_members = list(filter(filter_fct, filtered_members))
-        filtered_members.sort(
-            key=lambda member: member.user.username.lower() if member.user.username is not None else str(member.user.id)
-        )
+        return self.__SortMembers(filtered_members)
 
-        chat_members = ChatMembersList()
-        chat_members.AddMultiple(filtered_members)
+    async def FilterMembersBatch(self,
+                                 chat: pyrogram.types.Chat,
+                                 filter_batch_fct: Callable[[List[pyrogram.types.ChatMember]], Sequence[bool]],
+                                 filter_type: ChatMembersFilter = ChatMembersFilter.SEARCH) -> ChatMembersList:
+        """
+        Get the list of chat members by applying the specified filter to all members at once.
 
-        return chat_members
+        Args:
+            chat: The chat to get members from.
+            filter_batch_fct: Filter function returning a flag for each member.
+            filter_type: Pyrogram filter.
+
+        Returns:
+            A sorted and filtered list of chat members.
+        """
+        members = [member async for member in self.client.get_chat_members(chat.id, filter=filter_type)]
+        mask = filter_batch_fct(members)
+        return self.__SortMembers([member for member, keep in zip(members, mask) if keep])
 
     async def GetAll(self,
                      chat: pyrogram.types.Chat) -> ChatMembersList:
@@ -187,3 +199,23 @@ class ChatMembersGetter:
         return await self.FilterMembers(chat,
                                         lambda member: True,
                                         ChatMembersFilter.ADMINISTRATORS)
+
+    @staticmethod
+    def __SortMembers(members: List[pyrogram.types.ChatMember]) -> ChatMembersList:
+        """
+        Sort chat members by username (or ID if no username).
+
+        Args:
+            members: Chat members.
+
+        Returns:
+            A sorted list of chat members.
+        """
+        members.sort(
+            key=lambda member: member.user.username.lower() if member.user.username is not None else str(member.user.id)
+        )
+
+        chat_members = ChatMembersList()
+        chat_members.AddMultiple(members)
+
+        return chat_members
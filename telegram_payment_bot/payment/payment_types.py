@@ -27,3 +27,8 @@ class PaymentTypes(Enum):
 
     EXCEL_FILE = auto()
     GOOGLE_SHEET = auto()
+    CSV_FILE = auto()
+    SQLITE = auto()
+    SQL_DATABASE = auto()
+    HTTP_JSON = auto()
+    MULTI_SOURCE = auto()
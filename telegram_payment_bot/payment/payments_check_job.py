@@ -27,6 +27,7 @@ from telegram_payment_bot.config.config_object import ConfigObject
 from telegram_payment_bot.logger.logger import Logger
 from telegram_payment_bot.member.members_kicker import MembersKicker
 from telegram_payment_bot.misc.helpers import ChatHelper
+from telegram_payment_bot.payment.payments_repository import PaymentsRepository
 from telegram_payment_bot.translator.translation_loader import TranslationLoader
 from telegram_payment_bot.utils.wrapped_dict import WrappedDict
 
@@ -66,12 +67,14 @@ class PaymentsCheckJob:
     period: int
     auth_users_msg_sender: AuthorizedUsersMessageSender
     job_chats: PaymentsCheckJobChats
+    payments_repository: PaymentsRepository
 
     def __init__(self,
                  client: pyrogram.Client,
                  config: ConfigObject,
                  logger: Logger,
-                 translator: TranslationLoader) -> None:
+                 translator: TranslationLoader,
+                 payments_repository: PaymentsRepository) -> None:
         """
         Initialize the payments check job.
 
@@ -80,6 +83,7 @@ class PaymentsCheckJob:
             config: Configuration object.
             logger: Logger instance.
             translator: Translation loader instance.
+            payments_repository: Payments repository.
         """
         self.client = client
         self.config = config
@@ -89,6 +93,7 @@ class PaymentsCheckJob:
         self.period = 0
         self.auth_users_msg_sender = AuthorizedUsersMessageSender(client, config, logger)
         self.job_chats = PaymentsCheckJobChats()
+        self.payments_repository = payments_repository
 
     def GetPeriod(self) -> int:
         """
@@ -168,7 +173,7 @@ class PaymentsCheckJob:
                 self.logger.GetLogger().info("No chat to check, exiting...")
                 return
 
-            members_kicker = MembersKicker(self.client, self.config, self.logger)
+            members_kicker = MembersKicker(self.client, self.config, self.logger, self.payments_repository)
             for chat in self.job_chats.Values():
                 await self.__KickMembersInChat(chat, members_kicker)
 
@@ -26,6 +26,7 @@ from telegram_payment_bot.config.config_object import ConfigObject
 from telegram_payment_bot.logger.logger import Logger
 from telegram_payment_bot.misc.helpers import ChatHelper
 from telegram_payment_bot.payment.payments_check_job import PaymentsCheckJob, PaymentsCheckJobChats
+from telegram_payment_bot.payment.payments_repository import PaymentsRepository
 from telegram_payment_bot.translator.translation_loader import TranslationLoader
 
 
@@ -69,7 +70,8 @@ class PaymentsCheckScheduler:
                  client: pyrogram.Client,
                  config: ConfigObject,
                  logger: Logger,
-                 translator: TranslationLoader) -> None:
+                 translator: TranslationLoader,
+                 payments_repository: PaymentsRepository) -> None:
         """
         Initialize the payments check scheduler.
 
@@ -78,10 +80,11 @@ class PaymentsCheckScheduler:
             config: Configuration object.
             logger: Logger instance.
             translator: Translation loader instance.
+            payments_repository: Payments repository.
         """
         self.config = config
         self.logger = logger
-        self.payments_checker_job = PaymentsCheckJob(client, config, logger, translator)
+        self.payments_checker_job = PaymentsCheckJob(client, config, logger, translator, payments_repository)
         self.scheduler = AsyncIOScheduler()
         self.scheduler.start()
 
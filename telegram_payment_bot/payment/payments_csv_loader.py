@@ -0,0 +1,156 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import csv
+import mmap
+from typing import Any, AsyncIterator, Iterator, Optional, Tuple, Union
+
+from typing_extensions import override
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.misc.async_helpers import to_thread
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase, PaymentsDataErrors, SinglePayment
+from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+
+
+class PaymentsCsvLoaderConst:
+    """Constants for payment CSV loader class."""
+
+    ENCODING: str = "utf-8-sig"
+
+
+class PaymentsCsvLoader(PaymentsLoaderBase):
+    """
+    Loader for payment data from CSV files.
+    The file is memory-mapped and parsed line by line, so that large files are loaded in bounded memory.
+    """
+
+    @override
+    async def LoadSingleByUser(self,
+                               user: User) -> Optional[SinglePayment]:
+        """
+        Load a single payment by user from CSV file.
+        The file is scanned row by row, stopping at the first valid row of the user.
+
+        Args:
+            user: User to load payment for.
+
+        Returns:
+            SinglePayment for the user, or None if not found.
+
+        Raises:
+            Exception: If an error occurs while loading the file.
+        """
+        payment_file = self.config.GetValue(BotConfigTypes.PAYMENT_CSV_FILE)
+
+        try:
+            return await to_thread(self._FindSinglePayment, self.__IterCsvRows(), user)
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading user {user} from file '{payment_file}'")
+            raise
+
+    @override
+    async def _LoadAndCheckAll(self) -> Tuple[PaymentsDataBase, Optional[PaymentsDataErrors]]:
+        """
+        Load and check all payments from CSV file.
+
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors or None if collected by lazy payments data).
+
+        Raises:
+            Exception: If an error occurs while loading the file.
+        """
+        payment_file = self.config.GetValue(BotConfigTypes.PAYMENT_CSV_FILE)
+
+        try:
+            self.logger.GetLogger().info(f"Loading file '{payment_file}'...")
+
+            payments_data, payments_data_err = await super()._LoadAndCheckAll()
+            self.logger.GetLogger().info(
+                f"File '{payment_file}' successfully loaded, number of rows: {payments_data.LoadedCount()}"
+            )
+
+            return payments_data, payments_data_err
+
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading file '{payment_file}'")
+            raise
+
+    @override
+    async def _GetSourceVersion(self) -> Optional[Tuple[str, int, Union[int, str]]]:
+        """
+        Get the CSV file version, i.e. its path, size and last modification time.
+
+        Returns:
+            Tuple of (path, size, modification time in nanoseconds), or None if the file cannot be accessed.
+        """
+        return await self._GetFileVersion(self.config.GetValue(BotConfigTypes.PAYMENT_CSV_FILE), False)
+
+    @override
+    async def _IterRawRows(self) -> AsyncIterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of the CSV file, skipping the header.
+        Rows are read in chunks in a separate thread.
+
+        Returns:
+            Asynchronous iterator over tuples of (row index, email, user string, expiration).
+        """
+        async for row in self._IterRowsInThread(self.__IterCsvRows()):
+            yield row
+
+    def __IterCsvRows(self) -> Iterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of the CSV file, skipping the header.
+        The file is opened when the iteration starts and closed as soon as it ends.
+
+        Returns:
+            Iterator over tuples of (row index, email, user string, expiration).
+        """
+        email_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EMAIL_COL))
+        user_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_USER_COL))
+        expiration_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EXPIRATION_COL))
+        max_col_idx = max(email_col_idx, user_col_idx, expiration_col_idx)
+
+        with open(self.config.GetValue(BotConfigTypes.PAYMENT_CSV_FILE), "rb") as fin:
+            # An empty file cannot be mapped
+            if fin.seek(0, 2) == 0:
+                return
+
+            with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Lines are decoded one at a time, the csv reader joins them if a quoted field contains new lines
+                lines = (line.decode(PaymentsCsvLoaderConst.ENCODING) for line in iter(mm.readline, b""))
+                csv_reader = csv.reader(lines, delimiter=self.config.GetValue(BotConfigTypes.PAYMENT_CSV_DELIMITER))
+
+                for i, row in enumerate(csv_reader, start=1):
+                    if i == 1:
+                        continue
+
+                    if len(row) <= max_col_idx:
+                        if any(row):
+                            self.logger.GetLogger().warning(
+                                f"Row index {i} is not valid (some fields are missing), skipping it..."
+                            )
+                        continue
+
+                    yield (i,
+                           row[email_col_idx].strip(),
+                           row[user_col_idx].strip(),
+                           row[expiration_col_idx].strip())
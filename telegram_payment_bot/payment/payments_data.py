@@ -20,9 +20,12 @@
 
 from __future__ import annotations
 
+import bisect
 import datetime
+import typing
+from abc import ABC, abstractmethod
 from enum import Enum, auto, unique
-from typing import Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
 from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
 from telegram_payment_bot.config.config_object import ConfigObject
@@ -37,6 +40,7 @@ class PaymentErrorTypes(Enum):
 
     DUPLICATED_DATA_ERR = auto()
     INVALID_DATE_ERR = auto()
+    CROSS_SOURCE_CONFLICT_ERR = auto()
 
 
 class SinglePayment:
@@ -205,6 +209,66 @@ class PaymentError:
         return self.expiration_date
 
 
+class PaymentRow:
+    """Represents a row read from payment data, containing either a valid payment or an error."""
+
+    row: int
+    payment: Optional[SinglePayment]
+    error: Optional[PaymentError]
+
+    def __init__(self,
+                 row: int,
+                 payment: Optional[SinglePayment] = None,
+                 error: Optional[PaymentError] = None):
+        """
+        Initialize a payment row.
+
+        Args:
+            row: Row number.
+            payment: Payment (if the row is valid).
+            error: Error (if the row is not valid).
+        """
+        self.row = row
+        self.payment = payment
+        self.error = error
+
+    def Row(self) -> int:
+        """
+        Get the row number.
+
+        Returns:
+            Row number.
+        """
+        return self.row
+
+    def Payment(self) -> Optional[SinglePayment]:
+        """
+        Get the payment.
+
+        Returns:
+            Payment, or None if the row is not valid.
+        """
+        return self.payment
+
+    def Error(self) -> Optional[PaymentError]:
+        """
+        Get the error.
+
+        Returns:
+            Error, or None if the row is valid.
+        """
+        return self.error
+
+    def IsError(self) -> bool:
+        """
+        Get if the row is not valid.
+
+        Returns:
+            True if the row is not valid, False otherwise.
+        """
+        return self.error is not None
+
+
 class PaymentsDataErrors(WrappedList):
     """Collection of payment data errors."""
 
@@ -225,8 +289,91 @@ class PaymentsDataErrors(WrappedList):
         self.AddSingle(PaymentError(err_type, row, user, expiration))
 
 
-class PaymentsData(WrappedDict):
-    """Collection of payment data."""
+class PaymentsDataDiff:
+    """
+    Differences between two payments data, keyed by user key.
+    Added, renewed and expired payments are the current ones, removed payments are the previous ones.
+    """
+
+    added: Dict[typing.Any, SinglePayment]
+    removed: Dict[typing.Any, SinglePayment]
+    renewed: Dict[typing.Any, SinglePayment]
+    expired: Dict[typing.Any, SinglePayment]
+
+    def __init__(self) -> None:
+        """Initialize payments data differences."""
+        self.added = {}
+        self.removed = {}
+        self.renewed = {}
+        self.expired = {}
+
+    def Added(self) -> Dict[typing.Any, SinglePayment]:
+        """
+        Get the payments of new users.
+
+        Returns:
+            Dictionary of user key to payment.
+        """
+        return self.added
+
+    def Removed(self) -> Dict[typing.Any, SinglePayment]:
+        """
+        Get the payments of users not present anymore.
+
+        Returns:
+            Dictionary of user key to previous payment.
+        """
+        return self.removed
+
+    def Renewed(self) -> Dict[typing.Any, SinglePayment]:
+        """
+        Get the payments whose expiration date moved forward.
+
+        Returns:
+            Dictionary of user key to payment.
+        """
+        return self.renewed
+
+    def Expired(self) -> Dict[typing.Any, SinglePayment]:
+        """
+        Get the payments whose expiration date moved backward (e.g. cancelled or refunded payments).
+
+        Returns:
+            Dictionary of user key to payment.
+        """
+        return self.expired
+
+    def Any(self) -> bool:
+        """
+        Check if there is any difference.
+
+        Returns:
+            True if any difference, False otherwise.
+        """
+        return any((self.added, self.removed, self.renewed, self.expired))
+
+    def ToString(self) -> str:
+        """
+        Convert to string representation.
+
+        Returns:
+            String representation.
+        """
+        return (f"added: {len(self.added)}, removed: {len(self.removed)}, "
+                f"renewed: {len(self.renewed)}, expired: {len(self.expired)}")
+
+    def __str__(self) -> str:
+        """
+        Convert to string representation.
+
+        Returns:
+            String representation.
+        """
+        return self.ToString()
+
+
+class PaymentsDataBase(ABC):
+    """Base class for collections of payment data."""
 
     config: ConfigObject
 
@@ -238,9 +385,22 @@ class PaymentsData(WrappedDict):
         Args:
             config: Configuration object.
         """
-        super().__init__()
         self.config = config
 
+    @staticmethod
+    def NormalizeEmail(email: str) -> str:
+        """
+        Normalize an email address for lookups.
+
+        Args:
+            email: Email address.
+
+        Returns:
+            Normalized email address.
+        """
+        return email.strip().lower()
+
+    @abstractmethod
     def AddPayment(self,
                    email: str,
                    user: User,
@@ -256,15 +416,8 @@ class PaymentsData(WrappedDict):
         Returns:
             True if added successfully, False if user already exists or email is duplicated.
         """
-        if not self.IsUserExistent(user):
-            if self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL):
-                if email != "" and self.IsEmailExistent(email):
-                    return False
-            self.AddSingle(user.GetAsKey(), SinglePayment(email, user, expiration))
-            return True
-
-        return False
 
+    @abstractmethod
     def GetByEmail(self,
                    email: str) -> Optional[SinglePayment]:
         """
@@ -276,11 +429,8 @@ class PaymentsData(WrappedDict):
         Returns:
             SinglePayment if found, None otherwise.
         """
-        for _, payment in self.dict_elements.items():
-            if email == payment.Email():
-                return payment
-        return None
 
+    @abstractmethod
     def GetByUser(self,
                   user: User) -> Optional[SinglePayment]:
         """
@@ -292,9 +442,87 @@ class PaymentsData(WrappedDict):
         Returns:
             SinglePayment if found, None otherwise.
         """
-        if not user.IsValid() or user.GetAsKey() not in self.dict_elements:
-            return None
-        return self.dict_elements[user.GetAsKey()]
+
+    @abstractmethod
+    def FilterExpired(self) -> PaymentsDataBase:
+        """
+        Filter and return only expired payments.
+
+        Returns:
+            Payments data containing only expired payments, sorted by expiration date.
+        """
+
+    @abstractmethod
+    def FilterExpiringInDays(self,
+                             days: int) -> PaymentsDataBase:
+        """
+        Filter and return payments expiring within specified days.
+
+        Args:
+            days: Number of days to check.
+
+        Returns:
+            Payments data containing payments expiring within specified days, sorted by expiration date.
+        """
+
+    @abstractmethod
+    def GetNextExpiring(self,
+                        count: int) -> PaymentsDataBase:
+        """
+        Get the next payments to expire (expired payments are excluded).
+
+        Args:
+            count: Maximum number of payments to get.
+
+        Returns:
+            Payments data containing the next expiring payments, sorted by expiration date.
+        """
+
+    @abstractmethod
+    def Values(self) -> Iterable[SinglePayment]:
+        """
+        Get all payments.
+
+        Returns:
+            Iterable over all payments.
+        """
+
+    @abstractmethod
+    def Count(self) -> int:
+        """
+        Get payments count.
+
+        Returns:
+            Number of payments.
+        """
+
+    def LoadedCount(self) -> int:
+        """
+        Get loaded payments count, without parsing payments that are parsed lazily (so, for lazy payments data,
+        payments whose expiration date turns out to be not valid are also counted).
+
+        Returns:
+            Number of loaded payments.
+        """
+        return self.Count()
+
+    def Any(self) -> bool:
+        """
+        Check if any payment exists.
+
+        Returns:
+            True if not empty, False otherwise.
+        """
+        return self.Count() > 0
+
+    def Empty(self) -> bool:
+        """
+        Check if empty.
+
+        Returns:
+            True if empty, False otherwise.
+        """
+        return self.Count() == 0
 
     def IsEmailExistent(self,
                         email: str) -> bool:
@@ -352,41 +580,78 @@ class PaymentsData(WrappedDict):
         payment = self.GetByUser(user)
         return payment.IsExpiringInDays(days) if payment is not None else True
 
-    def FilterExpired(self) -> PaymentsData:
+    def GetExpiredMask(self,
+                       users: Sequence[User]) -> List[bool]:
         """
-        Filter and return only expired payments.
+        Check if the payments of multiple users are expired.
+
+        Args:
+            users: Users to check.
 
         Returns:
-            PaymentsData containing only expired payments.
+            List of flags, True if the corresponding user payment is expired or user not found, False otherwise.
         """
-        expired_payments = {user: payment for (user, payment)
-                            in self.dict_elements.items()
-                            if payment.IsExpired()}
+        return self.GetExpiringInDaysMask(users, 0)
 
-        payments = PaymentsData(self.config)
-        payments.AddMultiple(expired_payments)
+    def GetExpiringInDaysMask(self,
+                              users: Sequence[User],
+                              days: int) -> List[bool]:
+        """
+        Check if the payments of multiple users are expiring within specified days.
 
-        return payments
+        Args:
+            users: Users to check.
+            days: Number of days to check.
 
-    def FilterExpiringInDays(self,
-                             days: int) -> PaymentsData:
+        Returns:
+            List of flags, True if the corresponding user payment is expiring or user not found, False otherwise.
         """
-        Filter and return payments expiring within specified days.
+        limit_date = datetime.date.today() + datetime.timedelta(days=days)
+
+        mask = []
+        for user in users:
+            payment = self.GetByUser(user)
+            mask.append(payment is None or payment.ExpirationDate() < limit_date)
+        return mask
+
+    def Diff(self,
+             previous: PaymentsDataBase) -> PaymentsDataDiff:
+        """
+        Get the differences from previous payments data.
+        Differences are computed in one pass over the user indexes of both payments data.
 
         Args:
-            days: Number of days to check.
+            previous: Previous payments data.
 
         Returns:
-            PaymentsData containing payments expiring within specified days.
+            PaymentsDataDiff containing the differences.
         """
-        expiring_payments = {user: payment for (user, payment)
-                             in self.dict_elements.items()
-                             if payment.IsExpiringInDays(days)}
+        curr_index = self._GetUserIndex()
+        prev_index = previous._GetUserIndex()
 
-        payments = PaymentsData(self.config)
-        payments.AddMultiple(expiring_payments)
+        diff = PaymentsDataDiff()
+        for user_key, payment in curr_index.items():
+            prev_payment = prev_index.get(user_key)
+            if prev_payment is None:
+                diff.added[user_key] = payment
+            elif payment.ExpirationDate() > prev_payment.ExpirationDate():
+                diff.renewed[user_key] = payment
+            elif payment.ExpirationDate() < prev_payment.ExpirationDate():
+                diff.expired[user_key] = payment
+        for user_key in prev_index.keys() - curr_index.keys():
+            diff.removed[user_key] = prev_index[user_key]
 
-        return payments
+        return diff
+
+    def _GetUserIndex(self) -> Mapping[typing.Any, SinglePayment]:
+        """
+        Get payments indexed by user key.
+        By default, the index is built from all payments.
+
+        Returns:
+            Mapping of user key to payment.
+        """
+        return {payment.User().GetAsKey(): payment for payment in self.Values()}
 
     def ToString(self) -> str:
         """
@@ -396,7 +661,7 @@ class PaymentsData(WrappedDict):
             String representation.
         """
         return "\n".join(
-            [f"- {str(payment)}" for _, payment in self.dict_elements.items()]
+            [f"- {str(payment)}" for payment in self.Values()]
         )
 
     def __str__(self) -> str:
@@ -407,3 +672,254 @@ class PaymentsData(WrappedDict):
             String representation.
         """
         return self.ToString()
+
+
+class PaymentsData(WrappedDict, PaymentsDataBase):
+    """Collection of payment data, stored as a dictionary of SinglePayment objects."""
+
+    email_index: Dict[str, List[SinglePayment]]
+    expiry_index: Optional[Tuple[List[int], List[typing.Any]]]
+
+    def __init__(self,
+                 config: ConfigObject) -> None:
+        """
+        Initialize payments data collection.
+
+        Args:
+            config: Configuration object.
+        """
+        WrappedDict.__init__(self)
+        PaymentsDataBase.__init__(self, config)
+        self.email_index = {}
+        self.expiry_index = None
+
+    def AddSingle(self,
+                  key: typing.Any,
+                  value: typing.Any) -> None:
+        """
+        Add a single payment, keeping the email index updated.
+
+        Args:
+            key: User key.
+            value: SinglePayment object.
+        """
+        self.RemoveSingle(key)
+        super().AddSingle(key, value)
+        self.__IndexEmail(value)
+        self.expiry_index = None
+
+    def AddMultiple(self,
+                    elements: Union[Dict[typing.Any, typing.Any], WrappedDict]) -> None:
+        """
+        Add multiple payments, keeping the email index updated.
+
+        Args:
+            elements: Dictionary or WrappedDict containing payments to add.
+        """
+        items = elements.Items() if isinstance(elements, WrappedDict) else elements.items()
+        for key, payment in items:
+            self.AddSingle(key, payment)
+
+    def RemoveSingle(self,
+                     key: typing.Any) -> None:
+        """
+        Remove a single payment, keeping the email index updated.
+
+        Args:
+            key: User key.
+        """
+        payment = self.dict_elements.pop(key, None)
+        if payment is not None:
+            self.__UnindexEmail(payment)
+            self.expiry_index = None
+
+    def Clear(self) -> None:
+        """Clear all payments."""
+        super().Clear()
+        self.email_index.clear()
+        self.expiry_index = None
+
+    def AddPayment(self,
+                   email: str,
+                   user: User,
+                   expiration: datetime.date) -> bool:
+        """
+        Add a payment to the collection.
+
+        Args:
+            email: User email address.
+            user: User object.
+            expiration: Payment expiration date.
+
+        Returns:
+            True if added successfully, False if user already exists or email is duplicated.
+        """
+        if not self.IsUserExistent(user):
+            if self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL):
+                if email != "" and self.IsEmailExistent(email):
+                    return False
+            self.AddSingle(user.GetAsKey(), SinglePayment(email, user, expiration))
+            return True
+
+        return False
+
+    def GetByEmail(self,
+                   email: str) -> Optional[SinglePayment]:
+        """
+        Get payment by email address.
+
+        Args:
+            email: Email address to search for.
+
+        Returns:
+            SinglePayment if found, None otherwise.
+        """
+        email_payments = self.email_index.get(self.NormalizeEmail(email))
+        return email_payments[0] if email_payments else None
+
+    def GetByUser(self,
+                  user: User) -> Optional[SinglePayment]:
+        """
+        Get payment by user.
+
+        Args:
+            user: User to search for.
+
+        Returns:
+            SinglePayment if found, None otherwise.
+        """
+        if not user.IsValid() or user.GetAsKey() not in self.dict_elements:
+            return None
+        return self.dict_elements[user.GetAsKey()]
+
+    def FilterExpired(self) -> PaymentsData:
+        """
+        Filter and return only expired payments.
+
+        Returns:
+            PaymentsData containing only expired payments, sorted by expiration date.
+        """
+        return self.__FilterExpiringBefore(datetime.date.today().toordinal())
+
+    def FilterExpiringInDays(self,
+                             days: int) -> PaymentsData:
+        """
+        Filter and return payments expiring within specified days.
+
+        Args:
+            days: Number of days to check.
+
+        Returns:
+            PaymentsData containing payments expiring within specified days, sorted by expiration date.
+        """
+        return self.__FilterExpiringBefore(datetime.date.today().toordinal() + days)
+
+    def GetNextExpiring(self,
+                        count: int) -> PaymentsData:
+        """
+        Get the next payments to expire (expired payments are excluded).
+
+        Args:
+            count: Maximum number of payments to get.
+
+        Returns:
+            PaymentsData containing the next expiring payments, sorted by expiration date.
+        """
+        ordinals, keys = self.__GetExpiryIndex()
+        start_idx = bisect.bisect_left(ordinals, datetime.date.today().toordinal())
+        return self.__FromExpiryIndexSlice(ordinals, keys, start_idx, min(start_idx + max(count, 0), len(keys)))
+
+    def _GetUserIndex(self) -> Mapping[typing.Any, SinglePayment]:
+        """
+        Get payments indexed by user key.
+
+        Returns:
+            Mapping of user key to payment.
+        """
+        return self.dict_elements
+
+    def __IndexEmail(self,
+                     payment: SinglePayment) -> None:
+        """
+        Add a payment to the email index.
+        Payments with the same email are kept in insertion order, so the first one is returned by GetByEmail.
+
+        Args:
+            payment: SinglePayment object.
+        """
+        if payment.Email() != "":
+            self.email_index.setdefault(self.NormalizeEmail(payment.Email()), []).append(payment)
+
+    def __UnindexEmail(self,
+                       payment: SinglePayment) -> None:
+        """
+        Remove a payment from the email index.
+
+        Args:
+            payment: SinglePayment object.
+        """
+        email_key = self.NormalizeEmail(payment.Email())
+        email_payments = self.email_index.get(email_key)
+        if email_payments is None:
+            return
+
+        for i, email_payment in enumerate(email_payments):
+            if email_payment is payment:
+                del email_payments[i]
+                break
+        if not email_payments:
+            del self.email_index[email_key]
+
+    def __GetExpiryIndex(self) -> Tuple[List[int], List[typing.Any]]:
+        """
+        Get the expiry index, building it if needed.
+        The index is built lazily, so that loading data is not slowed down by sorted insertions.
+
+        Returns:
+            Tuple of (sorted expiration date ordinals, corresponding user keys).
+        """
+        if self.expiry_index is None:
+            entries = sorted(
+                ((payment.ExpirationDate().toordinal(), key) for key, payment in self.dict_elements.items()),
+                key=lambda entry: entry[0]
+            )
+            self.expiry_index = ([entry[0] for entry in entries], [entry[1] for entry in entries])
+        return self.expiry_index
+
+    def __FilterExpiringBefore(self,
+                               ordinal: int) -> PaymentsData:
+        """
+        Filter payments expiring before the specified date ordinal.
+
+        Args:
+            ordinal: Date ordinal (excluded).
+
+        Returns:
+            PaymentsData containing the filtered payments, sorted by expiration date.
+        """
+        ordinals, keys = self.__GetExpiryIndex()
+        return self.__FromExpiryIndexSlice(ordinals, keys, 0, bisect.bisect_left(ordinals, ordinal))
+
+    def __FromExpiryIndexSlice(self,
+                               ordinals: List[int],
+                               keys: List[typing.Any],
+                               start_idx: int,
+                               end_idx: int) -> PaymentsData:
+        """
+        Build payments data from a slice of the expiry index.
+
+        Args:
+            ordinals: Sorted expiration date ordinals.
+            keys: User keys corresponding to ordinals.
+            start_idx: Start index (included).
+            end_idx: End index (excluded).
+
+        Returns:
+            PaymentsData containing the payments in the slice.
+        """
+        payments = PaymentsData(self.config)
+        for key in keys[start_idx:end_idx]:
+            payments.AddSingle(key, self.dict_elements[key])
+        payments.expiry_index = (ordinals[start_idx:end_idx], keys[start_idx:end_idx])
+
+        return payments
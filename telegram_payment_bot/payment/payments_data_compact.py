@@ -0,0 +1,416 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import annotations
+
+import datetime
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase, PaymentsDataDiff, SinglePayment
+
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+
+class PaymentsDataCompactConst:
+    """Constants for compact payments data class."""
+
+    ORDINALS_TYPECODE: str = "i"
+
+
+class PaymentsDataCompact(PaymentsDataBase):
+    """
+    Collection of payment data, stored in columns.
+    Users are mapped to row indexes, emails are interned and expiration dates are stored as an array of ordinals.
+    SinglePayment objects are only created when payments are accessed.
+    If NumPy is installed, expiration dates are evaluated with vectorized operations.
+    """
+
+    row_index: Dict[Union[int, str], int]
+    users: List[Union[int, str]]
+    emails: List[str]
+    expirations: array
+    email_index: Dict[str, int]
+    expiry_index: Optional[array]
+
+    def __init__(self,
+                 config: ConfigObject) -> None:
+        """
+        Initialize payments data collection.
+
+        Args:
+            config: Configuration object.
+        """
+        super().__init__(config)
+        self.row_index = {}
+        self.users = []
+        self.emails = []
+        self.expirations = array(PaymentsDataCompactConst.ORDINALS_TYPECODE)
+        self.email_index = {}
+        self.expiry_index = None
+
+    def AddPayment(self,
+                   email: str,
+                   user: User,
+                   expiration: datetime.date) -> bool:
+        """
+        Add a payment to the collection.
+
+        Args:
+            email: User email address.
+            user: User object.
+            expiration: Payment expiration date.
+
+        Returns:
+            True if added successfully, False if user already exists or email is duplicated.
+        """
+        if self.IsUserExistent(user):
+            return False
+
+        email_key = self.NormalizeEmail(email)
+        if (self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL) and
+                email_key != "" and
+                email_key in self.email_index):
+            return False
+
+        self.__AddRow(user.GetAsKey(), user.Get(), email, expiration.toordinal())
+        return True
+
+    def GetByEmail(self,
+                   email: str) -> Optional[SinglePayment]:
+        """
+        Get payment by email address.
+
+        Args:
+            email: Email address to search for.
+
+        Returns:
+            SinglePayment if found, None otherwise.
+        """
+        row_idx = self.email_index.get(self.NormalizeEmail(email))
+        return self.__GetRow(row_idx) if row_idx is not None else None
+
+    def GetByUser(self,
+                  user: User) -> Optional[SinglePayment]:
+        """
+        Get payment by user.
+
+        Args:
+            user: User to search for.
+
+        Returns:
+            SinglePayment if found, None otherwise.
+        """
+        if not user.IsValid():
+            return None
+        row_idx = self.row_index.get(user.GetAsKey())
+        return self.__GetRow(row_idx) if row_idx is not None else None
+
+    def IsUserExistent(self,
+                       user: User) -> bool:
+        """
+        Check if a user exists in the payment data.
+
+        Args:
+            user: User to check.
+
+        Returns:
+            True if user exists, False otherwise.
+        """
+        return user.IsValid() and user.GetAsKey() in self.row_index
+
+    def IsExpiredByUser(self,
+                        user: User) -> bool:
+        """
+        Check if a user's payment is expired.
+
+        Args:
+            user: User to check.
+
+        Returns:
+            True if expired or user not found, False otherwise.
+        """
+        return self.IsExpiringInDaysByUser(user, 0)
+
+    def IsExpiringInDaysByUser(self,
+                               user: User,
+                               days: int) -> bool:
+        """
+        Check if a user's payment is expiring within specified days.
+
+        Args:
+            user: User to check.
+            days: Number of days to check.
+
+        Returns:
+            True if expiring or user not found, False otherwise.
+        """
+        row_idx = self.row_index.get(user.GetAsKey()) if user.IsValid() else None
+        if row_idx is None:
+            return True
+        return self.expirations[row_idx] < datetime.date.today().toordinal() + days
+
+    def GetExpiringInDaysMask(self,
+                              users: Sequence[User],
+                              days: int) -> List[bool]:
+        """
+        Check if the payments of multiple users are expiring within specified days.
+
+        Args:
+            users: Users to check.
+            days: Number of days to check.
+
+        Returns:
+            List of flags, True if the corresponding user payment is expiring or user not found, False otherwise.
+        """
+        row_idxs = [self.row_index.get(user.GetAsKey(), -1) if user.IsValid() else -1
+                    for user in users]
+        limit_ordinal = datetime.date.today().toordinal() + days
+
+        if np is None or len(self.expirations) == 0:
+            return [row_idx < 0 or self.expirations[row_idx] < limit_ordinal for row_idx in row_idxs]
+
+        # Users not found are marked with a zero ordinal, which is always expired
+        row_idxs_arr = np.array(row_idxs, dtype=np.intp)
+        found = row_idxs_arr >= 0
+        ordinals: np.ndarray = np.zeros(len(row_idxs), dtype=np.intc)
+        ordinals[found] = self.__ExpirationsView()[row_idxs_arr[found]]
+        return (ordinals < limit_ordinal).tolist()
+
+    def FilterExpired(self) -> PaymentsDataCompact:
+        """
+        Filter and return only expired payments.
+
+        Returns:
+            PaymentsDataCompact containing only expired payments, sorted by expiration date.
+        """
+        return self.__FilterExpiringBefore(datetime.date.today().toordinal())
+
+    def FilterExpiringInDays(self,
+                             days: int) -> PaymentsDataCompact:
+        """
+        Filter and return payments expiring within specified days.
+
+        Args:
+            days: Number of days to check.
+
+        Returns:
+            PaymentsDataCompact containing payments expiring within specified days, sorted by expiration date.
+        """
+        return self.__FilterExpiringBefore(datetime.date.today().toordinal() + days)
+
+    def GetNextExpiring(self,
+                        count: int) -> PaymentsDataCompact:
+        """
+        Get the next payments to expire (expired payments are excluded).
+
+        Args:
+            count: Maximum number of payments to get.
+
+        Returns:
+            PaymentsDataCompact containing the next expiring payments, sorted by expiration date.
+        """
+        sorted_rows = self.__GetExpiryIndex()
+        start_idx = self.__BisectExpiryIndex(sorted_rows, datetime.date.today().toordinal())
+        return self.__FromRows(sorted_rows[start_idx:start_idx + max(count, 0)])
+
+    def Values(self) -> Iterator[SinglePayment]:
+        """
+        Get all payments.
+
+        Returns:
+            Iterator over all payments.
+        """
+        for row_idx in range(len(self.users)):
+            yield self.__GetRow(row_idx)
+
+    def Count(self) -> int:
+        """
+        Get payments count.
+
+        Returns:
+            Number of payments.
+        """
+        return len(self.users)
+
+    def Diff(self,
+             previous: PaymentsDataBase) -> PaymentsDataDiff:
+        """
+        Get the differences from previous payments data.
+        If the previous payments data is compact too, expiration ordinals are compared by user row, so that payments
+        are only created for the differences.
+
+        Args:
+            previous: Previous payments data.
+
+        Returns:
+            PaymentsDataDiff containing the differences.
+        """
+        if not isinstance(previous, PaymentsDataCompact):
+            return super().Diff(previous)
+
+        diff = PaymentsDataDiff()
+        for user_key, row_idx in self.row_index.items():
+            prev_row_idx = previous.row_index.get(user_key)
+            if prev_row_idx is None:
+                diff.added[user_key] = self.__GetRow(row_idx)
+                continue
+
+            ordinal = self.expirations[row_idx]
+            prev_ordinal = previous.expirations[prev_row_idx]
+            if ordinal > prev_ordinal:
+                diff.renewed[user_key] = self.__GetRow(row_idx)
+            elif ordinal < prev_ordinal:
+                diff.expired[user_key] = self.__GetRow(row_idx)
+        for user_key in previous.row_index.keys() - self.row_index.keys():
+            diff.removed[user_key] = previous.__GetRow(previous.row_index[user_key])
+
+        return diff
+
+    def __AddRow(self,
+                 user_key: Union[int, str],
+                 user: Union[int, str],
+                 email: str,
+                 ordinal: int) -> None:
+        """
+        Add a row.
+
+        Args:
+            user_key: User key.
+            user: User value (ID or username).
+            email: Email address.
+            ordinal: Expiration date ordinal.
+        """
+        row_idx = len(self.users)
+        email = sys.intern(email)
+        # Share the same string objects when values are already normalized
+        self.row_index[user_key] = row_idx
+        self.users.append(user_key if user == user_key else user)
+        self.emails.append(email)
+        self.expirations.append(ordinal)
+        if email != "":
+            email_key = self.NormalizeEmail(email)
+            self.email_index.setdefault(email if email_key == email else email_key, row_idx)
+        self.expiry_index = None
+
+    def __GetRow(self,
+                 row_idx: int) -> SinglePayment:
+        """
+        Get a row as a payment.
+
+        Args:
+            row_idx: Row index.
+
+        Returns:
+            SinglePayment object.
+        """
+        return SinglePayment(self.emails[row_idx],
+                             User(self.users[row_idx]),
+                             datetime.date.fromordinal(self.expirations[row_idx]))
+
+    def __GetExpiryIndex(self) -> array:
+        """
+        Get the expiry index (row indexes sorted by expiration date), building it if needed.
+
+        Returns:
+            Array of row indexes sorted by expiration date.
+        """
+        if self.expiry_index is None:
+            self.expiry_index = array(PaymentsDataCompactConst.ORDINALS_TYPECODE)
+            if np is not None and len(self.expirations) > 0:
+                self.expiry_index.frombytes(
+                    np.argsort(self.__ExpirationsView(), kind="stable").astype(np.intc).tobytes()
+                )
+            else:
+                self.expiry_index.extend(sorted(range(len(self.expirations)), key=self.expirations.__getitem__))
+        return self.expiry_index
+
+    def __ExpirationsView(self):
+        """
+        Get a NumPy view of the expiration ordinals, without copying them.
+        The view shall not be kept, otherwise the underlying array cannot grow anymore.
+
+        Returns:
+            NumPy array.
+        """
+        return np.frombuffer(self.expirations, dtype=np.intc)
+
+    def __BisectExpiryIndex(self,
+                            sorted_rows: array,
+                            ordinal: int) -> int:
+        """
+        Get the position of the first row expiring on or after the specified date ordinal.
+
+        Args:
+            sorted_rows: Row indexes sorted by expiration date.
+            ordinal: Date ordinal.
+
+        Returns:
+            Position in the expiry index.
+        """
+        low, high = 0, len(sorted_rows)
+        while low < high:
+            mid = (low + high) // 2
+            if self.expirations[sorted_rows[mid]] < ordinal:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def __FilterExpiringBefore(self,
+                               ordinal: int) -> PaymentsDataCompact:
+        """
+        Filter payments expiring before the specified date ordinal.
+
+        Args:
+            ordinal: Date ordinal (excluded).
+
+        Returns:
+            PaymentsDataCompact containing the filtered payments, sorted by expiration date.
+        """
+        sorted_rows = self.__GetExpiryIndex()
+        return self.__FromRows(sorted_rows[:self.__BisectExpiryIndex(sorted_rows, ordinal)])
+
+    def __FromRows(self,
+                   row_idxs: array) -> PaymentsDataCompact:
+        """
+        Build payments data from the specified rows, which shall be sorted by expiration date.
+
+        Args:
+            row_idxs: Row indexes.
+
+        Returns:
+            PaymentsDataCompact containing the rows.
+        """
+        payments = PaymentsDataCompact(self.config)
+        for row_idx in row_idxs:
+            user = self.users[row_idx]
+            payments.__AddRow(User(user).GetAsKey(), user, self.emails[row_idx], self.expirations[row_idx])
+        payments.expiry_index = array(PaymentsDataCompactConst.ORDINALS_TYPECODE, range(len(row_idxs)))
+
+        return payments
@@ -0,0 +1,66 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.payment.payments_data import PaymentsData, PaymentsDataBase
+from telegram_payment_bot.payment.payments_data_compact import PaymentsDataCompact
+from telegram_payment_bot.payment.payments_data_lazy import PaymentsDataLazy
+from telegram_payment_bot.payment.payments_storage_types import PaymentsStorageTypes
+
+
+class PaymentsStorageTypeError(Exception):
+    """Exception raised when an invalid payments storage type is specified."""
+
+
+class PaymentsDataFactory:
+    """Factory for creating payments data instances based on configuration."""
+
+    config: ConfigObject
+
+    def __init__(self,
+                 config: ConfigObject) -> None:
+        """
+        Initialize the payments data factory.
+
+        Args:
+            config: Configuration object.
+        """
+        self.config = config
+
+    def CreateData(self) -> PaymentsDataBase:
+        """
+        Create an empty payments data based on the configured storage type.
+
+        Returns:
+            PaymentsDataBase instance for the configured storage type.
+
+        Raises:
+            PaymentsStorageTypeError: If the storage type is invalid.
+        """
+        storage_type = self.config.GetValue(BotConfigTypes.PAYMENT_STORAGE_TYPE)
+        if storage_type == PaymentsStorageTypes.DICT:
+            return PaymentsData(self.config)
+        if storage_type == PaymentsStorageTypes.COMPACT:
+            return PaymentsDataCompact(self.config)
+        if storage_type == PaymentsStorageTypes.LAZY:
+            return PaymentsDataLazy(self.config)
+
+        raise PaymentsStorageTypeError(f"Invalid payments storage type {storage_type}")
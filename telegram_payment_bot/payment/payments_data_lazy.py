@@ -0,0 +1,432 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from __future__ import annotations
+
+import datetime
+import typing
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import (
+    PaymentError,
+    PaymentsData,
+    PaymentsDataBase,
+    PaymentsDataErrors,
+    SinglePayment,
+)
+from telegram_payment_bot.payment.payments_row_parser import PaymentsRowParser
+
+
+# Raw row, as tuple of (sequence number, row index, email, user, expiration)
+_RawRow = Tuple[int, int, str, User, typing.Any]
+
+
+class PaymentsDataLazy(PaymentsDataBase):
+    """
+    Collection of payment data, parsed lazily.
+    Raw rows are only indexed by user when added, and each row is parsed the first time its payment is accessed.
+    Rows sharing the user (or the email, if duplicated emails are checked) with other rows are parsed all together
+    at the first access, in the same order they were added, so that duplicated data is detected in the same way
+    as when rows are parsed while loading.
+    """
+
+    check_dup_email: bool
+    row_parser: PaymentsRowParser
+    entries: Dict[typing.Any, Union[SinglePayment, _RawRow]]
+    entries_seq: Dict[typing.Any, int]
+    rows_count: int
+    dup_rows: Dict[int, _RawRow]
+    emails_first_row: Dict[str, _RawRow]
+    email_index: Optional[Dict[str, List[typing.Any]]]
+    errors: List[Tuple[int, PaymentError]]
+    resolved_data: Optional[PaymentsData]
+
+    def __init__(self,
+                 config: ConfigObject) -> None:
+        """
+        Initialize payments data collection.
+
+        Args:
+            config: Configuration object.
+        """
+        super().__init__(config)
+        self.check_dup_email = config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL)
+        self.row_parser = PaymentsRowParser(config, None)
+        self.entries = {}
+        self.entries_seq = {}
+        self.rows_count = 0
+        self.dup_rows = {}
+        self.emails_first_row = {}
+        self.email_index = None
+        self.errors = []
+        self.resolved_data = None
+
+    def AddRawRow(self,
+                  row_idx: int,
+                  email: str,
+                  user: User,
+                  expiration: typing.Any) -> None:
+        """
+        Add a raw row, without parsing it.
+        All rows shall be added before accessing payments.
+
+        Args:
+            row_idx: Row index (1-based).
+            email: Email address.
+            user: User (shall be valid).
+            expiration: Expiration date, not parsed.
+        """
+        raw_row = (self.rows_count, row_idx, email, user, expiration)
+        self.rows_count += 1
+
+        user_key = user.GetAsKey()
+        first_row = self.entries.get(user_key)
+        if first_row is None:
+            self.entries[user_key] = raw_row
+            self.entries_seq[user_key] = raw_row[0]
+        else:
+            self.__AddDuplicatedRows(first_row, raw_row)  # type: ignore[arg-type]
+
+        if self.check_dup_email:
+            norm_email = self.NormalizeEmail(email)
+            if norm_email != "":
+                first_email_row = self.emails_first_row.setdefault(norm_email, raw_row)
+                if first_email_row is not raw_row:
+                    self.__AddDuplicatedRows(first_email_row, raw_row)
+
+    def AddPayment(self,
+                   email: str,
+                   user: User,
+                   expiration: datetime.date) -> bool:
+        """
+        Add a payment to the collection.
+
+        Args:
+            email: User email address.
+            user: User object.
+            expiration: Payment expiration date.
+
+        Returns:
+            True if added successfully, False if user already exists or email is duplicated.
+        """
+        if self.IsUserExistent(user):
+            return False
+        if self.check_dup_email and email != "" and self.IsEmailExistent(email):
+            return False
+
+        user_key = user.GetAsKey()
+        self.entries[user_key] = SinglePayment(email, user, expiration)
+        self.entries_seq[user_key] = self.rows_count
+        self.rows_count += 1
+        if self.email_index is not None:
+            self.__IndexEmail(self.email_index, email, user_key)
+        self.resolved_data = None
+        return True
+
+    def GetByEmail(self,
+                   email: str) -> Optional[SinglePayment]:
+        """
+        Get payment by email address.
+
+        Args:
+            email: Email address to search for.
+
+        Returns:
+            SinglePayment if found, None otherwise.
+        """
+        norm_email = self.NormalizeEmail(email)
+        for user_key in self.__GetEmailIndex().get(norm_email, []):
+            payment = self.__GetEntry(user_key)
+            if payment is not None and self.NormalizeEmail(payment.Email()) == norm_email:
+                return payment
+        return None
+
+    def GetByUser(self,
+                  user: User) -> Optional[SinglePayment]:
+        """
+        Get payment by user.
+
+        Args:
+            user: User to search for.
+
+        Returns:
+            SinglePayment if found, None otherwise.
+        """
+        if not user.IsValid():
+            return None
+
+        self.__ParseDuplicatedRows()
+        return self.__GetEntry(user.GetAsKey())
+
+    def FilterExpired(self) -> PaymentsData:
+        """
+        Filter and return only expired payments.
+
+        Returns:
+            PaymentsData containing only expired payments, sorted by expiration date.
+        """
+        return self.__GetResolvedData().FilterExpired()
+
+    def FilterExpiringInDays(self,
+                             days: int) -> PaymentsData:
+        """
+        Filter and return payments expiring within specified days.
+
+        Args:
+            days: Number of days to check.
+
+        Returns:
+            PaymentsData containing payments expiring within specified days, sorted by expiration date.
+        """
+        return self.__GetResolvedData().FilterExpiringInDays(days)
+
+    def GetNextExpiring(self,
+                        count: int) -> PaymentsData:
+        """
+        Get the next payments to expire (expired payments are excluded).
+
+        Args:
+            count: Maximum number of payments to get.
+
+        Returns:
+            PaymentsData containing the next expiring payments, sorted by expiration date.
+        """
+        return self.__GetResolvedData().GetNextExpiring(count)
+
+    def Values(self) -> Iterable[SinglePayment]:
+        """
+        Get all payments.
+
+        Returns:
+            Iterable over all payments.
+        """
+        return self.__GetResolvedData().Values()
+
+    def Count(self) -> int:
+        """
+        Get payments count.
+
+        Returns:
+            Number of payments.
+        """
+        return self.__GetResolvedData().Count()
+
+    def Any(self) -> bool:
+        """
+        Check if any payment exists, parsing rows only until a valid one is found.
+
+        Returns:
+            True if not empty, False otherwise.
+        """
+        self.__ParseDuplicatedRows()
+
+        if self.resolved_data is not None:
+            return self.resolved_data.Any()
+        return any(self.__GetEntry(user_key) is not None for user_key in list(self.entries))
+
+    def Empty(self) -> bool:
+        """
+        Check if empty, parsing rows only until a valid one is found.
+
+        Returns:
+            True if empty, False otherwise.
+        """
+        return not self.Any()
+
+    def LoadedCount(self) -> int:
+        """
+        Get loaded payments count, without parsing rows.
+
+        Returns:
+            Number of loaded payments.
+        """
+        return len(self.entries)
+
+    def Errors(self) -> PaymentsDataErrors:
+        """
+        Get the errors of all rows, parsing all the rows not parsed yet.
+
+        Returns:
+            PaymentsDataErrors containing the errors, in the same order of rows.
+        """
+        self.__GetResolvedData()
+
+        payments_data_err = PaymentsDataErrors()
+        for _, error in sorted(self.errors, key=lambda entry: entry[0]):
+            payments_data_err.AddSingle(error)
+        return payments_data_err
+
+    def _GetUserIndex(self) -> Mapping[typing.Any, SinglePayment]:
+        """
+        Get payments indexed by user key, parsing all the rows not parsed yet.
+
+        Returns:
+            Mapping of user key to payment.
+        """
+        return self.__GetResolvedData()._GetUserIndex()
+
+    def __GetResolvedData(self) -> PaymentsData:
+        """
+        Get the payments data with all the rows parsed, parsing them if needed.
+        Payments are added in the same order of their rows.
+
+        Returns:
+            PaymentsData containing all payments.
+        """
+        if self.resolved_data is None:
+            self.__ParseDuplicatedRows()
+
+            self.resolved_data = PaymentsData(self.config)
+            for user_key in sorted(self.entries, key=self.entries_seq.__getitem__):
+                payment = self.__GetEntry(user_key)
+                if payment is not None:
+                    self.resolved_data.AddSingle(user_key, payment)
+        return self.resolved_data
+
+    def __GetEntry(self,
+                   user_key: typing.Any) -> Optional[SinglePayment]:
+        """
+        Get the payment of a user, parsing its row if not parsed yet.
+        If the row is not valid, the error is collected and the entry is removed.
+
+        Args:
+            user_key: User key.
+
+        Returns:
+            SinglePayment if found, None otherwise.
+        """
+        entry = self.entries.get(user_key)
+        if entry is None or isinstance(entry, SinglePayment):
+            return entry
+
+        payment = self.__ParseRow(entry)
+        if payment is None:
+            self.__RemoveEntry(user_key)
+        else:
+            self.entries[user_key] = payment
+        return payment
+
+    def __RemoveEntry(self,
+                      user_key: typing.Any) -> None:
+        """
+        Remove the entry of a user.
+
+        Args:
+            user_key: User key.
+        """
+        del self.entries[user_key]
+        del self.entries_seq[user_key]
+
+    def __ParseRow(self,
+                   raw_row: _RawRow) -> Optional[SinglePayment]:
+        """
+        Parse a raw row, collecting its error if not valid.
+
+        Args:
+            raw_row: Raw row.
+
+        Returns:
+            SinglePayment if the row is valid, None otherwise.
+        """
+        payment_row = self.row_parser.ParseWithUser(*raw_row[1:])
+        error = payment_row.Error()
+        if error is not None:
+            self.errors.append((raw_row[0], error))
+        return payment_row.Payment()
+
+    def __AddDuplicatedRows(self,
+                            *raw_rows: _RawRow) -> None:
+        """
+        Add rows sharing the user or the email with other rows.
+
+        Args:
+            raw_rows: Raw rows.
+        """
+        for raw_row in raw_rows:
+            self.dup_rows[raw_row[0]] = raw_row
+
+    def __ParseDuplicatedRows(self) -> None:
+        """
+        Parse the rows sharing the user or the email with other rows, in the same order they were added.
+        Other rows do not affect each other, so they can be parsed independently when accessed.
+        """
+        if len(self.dup_rows) == 0:
+            return
+
+        dup_user_keys = set()
+        payments: Dict[typing.Any, Tuple[int, SinglePayment]] = {}
+        for seq in sorted(self.dup_rows):
+            raw_row = self.dup_rows[seq]
+            user_key = raw_row[3].GetAsKey()
+            dup_user_keys.add(user_key)
+
+            payment = self.__ParseRow(raw_row)
+            if payment is not None:
+                payments[user_key] = (seq, payment)
+
+        for user_key in dup_user_keys:
+            if user_key in payments:
+                self.entries_seq[user_key], self.entries[user_key] = payments[user_key]
+            else:
+                self.__RemoveEntry(user_key)
+
+        self.dup_rows.clear()
+        self.emails_first_row.clear()
+        self.email_index = None
+
+    def __GetEmailIndex(self) -> Dict[str, List[typing.Any]]:
+        """
+        Get the email index, building it if needed.
+        For each email, users are sorted in the same order of their rows.
+
+        Returns:
+            Email index.
+        """
+        self.__ParseDuplicatedRows()
+
+        if self.email_index is None:
+            self.email_index = {}
+            for user_key, entry in self.entries.items():
+                self.__IndexEmail(self.email_index,
+                                  entry.Email() if isinstance(entry, SinglePayment) else entry[2],
+                                  user_key)
+            for user_keys in self.email_index.values():
+                if len(user_keys) > 1:
+                    user_keys.sort(key=self.entries_seq.__getitem__)
+        return self.email_index
+
+    def __IndexEmail(self,
+                     email_index: Dict[str, List[typing.Any]],
+                     email: str,
+                     user_key: typing.Any) -> None:
+        """
+        Add a user to the email index.
+
+        Args:
+            email_index: Email index.
+            email: Email address.
+            user_key: User key.
+        """
+        norm_email = self.NormalizeEmail(email)
+        if norm_email != "":
+            email_index.setdefault(norm_email, []).append(user_key)
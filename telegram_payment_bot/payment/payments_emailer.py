@@ -27,7 +27,8 @@ from telegram_payment_bot.config.config_object import ConfigObject
 from telegram_payment_bot.email.subscription_emailer import SubscriptionEmailer
 from telegram_payment_bot.logger.logger import Logger
 from telegram_payment_bot.member.members_payment_getter import MembersPaymentGetter
-from telegram_payment_bot.payment.payments_data import PaymentsData
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase
+from telegram_payment_bot.payment.payments_repository import PaymentsRepository
 
 
 class PaymentsEmailerConst:
@@ -48,7 +49,8 @@ class PaymentsEmailer:
     def __init__(self,
                  client: pyrogram.Client,
                  config: ConfigObject,
-                 logger: Logger) -> None:
+                 logger: Logger,
+                 payments_repository: PaymentsRepository) -> None:
         """
         Initialize the payments emailer.
 
@@ -56,26 +58,27 @@ class PaymentsEmailer:
             client: Pyrogram client instance.
             config: Configuration object.
             logger: Logger instance.
+            payments_repository: Payments repository.
         """
         self.client = client
         self.config = config
         self.logger = logger
         self.emailer = SubscriptionEmailer(config)
-        self.members_payment_getter = MembersPaymentGetter(client, config, logger)
+        self.members_payment_getter = MembersPaymentGetter(client, config, logger, payments_repository)
 
-    async def EmailAllWithExpiredPayment(self) -> PaymentsData:
+    async def EmailAllWithExpiredPayment(self) -> PaymentsDataBase:
         """
         Email all users with expired payment.
 
         Returns:
-            PaymentsData containing all expired payments.
+            Payments data containing all expired payments.
         """
         expired_payments = await self.members_payment_getter.GetAllEmailsWithExpiredPayment()
         await self.__SendEmails(expired_payments)
         return expired_payments
 
     async def EmailAllWithExpiringPayment(self,
-                                          days: int) -> PaymentsData:
+                                          days: int) -> PaymentsDataBase:
         """
         Email all users with expiring payment in the specified number of days.
 
@@ -83,19 +86,19 @@ class PaymentsEmailer:
             days: Number of days until payment expiration.
 
         Returns:
-            PaymentsData containing all expiring payments.
+            Payments data containing all expiring payments.
         """
         expired_payments = await self.members_payment_getter.GetAllEmailsWithExpiringPayment(days)
         await self.__SendEmails(expired_payments)
         return expired_payments
 
     async def __SendEmails(self,
-                           expired_payments: PaymentsData) -> None:
+                           expired_payments: PaymentsDataBase) -> None:
         """
         Send emails to expired payments.
 
         Args:
-            expired_payments: PaymentsData containing expired payments.
+            expired_payments: Payments data containing expired payments.
         """
         if self.config.GetValue(BotConfigTypes.APP_TEST_MODE):
             self.logger.GetLogger().info("Test mode ON: no email was sent")
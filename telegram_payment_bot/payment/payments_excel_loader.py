@@ -18,68 +18,87 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from typing import Optional, Tuple
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Optional, Tuple, Union
 
-import openpyxl
-import xlrd
 from typing_extensions import override
 
 from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.logger.logger import Logger
 from telegram_payment_bot.misc.async_helpers import to_thread
 from telegram_payment_bot.misc.user import User
-from telegram_payment_bot.payment.payments_data import PaymentsData, PaymentsDataErrors, SinglePayment
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase, PaymentsDataErrors, SinglePayment
+from telegram_payment_bot.payment.payments_excel_reader import PaymentsExcelReader
 from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+from telegram_payment_bot.payment.payments_row_parser import PaymentsRowParser
 
 
 class PaymentsExcelLoaderConst:
     """Constants for payment Excel loader class."""
 
     SHEET_IDX: int = 0
+    PROCESS_POOL_MAX_WORKERS: int = 1
 
 
 class PaymentsExcelLoader(PaymentsLoaderBase):
     """Loader for payment data from Excel files."""
 
-    @override
-    async def LoadAll(self) -> PaymentsData:
+    process_pool: Optional[ProcessPoolExecutor] = None
+
+    excel_reader: PaymentsExcelReader
+
+    def __init__(self,
+                 config: ConfigObject,
+                 logger: Logger) -> None:
         """
-        Load all payment data from Excel file.
+        Initialize the Excel payments loader.
 
-        Returns:
-            PaymentsData containing all payments.
+        Args:
+            config: Configuration object.
+            logger: Logger instance.
         """
-        return (await self.__LoadAndCheckAll())[0]
+        super().__init__(config, logger)
+        self.excel_reader = PaymentsExcelReader(config)
+        if (config.GetValue(BotConfigTypes.PAYMENT_EXCEL_PROCESS_POOL)
+                and config.GetValue(BotConfigTypes.PAYMENT_ROWS_CACHE_SIZE) > 0):
+            self.logger.GetLogger().warning(
+                "Payment rows cache is not used when parsing the Excel file in a separate process"
+            )
 
     @override
     async def LoadSingleByUser(self,
                                user: User) -> Optional[SinglePayment]:
         """
         Load a single payment by user from Excel file.
+        The file is scanned row by row, stopping at the first valid row of the user.
 
         Args:
             user: User to load payment for.
 
         Returns:
             SinglePayment for the user, or None if not found.
-        """
-        return (await self.LoadAll()).GetByUser(user)
 
-    @override
-    async def CheckForErrors(self) -> PaymentsDataErrors:
+        Raises:
+            Exception: If an error occurs while loading the file.
         """
-        Check for errors in the Excel file.
+        payment_file = self.config.GetValue(BotConfigTypes.PAYMENT_EXCEL_FILE)
 
-        Returns:
-            PaymentsDataErrors containing any errors found.
-        """
-        return (await self.__LoadAndCheckAll())[1]
+        try:
+            return await to_thread(self._FindSinglePayment, self.excel_reader.IterRows(True), user)
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading user {user} from file '{payment_file}'")
+            raise
 
-    async def __LoadAndCheckAll(self) -> Tuple[PaymentsData, PaymentsDataErrors]:
+    @override
+    async def _LoadAndCheckAll(self) -> Tuple[PaymentsDataBase, Optional[PaymentsDataErrors]]:
         """
         Load and check all payments from Excel file.
 
         Returns:
-            Tuple of (PaymentsData, PaymentsDataErrors).
+            Tuple of (payments data, PaymentsDataErrors or None if collected by lazy payments data).
 
         Raises:
             Exception: If an error occurs while loading the file.
@@ -89,15 +108,13 @@ class PaymentsExcelLoader(PaymentsLoaderBase):
         try:
             self.logger.GetLogger().info(f"Loading file '{payment_file}'...")
 
-            if payment_file.lower().endswith(".xlsx"):
-                payments_data, payments_data_err = await self.__LoadXlsxFile(payment_file)
-            elif payment_file.lower().endswith(".xls"):
-                payments_data, payments_data_err = await self.__LoadXlsFile(payment_file)
+            payments_data_err: Optional[PaymentsDataErrors]
+            if self.config.GetValue(BotConfigTypes.PAYMENT_EXCEL_PROCESS_POOL):
+                payments_data, payments_data_err = await self.__LoadAndCheckAllInProcess()
             else:
-                raise ValueError(f"Invalid payment file '{payment_file}'")
-
+                payments_data, payments_data_err = await super()._LoadAndCheckAll()
             self.logger.GetLogger().info(
-                f"File '{payment_file}' successfully loaded, number of rows: {payments_data.Count()}"
+                f"File '{payment_file}' successfully loaded, number of rows: {payments_data.LoadedCount()}"
             )
 
             return payments_data, payments_data_err
@@ -106,65 +123,60 @@ class PaymentsExcelLoader(PaymentsLoaderBase):
             self.logger.GetLogger().exception(f"An error occurred while loading file '{payment_file}'")
             raise
 
-    async def __LoadXlsFile(self,
-                            payment_file: str) -> Tuple[PaymentsData, PaymentsDataErrors]:
+    @override
+    async def _GetSourceVersion(self) -> Optional[Tuple[str, int, Union[int, str]]]:
         """
-        Load payment data from an Excel sheet (xls).
-
-        Args:
-            payment_file: Payment file name.
+        Get the Excel file version, i.e. its path, size and last modification time (or hash, if enabled).
 
         Returns:
-            Tuple of (PaymentsData, PaymentsDataErrors).
+            Tuple of (path, size, modification time in nanoseconds or hash), or None if the file cannot be accessed.
         """
-        wb = await to_thread(xlrd.open_workbook, payment_file)
-        sheet = wb.sheet_by_index(self.config.GetValue(BotConfigTypes.PAYMENT_WORKSHEET_IDX))
+        return await self._GetFileVersion(self.config.GetValue(BotConfigTypes.PAYMENT_EXCEL_FILE),
+                                          self.config.GetValue(BotConfigTypes.PAYMENT_EXCEL_CHECK_HASH))
 
-        payments_data = PaymentsData(self.config)
-        payments_data_err = PaymentsDataErrors()
+    @override
+    async def _IterRawRows(self) -> AsyncIterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of the Excel file, skipping the header.
+        Rows are read in chunks in a separate thread. In read-only mode, xlsx files are streamed instead of being
+        loaded in memory, so only the current chunk of rows is kept in memory.
 
-        email_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EMAIL_COL))
-        user_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_USER_COL))
-        expiration_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EXPIRATION_COL))
+        Returns:
+            Asynchronous iterator over tuples of (row index, email, user string, expiration).
+        """
+        rows = self.excel_reader.IterRows(self.config.GetValue(BotConfigTypes.PAYMENT_EXCEL_READ_ONLY))
+        async for row in self._IterRowsInThread(rows):
+            yield row
 
-        for i in range(sheet.nrows):
-            if i > 0:
-                email = str(sheet.cell_value(i, email_col_idx)).strip()
-                user = User.FromString(self.config, str(sheet.cell_value(i, user_col_idx)).strip())
-                expiration = sheet.cell_value(i, expiration_col_idx)
+    async def __LoadAndCheckAllInProcess(self) -> Tuple[PaymentsDataBase, PaymentsDataErrors]:
+        """
+        Load and check all payments in a separate process, so that parsing does not block the event loop.
+        Payments data is then built in a separate thread from the compact parse result.
+        Errors are logged here, since nothing is logged by the separate process.
 
-                if user.IsValid():
-                    self._AddPayment(i + 1, payments_data, payments_data_err, email, user, expiration)
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors).
+        """
+        parse_result = await asyncio.get_event_loop().run_in_executor(
+            self.__GetProcessPool(),
+            self.excel_reader.ParseAll
+        )
+        payments_data, payments_data_err = await to_thread(parse_result.ToPaymentsData, self.config)
+        for error in payments_data_err:
+            self.logger.GetLogger().warning(PaymentsRowParser.ErrorToString(error))
 
         return payments_data, payments_data_err
 
-    async def __LoadXlsxFile(self,
-                             payment_file: str) -> Tuple[PaymentsData, PaymentsDataErrors]:
+    @classmethod
+    def __GetProcessPool(cls) -> ProcessPoolExecutor:
         """
-        Load payment data from an Excel sheet (xlsx).
-
-        Args:
-            payment_file: Payment file name.
+        Get the process pool, shared by all loaders and created at the first use.
+        Processes are spawned, since forking a process with running threads is not safe.
 
         Returns:
-            Tuple of (PaymentsData, PaymentsDataErrors).
+            Process pool.
         """
-        wb = await to_thread(openpyxl.load_workbook, payment_file, data_only=True)
-        sheet = wb.worksheets[self.config.GetValue(BotConfigTypes.PAYMENT_WORKSHEET_IDX)]
-
-        payments_data = PaymentsData(self.config)
-        payments_data_err = PaymentsDataErrors()
-
-        email_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EMAIL_COL)) + 1
-        user_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_USER_COL)) + 1
-        expiration_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EXPIRATION_COL)) + 1
-
-        for i, row in enumerate(sheet.iter_rows(min_row=2), start=2):
-            email = str(row[email_col_idx - 1].value or "").strip()
-            user = User.FromString(self.config, str(row[user_col_idx - 1].value or "").strip())
-            expiration = row[expiration_col_idx - 1].value
-
-            if user.IsValid():
-                self._AddPayment(i, payments_data, payments_data_err, email, user, expiration)
-
-        return payments_data, payments_data_err
+        if cls.process_pool is None:
+            cls.process_pool = ProcessPoolExecutor(max_workers=PaymentsExcelLoaderConst.PROCESS_POOL_MAX_WORKERS,
+                                                   mp_context=multiprocessing.get_context("spawn"))
+        return cls.process_pool
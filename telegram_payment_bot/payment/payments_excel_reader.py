@@ -0,0 +1,243 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from array import array
+from datetime import date
+from typing import Any, Iterator, List, Tuple, Union
+
+import openpyxl
+import xlrd
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import (
+    PaymentError,
+    PaymentErrorTypes,
+    PaymentsDataBase,
+    PaymentsDataErrors,
+    SinglePayment,
+)
+from telegram_payment_bot.payment.payments_data_factory import PaymentsDataFactory
+from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+from telegram_payment_bot.payment.payments_row_parser import PaymentsRowParser
+
+
+class PaymentsExcelReaderConst:
+    """Constants for payment Excel reader class."""
+
+    ORDINALS_TYPECODE: str = "i"
+
+
+class PaymentsExcelParseResult:
+    """
+    Result of parsing an Excel file, stored in columns of basic types.
+    Unpickling basic types is much faster than unpickling payments data objects, which is done in a single step
+    that blocks all threads.
+    """
+
+    emails: List[str]
+    users: List[Union[int, str]]
+    expirations: array
+    errors: List[Tuple[PaymentErrorTypes, int, Union[int, str], Any]]
+
+    def __init__(self) -> None:
+        """Initialize the parse result."""
+        self.emails = []
+        self.users = []
+        self.expirations = array(PaymentsExcelReaderConst.ORDINALS_TYPECODE)
+        self.errors = []
+
+    def AddPayment(self,
+                   payment: SinglePayment) -> None:
+        """
+        Add a payment.
+
+        Args:
+            payment: Payment.
+        """
+        self.emails.append(payment.Email())
+        self.users.append(payment.User().Get())
+        self.expirations.append(payment.ExpirationDate().toordinal())
+
+    def AddError(self,
+                 error: PaymentError) -> None:
+        """
+        Add an error.
+
+        Args:
+            error: Error.
+        """
+        self.errors.append((error.Type(), error.Row(), error.User().Get(), error.ExpirationDate()))
+
+    def ToPaymentsData(self,
+                       config: ConfigObject) -> Tuple[PaymentsDataBase, PaymentsDataErrors]:
+        """
+        Convert to payments data and errors.
+
+        Args:
+            config: Configuration object.
+
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors).
+        """
+        payments_data = PaymentsDataFactory(config).CreateData()
+        for email, user, expiration in zip(self.emails, self.users, self.expirations):
+            payments_data.AddPayment(email, User(user), date.fromordinal(expiration))
+
+        payments_data_err = PaymentsDataErrors()
+        for err_type, row, user, expiration_data in self.errors:
+            payments_data_err.AddPaymentError(err_type, row, User(user), expiration_data)
+
+        return payments_data, payments_data_err
+
+
+class PaymentsExcelReader:
+    """
+    Reader of payment Excel files (xls/xlsx).
+    Reading is blocking, so it shall be run in a separate thread or process.
+    """
+
+    config: ConfigObject
+
+    def __init__(self,
+                 config: ConfigObject) -> None:
+        """
+        Initialize the Excel reader.
+
+        Args:
+            config: Configuration object.
+        """
+        self.config = config
+
+    def IterRows(self,
+                 read_only: bool) -> Iterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of the Excel file, skipping the header.
+        The file is opened when the iteration starts and closed as soon as it ends.
+
+        Args:
+            read_only: True for streaming xlsx files in read-only mode, False for loading them in memory.
+
+        Returns:
+            Iterator over tuples of (row index, email, user string, expiration).
+
+        Raises:
+            ValueError: If the file is not a valid Excel file.
+        """
+        payment_file = self.config.GetValue(BotConfigTypes.PAYMENT_EXCEL_FILE)
+        worksheet_idx = self.config.GetValue(BotConfigTypes.PAYMENT_WORKSHEET_IDX)
+
+        if payment_file.lower().endswith(".xlsx"):
+            wb = openpyxl.load_workbook(payment_file, read_only=read_only, data_only=True)
+            try:
+                sheet = wb.worksheets[worksheet_idx]
+                if read_only:
+                    # Dimensions stored in the file may be wrong, so read until the last row
+                    sheet.reset_dimensions()
+                yield from self.__IterXlsxRows(sheet)
+            finally:
+                wb.close()
+        elif payment_file.lower().endswith(".xls"):
+            xls_wb = xlrd.open_workbook(payment_file, on_demand=True)
+            try:
+                yield from self.__IterXlsRows(xls_wb.sheet_by_index(worksheet_idx))
+            finally:
+                xls_wb.release_resources()
+        else:
+            raise ValueError(f"Invalid payment file '{payment_file}'")
+
+    def ParseAll(self) -> PaymentsExcelParseResult:
+        """
+        Parse all payments from the Excel file, without logging.
+        Used for parsing payments in a separate process, so the result is compact to be quickly transferred.
+
+        Returns:
+            Parse result.
+        """
+        parse_result = PaymentsExcelParseResult()
+        row_parser = PaymentsRowParser(self.config, None)
+
+        for row_idx, email, user_str, expiration in self.IterRows(self.config.GetValue(BotConfigTypes.PAYMENT_EXCEL_READ_ONLY)):
+            payment_row = row_parser.Parse(row_idx, email, user_str, expiration)
+            if payment_row is None:
+                continue
+
+            payment = payment_row.Payment()
+            error = payment_row.Error()
+            if payment is not None:
+                parse_result.AddPayment(payment)
+            elif error is not None:
+                parse_result.AddError(error)
+
+        return parse_result
+
+    def __IterXlsRows(self,
+                      sheet: xlrd.sheet.Sheet) -> Iterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of an Excel sheet (xls), skipping the header.
+
+        Args:
+            sheet: Excel sheet.
+
+        Returns:
+            Iterator over tuples of (row index, email, user string, expiration).
+        """
+        email_col_idx = PaymentsLoaderBase._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EMAIL_COL))
+        user_col_idx = PaymentsLoaderBase._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_USER_COL))
+        expiration_col_idx = PaymentsLoaderBase._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EXPIRATION_COL))
+
+        for i in range(1, sheet.nrows):
+            yield (i + 1,
+                   str(sheet.cell_value(i, email_col_idx)).strip(),
+                   str(sheet.cell_value(i, user_col_idx)).strip(),
+                   sheet.cell_value(i, expiration_col_idx))
+
+    def __IterXlsxRows(self,
+                       sheet: Any) -> Iterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of an Excel sheet (xlsx), skipping the header.
+        Only the cells between the first and last configured columns are read.
+
+        Args:
+            sheet: Excel sheet.
+
+        Returns:
+            Iterator over tuples of (row index, email, user string, expiration).
+        """
+        email_col_idx = PaymentsLoaderBase._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EMAIL_COL))
+        user_col_idx = PaymentsLoaderBase._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_USER_COL))
+        expiration_col_idx = PaymentsLoaderBase._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EXPIRATION_COL))
+
+        # Make indexes relative to the first read column
+        min_col_idx = min(email_col_idx, user_col_idx, expiration_col_idx)
+        max_col_idx = max(email_col_idx, user_col_idx, expiration_col_idx)
+        email_col_idx -= min_col_idx
+        user_col_idx -= min_col_idx
+        expiration_col_idx -= min_col_idx
+
+        for i, row in enumerate(sheet.iter_rows(min_row=2,
+                                                min_col=min_col_idx + 1,
+                                                max_col=max_col_idx + 1,
+                                                values_only=True), start=2):
+            yield (i,
+                   str(row[email_col_idx] or "").strip(),
+                   str(row[user_col_idx] or "").strip(),
+                   row[expiration_col_idx])
@@ -18,8 +18,9 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from typing import Optional, Tuple
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
 
+from googleapiclient.errors import HttpError
 from typing_extensions import override
 
 from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
@@ -27,7 +28,7 @@ from telegram_payment_bot.config.config_object import ConfigObject
 from telegram_payment_bot.google.google_sheet_rows_getter import GoogleSheetRowsGetter
 from telegram_payment_bot.logger.logger import Logger
 from telegram_payment_bot.misc.user import User
-from telegram_payment_bot.payment.payments_data import PaymentsData, PaymentsDataErrors, SinglePayment
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase, PaymentsDataErrors, SinglePayment
 from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
 
 
@@ -49,93 +50,164 @@ class PaymentsGoogleSheetLoader(PaymentsLoaderBase):
         super().__init__(config, logger)
         self.google_sheet_rows_getter = GoogleSheetRowsGetter(config, logger)
 
-    @override
-    async def LoadAll(self) -> PaymentsData:
-        """
-        Load all payment data from Google Sheet.
-
-        Returns:
-            PaymentsData containing all payments.
-        """
-        return (await self.__LoadAndCheckAll())[0]
-
     @override
     async def LoadSingleByUser(self,
                                user: User) -> Optional[SinglePayment]:
         """
         Load a single payment by user from Google Sheet.
+        Only the email, user and expiration columns are fetched, with a single request.
 
         Args:
             user: User to load payment for.
 
         Returns:
             SinglePayment for the user, or None if not found.
-        """
-        return (await self.LoadAll()).GetByUser(user)
 
-    @override
-    async def CheckForErrors(self) -> PaymentsDataErrors:
+        Raises:
+            Exception: If an error occurs while loading the sheet.
         """
-        Check for errors in the Google Sheet.
+        try:
+            return await self.__LoadSingleUser(user)
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading user {user} from Google Sheet")
+            raise
 
-        Returns:
-            PaymentsDataErrors containing any errors found.
-        """
-        return (await self.__LoadAndCheckAll())[1]
+    @override
+    def Invalidate(self) -> None:
+        """Invalidate the shared Google Sheet and the previously loaded data."""
+        super().Invalidate()
+        self.google_sheet_rows_getter.Invalidate()
 
-    async def __LoadAndCheckAll(self) -> Tuple[PaymentsData, PaymentsDataErrors]:
+    @override
+    async def _LoadAndCheckAll(self) -> Tuple[PaymentsDataBase, Optional[PaymentsDataErrors]]:
         """
         Load and check all payments from Google Sheet.
 
         Returns:
-            Tuple of (PaymentsData, PaymentsDataErrors).
+            Tuple of (payments data, PaymentsDataErrors or None if collected by lazy payments data).
 
         Raises:
             Exception: If an error occurs while loading the sheet.
         """
         try:
-            payments_data, payments_data_err = await self.__LoadWorkSheet()
+            payments_data, payments_data_err = await super()._LoadAndCheckAll()
             self.logger.GetLogger().info(
-                f"Google Sheet successfully loaded, number of rows: {payments_data.Count()}"
+                f"Google Sheet successfully loaded, number of rows: {payments_data.LoadedCount()}"
             )
+            self.logger.GetLogger().info(
+                f"Google requests ({self.google_sheet_rows_getter.GetRequestStats()})"
+            )
+
             return payments_data, payments_data_err
 
         except Exception:
             self.logger.GetLogger().exception("An error occurred while loading Google Sheet")
             raise
 
-    async def __LoadWorkSheet(self) -> Tuple[PaymentsData, PaymentsDataErrors]:
+    @override
+    async def _GetSourceVersion(self) -> Optional[str]:
         """
-        Load payment data from a Google Sheet.
+        Get the last time the Google Sheet was modified, used as source version.
 
         Returns:
-            Tuple of (PaymentsData, PaymentsDataErrors).
+            Modified time, or None if it cannot be got (e.g. the credentials have no access to Google Drive).
         """
-        payments_data = PaymentsData(self.config)
-        payments_data_err = PaymentsDataErrors()
+        try:
+            return await self.google_sheet_rows_getter.GetModifiedTime()
+        except HttpError:
+            self.logger.GetLogger().warning("Unable to get Google Sheet modified time, data will be always reloaded")
+            return None
 
-        email_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EMAIL_COL))
-        user_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_USER_COL))
-        expiration_col_idx = self._ColumnToIndex(self.config.GetValue(BotConfigTypes.PAYMENT_EXPIRATION_COL))
+    @override
+    async def _IterRawRows(self) -> AsyncIterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of the Google Sheet, skipping the header.
+        If paging is enabled, the rows of each page are returned while the next pages are fetched.
 
-        rows = await self.google_sheet_rows_getter.GetRows(
-            self.config.GetValue(BotConfigTypes.PAYMENT_WORKSHEET_IDX)
-        )
+        Returns:
+            Asynchronous iterator over tuples of (row index, email, user string, expiration).
+        """
+        email_col = self.config.GetValue(BotConfigTypes.PAYMENT_EMAIL_COL)
+        user_col = self.config.GetValue(BotConfigTypes.PAYMENT_USER_COL)
+        expiration_col = self.config.GetValue(BotConfigTypes.PAYMENT_EXPIRATION_COL)
+        worksheet_idx = self.config.GetValue(BotConfigTypes.PAYMENT_WORKSHEET_IDX)
+
+        if self.config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_FETCH_COLS_ONLY):
+            # Rows only contain the fetched columns
+            cols = [email_col, user_col, expiration_col]
+            col_idxs = (0, 1, 2)
+        else:
+            cols = None
+            col_idxs = (self._ColumnToIndex(email_col), self._ColumnToIndex(user_col), self._ColumnToIndex(expiration_col))
+
+        page_size = self.config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_PAGE_SIZE)
+        if page_size > 0:
+            first_row_idx = 0
+            async for rows in self.google_sheet_rows_getter.GetRowsPaged(
+                worksheet_idx,
+                page_size,
+                self.config.GetValue(BotConfigTypes.PAYMENT_GOOGLE_PAGE_CONCURRENCY),
+                cols
+            ):
+                for row in self.__IterRows(rows, first_row_idx, col_idxs):
+                    yield row
+                first_row_idx += len(rows)
+        else:
+            rows = (await self.google_sheet_rows_getter.GetRowsByColumns(worksheet_idx, cols)
+                    if cols is not None
+                    else await self.google_sheet_rows_getter.GetRows(worksheet_idx))
+            for row in self.__IterRows(rows, 0, col_idxs):
+                yield row
+
+    def __IterRows(self,
+                   rows: List[List[str]],
+                   first_row_idx: int,
+                   col_idxs: Tuple[int, int, int]) -> Iterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over rows, skipping the header and the rows with missing fields.
+
+        Args:
+            rows: Rows.
+            first_row_idx: Index of the first row in the worksheet (0-based).
+            col_idxs: Indexes of email, user and expiration columns in rows.
+
+        Returns:
+            Iterator over tuples of (row index, email, user string, expiration).
+        """
+        email_col_idx, user_col_idx, expiration_col_idx = col_idxs
 
-        for i, row in enumerate(rows):
+        for i, row in enumerate(rows, start=first_row_idx):
             if i == 0:
                 continue
 
             try:
                 email = row[email_col_idx].strip()
-                user = User.FromString(self.config, row[user_col_idx].strip())
+                user_str = row[user_col_idx].strip()
                 expiration = row[expiration_col_idx].strip()
             except IndexError:
                 self.logger.GetLogger().warning(
                     f"Row index {i + 1} is not valid (some fields are missing), skipping it..."
                 )
             else:
-                if user.IsValid():
-                    self._AddPayment(i + 1, payments_data, payments_data_err, email, user, expiration)
+                yield i + 1, email, user_str, expiration
 
-        return payments_data, payments_data_err
+    async def __LoadSingleUser(self,
+                               user: User) -> Optional[SinglePayment]:
+        """
+        Load a single user payment from a Google Sheet.
+
+        Args:
+            user: User to load payment for.
+
+        Returns:
+            SinglePayment for the user, or None if not found.
+        """
+        rows = await self.google_sheet_rows_getter.GetRowsByColumns(
+            self.config.GetValue(BotConfigTypes.PAYMENT_WORKSHEET_IDX),
+            [
+                self.config.GetValue(BotConfigTypes.PAYMENT_EMAIL_COL),
+                self.config.GetValue(BotConfigTypes.PAYMENT_USER_COL),
+                self.config.GetValue(BotConfigTypes.PAYMENT_EXPIRATION_COL),
+            ]
+        )
+        return self._FindSinglePayment(self.__IterRows(rows, 0, (0, 1, 2)), user)
@@ -0,0 +1,412 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import quote, urljoin
+
+from typing_extensions import override
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.logger.logger import Logger
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase, PaymentsDataErrors, SinglePayment
+from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # type: ignore
+
+
+class PaymentsHttpLoaderConst:
+    """Constants for payment HTTP loader class."""
+
+    PAYMENTS_KEY: str = "payments"
+    NEXT_KEY: str = "next"
+    EMAIL_KEY: str = "email"
+    USER_KEY: str = "user"
+    EXPIRATION_KEY: str = "expiration"
+    USER_PLACEHOLDER: str = "{user}"
+    HTTP_NOT_MODIFIED: int = 304
+    HTTP_NOT_FOUND: int = 404
+
+
+# Validators of a page, as tuple of (URL, ETag, Last-Modified)
+PageValidatorsType = Tuple[str, Optional[str], Optional[str]]
+
+
+class PaymentsHttpLoader(PaymentsLoaderBase):
+    """
+    Loader for payment data from an HTTP endpoint returning JSON.
+    Each page is an object with the list of payments (each one with email, user and expiration) and, optionally,
+    the URL of the next page. Pages are downloaded while the previous one is parsed.
+    Requests share a persistent session, so connections are kept alive. If the endpoint returns ETag or
+    Last-Modified headers for all pages, each page is requested conditionally and payment data is reused if no page
+    was modified. Modified pages are kept for the following load, so that they are not downloaded twice.
+    """
+
+    session: Optional[Any]
+    pages_validators: Optional[List[PageValidatorsType]]
+    loaded_pages_validators: List[PageValidatorsType]
+    prefetched_pages: Dict[str, Tuple[Any, Optional[str], Optional[str]]]
+
+    def __init__(self,
+                 config: ConfigObject,
+                 logger: Logger) -> None:
+        """
+        Initialize the HTTP payments loader.
+
+        Args:
+            config: Configuration object.
+            logger: Logger instance.
+        """
+        super().__init__(config, logger)
+        self.session = None
+        self.pages_validators = None
+        self.loaded_pages_validators = []
+        self.prefetched_pages = {}
+
+    @override
+    async def LoadSingleByUser(self,
+                               user: User) -> Optional[SinglePayment]:
+        """
+        Load a single payment by user from the per-user endpoint, if configured.
+        Otherwise, all payments are loaded (reusing them if not modified).
+        Since the per-user endpoint only returns the payments of the user, emails duplicated by other users
+        are not detected.
+
+        Args:
+            user: User to load payment for.
+
+        Returns:
+            SinglePayment for the user, or None if not found.
+
+        Raises:
+            Exception: If an error occurs while requesting the endpoint.
+        """
+        user_url = self.config.GetValue(BotConfigTypes.PAYMENT_HTTP_USER_URL)
+        if user_url == "":
+            return (await self.LoadAll()).GetByUser(user)
+        if not user.IsValid():
+            return None
+
+        try:
+            status, page, _ = await self.__Get(
+                user_url.replace(PaymentsHttpLoaderConst.USER_PLACEHOLDER, quote(str(user.GetAsKey()), safe="")),
+                allow_not_found=True
+            )
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading user {user} from endpoint")
+            raise
+
+        if status == PaymentsHttpLoaderConst.HTTP_NOT_FOUND:
+            return None
+        return self._FindSinglePayment(self.__ToRawRows(self.__PagePayments(page), 1), user)
+
+    @override
+    async def Close(self) -> None:
+        """Close the client session."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    @override
+    def Invalidate(self) -> None:
+        """Invalidate any state kept between loads, so that the next load starts from scratch."""
+        super().Invalidate()
+        self.pages_validators = None
+        self.prefetched_pages = {}
+
+    @override
+    async def _LoadAndCheckAll(self) -> Tuple[PaymentsDataBase, Optional[PaymentsDataErrors]]:
+        """
+        Load and check all payments from the endpoint.
+
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors or None if collected by lazy payments data).
+
+        Raises:
+            Exception: If an error occurs while requesting the endpoint.
+        """
+        url = self.config.GetValue(BotConfigTypes.PAYMENT_HTTP_URL)
+
+        try:
+            self.logger.GetLogger().info(f"Loading payments from '{url}'...")
+
+            payments_data, payments_data_err = await super()._LoadAndCheckAll()
+            self.logger.GetLogger().info(
+                f"Payments from '{url}' successfully loaded, number of rows: {payments_data.LoadedCount()}"
+            )
+
+            return payments_data, payments_data_err
+
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading payments from '{url}'")
+            raise
+
+    @override
+    async def _GetSourceVersion(self) -> Optional[str]:
+        """
+        Get the endpoint version, by requesting conditionally all the pages of the last load.
+
+        Returns:
+            Digest of the ETag and Last-Modified headers of all pages, or None if some page does not return them,
+            there is no previous load or the endpoint cannot be requested.
+        """
+        if self.load_result is None or self.pages_validators is None:
+            return None
+
+        try:
+            pages_validators = await asyncio.gather(
+                *(self.__GetPageIfModified(*page_validators) for page_validators in self.pages_validators)
+            )
+        except Exception as ex:
+            self.logger.GetLogger().warning(f"Unable to get payments endpoint version: {ex}")
+            return None
+
+        return self.__GetVersion(pages_validators)
+
+    @override
+    def _GetLoadedSourceVersion(self,
+                                version: Any) -> Optional[str]:
+        """
+        Get the version of the pages just loaded.
+
+        Args:
+            version: Version got before loading.
+
+        Returns:
+            Digest of the ETag and Last-Modified headers of all pages, or None if some page does not return them.
+        """
+        self.pages_validators = self.loaded_pages_validators
+        return self.__GetVersion(self.pages_validators)
+
+    @override
+    async def _IterRawRows(self) -> AsyncIterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the payments of all pages, downloading the next page while the current one is parsed.
+        Pages already downloaded when getting the version are not downloaded again.
+        Row indexes count all the payments of previous pages, including the skipped ones.
+
+        Returns:
+            Asynchronous iterator over tuples of (row index, email, user string, expiration).
+
+        Raises:
+            ValueError: If a page links to a page already loaded, which would make pages loop forever.
+        """
+        url = self.config.GetValue(BotConfigTypes.PAYMENT_HTTP_URL)
+        pages_validators = []
+        visited_urls = {url}
+
+        page, etag, last_modified = await self.__GetLoadPage(url)
+
+        row_idx = 1
+        while True:
+            pages_validators.append((url, etag, last_modified))
+
+            next_url = page.get(PaymentsHttpLoaderConst.NEXT_KEY) if isinstance(page, dict) else None
+            next_task = None
+            if next_url:
+                url = urljoin(url, next_url)
+                if url in visited_urls:
+                    raise ValueError(f"Payments page '{url}' already loaded, pages are looping")
+                visited_urls.add(url)
+                next_task = asyncio.ensure_future(self.__GetLoadPage(url))
+
+            page_payments = self.__PagePayments(page)
+            try:
+                for row in self.__ToRawRows(page_payments, row_idx):
+                    yield row
+            except BaseException:
+                # Do not leave the request pending if the iteration is stopped
+                if next_task is not None:
+                    next_task.cancel()
+                raise
+            row_idx += len(page_payments)
+
+            if next_task is None:
+                break
+            page, etag, last_modified = await next_task
+
+        self.loaded_pages_validators = pages_validators
+        self.prefetched_pages = {}
+
+    async def __GetPageIfModified(self,
+                                  url: str,
+                                  etag: Optional[str],
+                                  last_modified: Optional[str]) -> PageValidatorsType:
+        """
+        Request a page conditionally, keeping it for the following load if modified.
+        If the page was already downloaded by a previous request, it is requested against its validators.
+
+        Args:
+            url: Page URL.
+            etag: ETag of the page.
+            last_modified: Last-Modified of the page.
+
+        Returns:
+            Current validators of the page.
+        """
+        prefetched_page = self.prefetched_pages.get(url)
+        if prefetched_page is not None:
+            _, etag, last_modified = prefetched_page
+
+        headers = {}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        if last_modified is not None:
+            headers["If-Modified-Since"] = last_modified
+
+        status, page, resp_headers = await self.__Get(url, headers)
+        if status == PaymentsHttpLoaderConst.HTTP_NOT_MODIFIED:
+            return url, etag, last_modified
+
+        etag = resp_headers.get("ETag")
+        last_modified = resp_headers.get("Last-Modified")
+        self.prefetched_pages[url] = (page, etag, last_modified)
+        return url, etag, last_modified
+
+    async def __GetLoadPage(self,
+                            url: str) -> Tuple[Any, Optional[str], Optional[str]]:
+        """
+        Get a page for loading it, using the page downloaded when getting the version, if any.
+
+        Args:
+            url: Page URL.
+
+        Returns:
+            Tuple of (page, ETag, Last-Modified).
+        """
+        prefetched_page = self.prefetched_pages.pop(url, None)
+        if prefetched_page is not None:
+            return prefetched_page
+
+        _, page, headers = await self.__Get(url)
+        return page, headers.get("ETag"), headers.get("Last-Modified")
+
+    async def __Get(self,
+                    url: str,
+                    headers: Optional[Dict[str, str]] = None,
+                    allow_not_found: bool = False) -> Tuple[int, Any, Mapping[str, str]]:
+        """
+        Request a page.
+
+        Args:
+            url: Page URL.
+            headers: Additional request headers (not modified is only accepted if conditional headers are present).
+            allow_not_found: True to accept not found as a valid status, False otherwise.
+
+        Returns:
+            Tuple of (status, page, response headers (case-insensitive)), the page is None if not modified or not found.
+
+        Raises:
+            aiohttp.ClientResponseError: If the response status is not successful (and not accepted).
+        """
+        async with self.__GetSession().get(url, headers=headers) as response:
+            if ((response.status == PaymentsHttpLoaderConst.HTTP_NOT_MODIFIED and headers) or
+                    (response.status == PaymentsHttpLoaderConst.HTTP_NOT_FOUND and allow_not_found)):
+                return response.status, None, response.headers
+            if not 200 <= response.status < 300:
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message=str(response.reason),
+                    headers=response.headers
+                )
+            return response.status, await response.json(content_type=None), response.headers
+
+    def __GetSession(self) -> Any:
+        """
+        Get the client session, creating it the first time (i.e. inside the event loop).
+
+        Returns:
+            Client session.
+
+        Raises:
+            ImportError: If aiohttp is not installed.
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for loading payments from HTTP endpoints")
+
+        if self.session is None or self.session.closed:
+            token = self.config.GetValue(BotConfigTypes.PAYMENT_HTTP_TOKEN)
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.config.GetValue(BotConfigTypes.PAYMENT_HTTP_MAX_CONN)),
+                timeout=aiohttp.ClientTimeout(total=self.config.GetValue(BotConfigTypes.PAYMENT_HTTP_TIMEOUT_SEC)),
+                headers={"Authorization": f"Bearer {token}"} if token != "" else None,
+                raise_for_status=False,
+            )
+        return self.session
+
+    def __ToRawRows(self,
+                    payments: List[Any],
+                    first_row_idx: int) -> Iterator[Tuple[int, str, str, Any]]:
+        """
+        Convert the payments of a page to raw rows, skipping the payments that are not objects.
+
+        Args:
+            payments: Payments of the page.
+            first_row_idx: Index of the first row.
+
+        Returns:
+            Iterator over tuples of (row index, email, user string, expiration).
+        """
+        for row_idx, payment in enumerate(payments, start=first_row_idx):
+            if not isinstance(payment, dict):
+                self.logger.GetLogger().warning(f"Row index {row_idx} is not valid (not an object), skipping it...")
+                continue
+
+            yield (row_idx,
+                   str(payment.get(PaymentsHttpLoaderConst.EMAIL_KEY) or "").strip(),
+                   str(payment.get(PaymentsHttpLoaderConst.USER_KEY) or "").strip(),
+                   str(payment.get(PaymentsHttpLoaderConst.EXPIRATION_KEY) or ""))
+
+    @staticmethod
+    def __PagePayments(page: Any) -> List[Any]:
+        """
+        Get the payments of a page.
+
+        Args:
+            page: Page, as an object with the list of payments or as the list itself.
+
+        Returns:
+            List of payments.
+        """
+        return page.get(PaymentsHttpLoaderConst.PAYMENTS_KEY, []) if isinstance(page, dict) else page or []
+
+    @staticmethod
+    def __GetVersion(pages_validators: List[PageValidatorsType]) -> Optional[str]:
+        """
+        Get the version of pages from their validators.
+
+        Args:
+            pages_validators: Validators of all pages.
+
+        Returns:
+            Digest of the validators, or None if some page has no validator.
+        """
+        if not pages_validators or any(etag is None and last_modified is None for _, etag, last_modified in pages_validators):
+            return None
+        return hashlib.sha256(repr(pages_validators).encode()).hexdigest()
@@ -0,0 +1,90 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+from typing import Any, Optional, cast
+
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase, PaymentsDataErrors
+from telegram_payment_bot.payment.payments_data_lazy import PaymentsDataLazy
+
+
+class PaymentsLoadResult:
+    """Result of a payments load, i.e. payments data and errors parsed from a specific version of the source."""
+
+    payments_data: PaymentsDataBase
+    payments_data_err: Optional[PaymentsDataErrors]
+    version: Any
+
+    def __init__(self,
+                 payments_data: PaymentsDataBase,
+                 payments_data_err: Optional[PaymentsDataErrors],
+                 version: Any) -> None:
+        """
+        Initialize the load result.
+
+        Args:
+            payments_data: Payments data.
+            payments_data_err: Payments data errors (None if collected by lazy payments data when requested).
+            version: Version of the source the data was loaded from (None if unknown).
+        """
+        self.payments_data = payments_data
+        self.payments_data_err = payments_data_err
+        self.version = version
+
+    def Data(self) -> PaymentsDataBase:
+        """
+        Get payments data.
+
+        Returns:
+            Payments data.
+        """
+        return self.payments_data
+
+    def Errors(self) -> PaymentsDataErrors:
+        """
+        Get payments data errors.
+
+        Returns:
+            Payments data errors.
+        """
+        if self.payments_data_err is None:
+            self.payments_data_err = cast(PaymentsDataLazy, self.payments_data).Errors()
+        return self.payments_data_err
+
+    def Version(self) -> Any:
+        """
+        Get the source version.
+
+        Returns:
+            Source version, or None if unknown.
+        """
+        return self.version
+
+    def IsVersion(self,
+                  version: Any) -> bool:
+        """
+        Get if the result was loaded from the specified source version.
+
+        Args:
+            version: Source version.
+
+        Returns:
+            True if the result was loaded from the specified version, False otherwise (always False if the version is unknown).
+        """
+        return version is not None and self.version == version
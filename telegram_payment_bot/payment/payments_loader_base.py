@@ -18,24 +18,51 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import hashlib
+import itertools
+import os
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Optional
-
-import xlrd
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional, Tuple, TypeVar, Union
 
 from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
 from telegram_payment_bot.config.config_object import ConfigObject
 from telegram_payment_bot.logger.logger import Logger
+from telegram_payment_bot.misc.async_helpers import to_thread
 from telegram_payment_bot.misc.user import User
-from telegram_payment_bot.payment.payments_data import PaymentErrorTypes, PaymentsData, PaymentsDataErrors, SinglePayment
+from telegram_payment_bot.payment.payments_data import (
+    PaymentRow,
+    PaymentsDataBase,
+    PaymentsDataErrors,
+    SinglePayment,
+)
+from telegram_payment_bot.payment.payments_data_factory import PaymentsDataFactory
+from telegram_payment_bot.payment.payments_data_lazy import PaymentsDataLazy
+from telegram_payment_bot.payment.payments_load_result import PaymentsLoadResult
+from telegram_payment_bot.payment.payments_row_parser import PaymentsRowParser, RowsCellsType
+
+
+T = TypeVar("T")
+
+
+class PaymentsLoaderBaseConst:
+    """Constants for payments loader base class."""
+
+    ROWS_CHUNK_SIZE: int = 1000
+    HASH_CHUNK_SIZE: int = 1024 * 1024
 
 
 class PaymentsLoaderBase(ABC):
     """Base class for payment data loaders."""
 
+    # True if expired and expiring payments are queried directly from the source, without loading all payments
+    SUPPORTS_QUERIES: bool = False
+    # True if raw rows can be loaded in lazy payments data, i.e. they are classified in the same way as IterPayments
+    SUPPORTS_LAZY_PARSING: bool = True
+
     config: ConfigObject
     logger: Logger
+    load_result: Optional[PaymentsLoadResult]
+    rows_cells: Optional[RowsCellsType]
 
     def __init__(self,
                  config: ConfigObject,
@@ -49,15 +76,17 @@ class PaymentsLoaderBase(ABC):
         """
         self.config = config
         self.logger = logger
+        self.load_result = None
+        self.rows_cells = self.__NewRowsCells()
 
-    @abstractmethod
-    async def LoadAll(self) -> PaymentsData:
+    async def LoadAll(self) -> PaymentsDataBase:
         """
         Load all payment data.
 
         Returns:
-            PaymentsData containing all payments.
+            Payments data containing all payments.
         """
+        return (await self.LoadResult()).Data()
 
     @abstractmethod
     async def LoadSingleByUser(self,
@@ -72,7 +101,6 @@ class PaymentsLoaderBase(ABC):
             SinglePayment for the user, or None if not found.
         """
 
-    @abstractmethod
     async def CheckForErrors(self) -> PaymentsDataErrors:
         """
         Check for errors in the payment data.
@@ -80,54 +108,242 @@ class PaymentsLoaderBase(ABC):
         Returns:
             PaymentsDataErrors containing any errors found.
         """
+        return (await self.LoadResult()).Errors()
+
+    async def LoadExpired(self) -> PaymentsDataBase:
+        """
+        Load expired payments.
+        By default, all payments are loaded and filtered.
+
+        Returns:
+            Payments data containing expired payments, sorted by expiration date.
+        """
+        return (await self.LoadAll()).FilterExpired()
 
-    def _AddPayment(self,
-                    row_idx: int,
-                    payments_data: PaymentsData,
-                    payments_data_err: PaymentsDataErrors,
-                    email: str,
-                    user: User,
-                    expiration: str) -> None:
+    async def LoadExpiringInDays(self,
+                                 days: int) -> PaymentsDataBase:
         """
-        Add a payment entry from a row.
+        Load payments expiring within the specified days.
+        By default, all payments are loaded and filtered.
 
         Args:
-            row_idx: Row index (1-based).
-            payments_data: PaymentsData to add to.
-            payments_data_err: PaymentsDataErrors to add errors to.
-            email: Email address.
-            user: User object.
-            expiration: Expiration date string.
+            days: Number of days.
+
+        Returns:
+            Payments data containing expiring payments, sorted by expiration date.
         """
-        try:
-            if isinstance(expiration, datetime):
-                expiration_datetime = expiration.date()
-            elif isinstance(expiration, (int, float)):
-                expiration_datetime = xlrd.xldate_as_datetime(expiration, 0).date()
-            else:
-                expiration_datetime = datetime.strptime(expiration.strip(),
-                                                        self.config.GetValue(BotConfigTypes.PAYMENT_DATE_FORMAT)).date()
-        except (ValueError, AttributeError):
-            self.logger.GetLogger().warning(
-                f"Expiration date for user {user} at row {row_idx} is not valid ({expiration}), skipped"
-            )
-            payments_data_err.AddPaymentError(PaymentErrorTypes.INVALID_DATE_ERR,
-                                              row_idx,
-                                              user,
-                                              expiration)
-            return
-
-        if payments_data.AddPayment(email, user, expiration_datetime):
-            self.logger.GetLogger().debug(
-                f"{payments_data.Count():4d} - Row {row_idx:4d} | {email} | {user} | {expiration_datetime}"
-            )
-        else:
-            self.logger.GetLogger().warning(
-                f"Row {row_idx} contains duplicated data, skipped"
+        return (await self.LoadAll()).FilterExpiringInDays(days)
+
+    async def IterPayments(self) -> AsyncIterator[PaymentRow]:
+        """
+        Iterate over payment rows as they are read, without keeping them in memory.
+        Rows with a not valid user are skipped, rows with a not valid expiration date or duplicated data are returned as errors.
+        If the rows cache is enabled, rows not changed since the last time all rows were iterated are not parsed again.
+
+        Returns:
+            Asynchronous iterator over payment rows.
+        """
+        row_parser = PaymentsRowParser(self.config, self.logger, self.rows_cells)
+        async for row_idx, email, user_str, expiration in self._IterRawRows():
+            payment_row = row_parser.Parse(row_idx, email, user_str, expiration)
+            if payment_row is not None:
+                yield payment_row
+
+        self.rows_cells = row_parser.RowsCells()
+        self.logger.GetLogger().info(
+            f"Payment rows parsed: {row_parser.ParsedRowsCount()}, reused from last load: {row_parser.ReusedRowsCount()}"
+        )
+
+    async def LoadResult(self) -> PaymentsLoadResult:
+        """
+        Load all payment data and errors.
+        The data is parsed only once for each source version, so LoadAll and CheckForErrors share the same parse
+        until the source changes.
+
+        Returns:
+            Load result.
+        """
+        version = await self._GetSourceVersion()
+        if self.load_result is not None and self.load_result.IsVersion(version):
+            self.logger.GetLogger().info(
+                f"Payment data not modified since last load, reusing loaded data (version: {version})"
             )
-            payments_data_err.AddPaymentError(PaymentErrorTypes.DUPLICATED_DATA_ERR,
-                                              row_idx,
-                                              user)
+            return self.load_result
+
+        payments_data, payments_data_err = await self._LoadAndCheckAll()
+        self.load_result = PaymentsLoadResult(payments_data, payments_data_err, self._GetLoadedSourceVersion(version))
+
+        return self.load_result
+
+    async def IsSourceModified(self) -> bool:
+        """
+        Get if the payment data source was modified since the last load.
+
+        Returns:
+            True if modified, False otherwise (always False if the source version is unknown).
+        """
+        version = await self._GetSourceVersion()
+        return version is not None and (self.load_result is None or not self.load_result.IsVersion(version))
+
+    def Invalidate(self) -> None:
+        """Invalidate any state kept between loads, so that the next load starts from scratch."""
+        self.load_result = None
+        self.rows_cells = self.__NewRowsCells()
+
+    async def Close(self) -> None:
+        """Close any resource kept between loads (e.g. connections). By default, there is nothing to close."""
+
+    async def _GetSourceVersion(self) -> Any:
+        """
+        Get the current version of the payment data source, used to know if the source changed since the last load.
+        By default the version is unknown, so data is always reloaded.
+
+        Returns:
+            Source version (any comparable object), or None if unknown.
+        """
+        return None
+
+    def _GetLoadedSourceVersion(self,
+                                version: Any) -> Any:
+        """
+        Get the version of the payment data source just loaded.
+        By default, it is the version got before loading.
+
+        Args:
+            version: Version got before loading.
+
+        Returns:
+            Source version (any comparable object), or None if unknown.
+        """
+        return version
+
+    @abstractmethod
+    def _IterRawRows(self) -> AsyncIterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of payment data as they are read, skipping the header.
+
+        Returns:
+            Asynchronous iterator over tuples of (row index, email, user string, expiration).
+        """
+
+    async def _LoadAndCheckAll(self) -> Tuple[PaymentsDataBase, Optional[PaymentsDataErrors]]:
+        """
+        Load and check all payments.
+        For lazy payments data, raw rows are only indexed and errors are collected when requested.
+
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors or None if collected by lazy payments data).
+        """
+        payments_data = PaymentsDataFactory(self.config).CreateData()
+        if isinstance(payments_data, PaymentsDataLazy) and self.SUPPORTS_LAZY_PARSING:
+            async for row_idx, email, user_str, expiration in self._IterRawRows():
+                user = User.FromString(self.config, user_str)
+                if user.IsValid():
+                    payments_data.AddRawRow(row_idx, email, user, expiration)
+            return payments_data, None
+
+        payments_data_err = PaymentsDataErrors()
+
+        async for payment_row in self.IterPayments():
+            payment = payment_row.Payment()
+            error = payment_row.Error()
+            if payment is not None:
+                payments_data.AddPayment(payment.Email(), payment.User(), payment.ExpirationDate())
+            elif error is not None:
+                payments_data_err.AddSingle(error)
+
+        return payments_data, payments_data_err
+
+    def _FindSinglePayment(self,
+                           rows: Iterable[Tuple[int, str, str, Any]],
+                           user: User) -> Optional[SinglePayment]:
+        """
+        Find the payment of a user in the rows (blocking, if rows are read from a file).
+        The same rules of loading all payments are applied, i.e. the first row of the user with a valid expiration date
+        is taken, unless its email was already taken by a previous valid row of another user.
+        Rows are scanned lazily, so scanning stops as soon as the payment is found.
+
+        Args:
+            rows: Rows, as tuples of (row index, email, user string, expiration).
+            user: User to find.
+
+        Returns:
+            SinglePayment for the user, or None if not found.
+        """
+        check_dup_email = self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL)
+        user_key = user.GetAsKey()
+        # Rows of other users are parsed without logging, they are only needed to reserve their emails
+        row_parser = PaymentsRowParser(self.config, None)
+
+        for row_idx, email, user_str, expiration in rows:
+            row_user = User.FromString(self.config, user_str)
+            if not row_user.IsValid():
+                continue
+
+            is_user_row = row_user.GetAsKey() == user_key
+            if not is_user_row and not check_dup_email:
+                continue
+
+            payment_row = row_parser.ParseWithUser(row_idx, email, row_user, expiration)
+            if is_user_row:
+                payment = payment_row.Payment()
+                error = payment_row.Error()
+                if payment is not None:
+                    return payment
+                if error is not None:
+                    self.logger.GetLogger().warning(PaymentsRowParser.ErrorToString(error))
+
+        return None
+
+    def __NewRowsCells(self) -> Optional[RowsCellsType]:
+        """
+        Create the empty parsed cells of rows to be kept between loads.
+
+        Returns:
+            Empty parsed cells of rows (None if the rows cache is disabled).
+        """
+        return {} if self.config.GetValue(BotConfigTypes.PAYMENT_ROWS_CACHE_SIZE) > 0 else None
+
+    @staticmethod
+    async def _IterRowsInThread(rows: Iterator[T]) -> AsyncIterator[T]:
+        """
+        Iterate over rows read by a blocking iterator, reading them in chunks in a separate thread.
+
+        Args:
+            rows: Rows iterator.
+
+        Returns:
+            Asynchronous iterator over the rows.
+        """
+        while True:
+            chunk = await to_thread(list, itertools.islice(rows, PaymentsLoaderBaseConst.ROWS_CHUNK_SIZE))
+            if not chunk:
+                break
+            for row in chunk:
+                yield row
+
+    @staticmethod
+    async def _GetFileVersion(file_name: str,
+                              use_hash: bool) -> Optional[Tuple[str, int, Union[int, str]]]:
+        """
+        Get the version of a file, i.e. its path, size and last modification time.
+        If hash is used, the file hash is used in place of the modification time, so that the file is
+        considered changed only if its content changes.
+
+        Args:
+            file_name: File name.
+            use_hash: True for using the file hash, False otherwise.
+
+        Returns:
+            Tuple of (path, size, modification time in nanoseconds or hash), or None if the file cannot be accessed.
+        """
+        try:
+            stat = await to_thread(os.stat, file_name)
+            if use_hash:
+                return file_name, stat.st_size, await to_thread(PaymentsLoaderBase.__ComputeFileHash, file_name)
+        except OSError:
+            return None
+        return file_name, stat.st_size, stat.st_mtime_ns
 
     @staticmethod
     def _ColumnToIndex(col: str) -> int:
@@ -141,3 +357,20 @@ class PaymentsLoaderBase(ABC):
             Zero-based column index.
         """
         return ord(col) - ord("A")
+
+    @staticmethod
+    def __ComputeFileHash(file_name: str) -> str:
+        """
+        Compute the hash of a file.
+
+        Args:
+            file_name: File name.
+
+        Returns:
+            File hash.
+        """
+        file_hash = hashlib.sha256()
+        with open(file_name, "rb") as fin:
+            for chunk in iter(lambda: fin.read(PaymentsLoaderBaseConst.HASH_CHUNK_SIZE), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
@@ -18,13 +18,20 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+from telegram_payment_bot.bot.bot_config import BotConfig
 from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_file_sections_loader import ConfigFileSectionsLoader
 from telegram_payment_bot.config.config_object import ConfigObject
 from telegram_payment_bot.logger.logger import Logger
 from telegram_payment_bot.payment.payment_types import PaymentTypes
+from telegram_payment_bot.payment.payments_csv_loader import PaymentsCsvLoader
 from telegram_payment_bot.payment.payments_excel_loader import PaymentsExcelLoader
 from telegram_payment_bot.payment.payments_google_sheet_loader import PaymentsGoogleSheetLoader
+from telegram_payment_bot.payment.payments_http_loader import PaymentsHttpLoader
 from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+from telegram_payment_bot.payment.payments_multi_source_loader import PaymentsMultiSourceLoader
+from telegram_payment_bot.payment.payments_sql_loader import PaymentsSqlLoader
+from telegram_payment_bot.payment.payments_sqlite_loader import PaymentsSqliteLoader
 
 
 class PaymentTypeError(Exception):
@@ -65,5 +72,39 @@ class PaymentsLoaderFactory:
             return PaymentsExcelLoader(self.config, self.logger)
         if payment_type == PaymentTypes.GOOGLE_SHEET:
             return PaymentsGoogleSheetLoader(self.config, self.logger)
+        if payment_type == PaymentTypes.CSV_FILE:
+            return PaymentsCsvLoader(self.config, self.logger)
+        if payment_type == PaymentTypes.SQLITE:
+            return PaymentsSqliteLoader(self.config, self.logger)
+        if payment_type == PaymentTypes.SQL_DATABASE:
+            return PaymentsSqlLoader(self.config, self.logger)
+        if payment_type == PaymentTypes.HTTP_JSON:
+            return PaymentsHttpLoader(self.config, self.logger)
+        if payment_type == PaymentTypes.MULTI_SOURCE:
+            return PaymentsMultiSourceLoader(
+                self.config,
+                self.logger,
+                [self.__CreateSourceLoader(file_name)
+                 for file_name in self.config.GetValue(BotConfigTypes.PAYMENT_SOURCES)]
+            )
 
         raise PaymentTypeError(f"Invalid payment type {payment_type}")
+
+    def __CreateSourceLoader(self,
+                             file_name: str) -> PaymentsLoaderBase:
+        """
+        Create the payments loader of a source, configured by the payment section of its configuration file.
+
+        Args:
+            file_name: Configuration file name of the source.
+
+        Returns:
+            PaymentsLoaderBase instance for the source.
+
+        Raises:
+            PaymentTypeError: If the payment type of the source is invalid.
+        """
+        source_config = ConfigFileSectionsLoader.Load(file_name, {"payment": BotConfig["payment"]})
+        if source_config.GetValue(BotConfigTypes.PAYMENT_TYPE) == PaymentTypes.MULTI_SOURCE:
+            raise PaymentTypeError(f"Payment source {file_name} cannot be a multi-source")
+        return PaymentsLoaderFactory(source_config, self.logger).CreateLoader()
@@ -0,0 +1,288 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import copy
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+from typing_extensions import override
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.logger.logger import Logger
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import (
+    PaymentError,
+    PaymentErrorTypes,
+    PaymentRow,
+    PaymentsDataBase,
+    PaymentsDataErrors,
+    SinglePayment,
+)
+from telegram_payment_bot.payment.payments_data_factory import PaymentsDataFactory
+from telegram_payment_bot.payment.payments_load_result import PaymentsLoadResult
+from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+from telegram_payment_bot.payment.payments_row_parser import PaymentsRowParser
+
+
+class PaymentsMultiSourceLoader(PaymentsLoaderBase):
+    """
+    Payments loader merging several sources, loaded concurrently.
+    If a user is present in more sources, the payment with the latest expiration date is kept.
+    Each source applies its own rules for duplicated data. Payments are always kept when merging, while users with
+    different data in more sources (or, if duplicated emails are checked, with the same email of users of other
+    sources) are reported as conflicts.
+    """
+
+    loaders: List[PaymentsLoaderBase]
+    merged_data_config: ConfigObject
+    sources_results: Optional[List[PaymentsLoadResult]]
+
+    def __init__(self,
+                 config: ConfigObject,
+                 logger: Logger,
+                 loaders: Sequence[PaymentsLoaderBase]) -> None:
+        """
+        Initialize the multi-source payments loader.
+
+        Args:
+            config: Configuration object.
+            logger: Logger instance.
+            loaders: Loaders of the sources, in order.
+        """
+        super().__init__(config, logger)
+        self.loaders = list(loaders)
+        # Merged data shall not reject payments, email conflicts are checked when merging
+        self.merged_data_config = copy.deepcopy(config)
+        self.merged_data_config.SetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL, False)
+        self.sources_results = None
+
+    @override
+    async def LoadSingleByUser(self,
+                               user: User) -> Optional[SinglePayment]:
+        """
+        Load a single payment by user, looking for it in all sources concurrently.
+
+        Args:
+            user: User to load payment for.
+
+        Returns:
+            SinglePayment with the latest expiration date for the user, or None if not found.
+        """
+        payments = await asyncio.gather(*(loader.LoadSingleByUser(user) for loader in self.loaders))
+
+        latest_payment = None
+        for payment in payments:
+            if payment is not None and (latest_payment is None or
+                                        payment.ExpirationDate() > latest_payment.ExpirationDate()):
+                latest_payment = payment
+        return latest_payment
+
+    @override
+    async def LoadResult(self) -> PaymentsLoadResult:
+        """
+        Load all payment data and errors, loading all sources concurrently.
+        Each source reuses its own data if not modified, and the merged data is reused if no source was reloaded.
+
+        Returns:
+            Load result.
+        """
+        sources_results = list(await asyncio.gather(*(loader.LoadResult() for loader in self.loaders)))
+        if (self.load_result is not None and
+                self.sources_results is not None and
+                all(curr is prev for curr, prev in zip(sources_results, self.sources_results))):
+            self.logger.GetLogger().info("Payment sources not modified since last load, reusing merged data")
+            return self.load_result
+
+        payments_data, payments_data_err = self.__Merge(sources_results)
+        self.sources_results = sources_results
+        self.load_result = PaymentsLoadResult(payments_data,
+                                              payments_data_err,
+                                              self.__MergeVersions([res.Version() for res in sources_results]))
+        return self.load_result
+
+    @override
+    async def IterPayments(self) -> AsyncIterator[PaymentRow]:
+        """
+        Iterate over payment rows of all sources, one source after the other, as they are read.
+        Rows are not merged, so each source reports its own rows and errors.
+
+        Returns:
+            Asynchronous iterator over payment rows.
+        """
+        for loader in self.loaders:
+            async for payment_row in loader.IterPayments():
+                yield payment_row
+
+    @override
+    def Invalidate(self) -> None:
+        """Invalidate any state kept between loads, so that the next load starts from scratch."""
+        super().Invalidate()
+        self.sources_results = None
+        for loader in self.loaders:
+            loader.Invalidate()
+
+    @override
+    async def Close(self) -> None:
+        """Close the resources of all sources."""
+        await asyncio.gather(*(loader.Close() for loader in self.loaders))
+
+    @override
+    async def _GetSourceVersion(self) -> Any:
+        """
+        Get the current version of the sources.
+
+        Returns:
+            Tuple of the sources versions, or None if the version of any source is unknown.
+        """
+        return self.__MergeVersions(
+            list(await asyncio.gather(*(loader._GetSourceVersion() for loader in self.loaders)))
+        )
+
+    @override
+    async def _IterRawRows(self) -> AsyncIterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of all sources, one source after the other.
+        Row indexes restart from each source.
+
+        Returns:
+            Asynchronous iterator over tuples of (row index, email, user string, expiration).
+        """
+        for loader in self.loaders:
+            async for row in loader._IterRawRows():
+                yield row
+
+    @override
+    async def _LoadAndCheckAll(self) -> Tuple[PaymentsDataBase, PaymentsDataErrors]:
+        """
+        Load and check all payments, loading all sources concurrently.
+
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors).
+        """
+        return self.__Merge(await asyncio.gather(*(loader.LoadResult() for loader in self.loaders)))
+
+    def __Merge(self,
+                sources_results: Sequence[PaymentsLoadResult]) -> Tuple[PaymentsDataBase, PaymentsDataErrors]:
+        """
+        Merge the results of the sources.
+        Errors of each source are kept, and an error is added for each user having different data in more sources or,
+        if duplicated emails are checked, the same email of users of other sources (all these users are reported).
+        The payments of these users are kept anyway.
+
+        Args:
+            sources_results: Results of the sources, in order.
+
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors).
+        """
+        payments_data_err = PaymentsDataErrors()
+        # Latest payment of each user, with the index of its source
+        latest_payments: Dict[Any, Tuple[SinglePayment, int]] = {}
+        conflict_users = set()
+
+        for source_idx, source_result in enumerate(sources_results):
+            payments_data_err.AddMultiple(source_result.Errors())
+
+            for payment in source_result.Data().Values():
+                user_key = payment.User().GetAsKey()
+                curr_payment_source = latest_payments.get(user_key)
+                if curr_payment_source is None:
+                    latest_payments[user_key] = (payment, source_idx)
+                    continue
+
+                curr_payment = curr_payment_source[0]
+
+                if (curr_payment.ExpirationDate() != payment.ExpirationDate() or
+                        PaymentsDataBase.NormalizeEmail(curr_payment.Email()) !=
+                        PaymentsDataBase.NormalizeEmail(payment.Email())):
+                    conflict_users.add(user_key)
+                if payment.ExpirationDate() > curr_payment.ExpirationDate():
+                    latest_payments[user_key] = (payment, source_idx)
+
+        if self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL):
+            conflict_users.update(self.__GetCrossSourceEmailUsers(latest_payments))
+
+        payments_data = PaymentsDataFactory(self.merged_data_config).CreateData()
+        for user_key, (payment, _) in latest_payments.items():
+            payments_data.AddPayment(payment.Email(), payment.User(), payment.ExpirationDate())
+            if user_key in conflict_users:
+                self.__AddConflictError(payments_data_err, payment)
+
+        self.logger.GetLogger().info(
+            f"Payment data merged from {len(sources_results)} sources: {payments_data.Count()} payment(s), "
+            f"{len(conflict_users)} conflict(s)"
+        )
+
+        return payments_data, payments_data_err
+
+    @staticmethod
+    def __GetCrossSourceEmailUsers(latest_payments: Dict[Any, Tuple[SinglePayment, int]]) -> Set[Any]:
+        """
+        Get the users whose email is also the email of users of other sources.
+        Users sharing an email within the same source are not reported, since each source checks its own emails.
+
+        Args:
+            latest_payments: Latest payment of each user, with the index of its source.
+
+        Returns:
+            Set of user keys.
+        """
+        email_users: Dict[str, List[Tuple[int, Any]]] = {}
+        for user_key, (payment, source_idx) in latest_payments.items():
+            email_key = PaymentsDataBase.NormalizeEmail(payment.Email())
+            if email_key != "":
+                email_users.setdefault(email_key, []).append((source_idx, user_key))
+
+        cross_source_users: Set[Any] = set()
+        for users in email_users.values():
+            if len({source_idx for source_idx, _ in users}) > 1:
+                cross_source_users.update(user_key for _, user_key in users)
+        return cross_source_users
+
+    def __AddConflictError(self,
+                           payments_data_err: PaymentsDataErrors,
+                           payment: SinglePayment) -> None:
+        """
+        Add a conflict error for a payment.
+
+        Args:
+            payments_data_err: Payments data errors.
+            payment: Payment kept for the user.
+        """
+        # Conflicts are not related to a specific row
+        error = PaymentError(PaymentErrorTypes.CROSS_SOURCE_CONFLICT_ERR, 0, payment.User(), str(payment.ExpirationDate()))
+        payments_data_err.AddSingle(error)
+        self.logger.GetLogger().warning(PaymentsRowParser.ErrorToString(error))
+
+    @staticmethod
+    def __MergeVersions(versions: List[Any]) -> Any:
+        """
+        Merge the versions of the sources.
+
+        Args:
+            versions: Versions of the sources.
+
+        Returns:
+            Tuple of versions, or None if any version is unknown.
+        """
+        if any(version is None for version in versions):
+            return None
+        return tuple(versions)
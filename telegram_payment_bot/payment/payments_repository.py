@@ -0,0 +1,354 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import time
+from typing import Optional
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.logger.logger import Logger
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import (
+    PaymentsDataBase,
+    PaymentsDataDiff,
+    PaymentsDataErrors,
+    SinglePayment,
+)
+from telegram_payment_bot.payment.payments_load_result import PaymentsLoadResult
+from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+from telegram_payment_bot.payment.payments_loader_factory import PaymentsLoaderFactory
+from telegram_payment_bot.payment.payments_storage_types import PaymentsStorageTypes
+
+
+class PaymentsRepository:
+    """
+    Repository of payments data shared by all payment consumers.
+
+    Payments are cached for a configurable time. When the cached data is older than the TTL but still within the
+    stale window, it is returned immediately while a refresh runs in background. Concurrent loads are coalesced,
+    so that all callers await the same in-flight load. Payments data and errors are cached together, so that checking
+    for errors shares the same load.
+    When the cache is invalidated, a load already in progress is not cached and the next access starts a new one.
+    The payments loader is never used concurrently (e.g. a single user query while loading all payments), since
+    loaders keep state between loads.
+    If enabled, the payments source is also periodically checked after the first load, and payments data is
+    reloaded in background as soon as the source changes.
+    When payments data is reloaded, the differences from the previous data are computed and logged
+    (except for lazy payments data, since all payments would be parsed).
+    """
+
+    config: ConfigObject
+    logger: Logger
+    payments_loader: PaymentsLoaderBase
+    load_result: Optional[PaymentsLoadResult]
+    payments_diff: Optional[PaymentsDataDiff]
+    load_time: float
+    load_version: int
+    load_task: Optional[asyncio.Future]
+    load_task_version: int
+    loader_lock: Optional[asyncio.Lock]
+    watch_task: Optional[asyncio.Future]
+
+    def __init__(self,
+                 config: ConfigObject,
+                 logger: Logger) -> None:
+        """
+        Initialize the payments repository.
+
+        Args:
+            config: Configuration object.
+            logger: Logger instance.
+        """
+        self.config = config
+        self.logger = logger
+        self.payments_loader = PaymentsLoaderFactory(config, logger).CreateLoader()
+        self.load_result = None
+        self.payments_diff = None
+        self.load_time = 0.0
+        self.load_version = 0
+        self.load_task = None
+        self.load_task_version = 0
+        self.loader_lock = None
+        self.watch_task = None
+
+    async def GetAll(self) -> PaymentsDataBase:
+        """
+        Get all payments, loading them if not cached or expired.
+
+        Returns:
+            Payments data containing all payments.
+        """
+        return (await self.__GetLoadResult()).Data()
+
+    async def GetSingleByUser(self,
+                              user: User) -> Optional[SinglePayment]:
+        """
+        Get the payment of a single user.
+        Cached payments are used if still valid, otherwise the user is loaded from the source (after any load in
+        progress, whose payments are used if valid).
+
+        Args:
+            user: User to get payment for.
+
+        Returns:
+            SinglePayment for the user, or None if not found.
+        """
+        async with self.__GetLoaderLock():
+            if self.load_result is not None and self.__Age() < self.__Ttl():
+                return self.load_result.Data().GetByUser(user)
+            return await self.payments_loader.LoadSingleByUser(user)
+
+    async def GetExpired(self) -> PaymentsDataBase:
+        """
+        Get expired payments.
+        If supported, they are queried directly from the source, otherwise they are filtered from all payments.
+
+        Returns:
+            Payments data containing expired payments.
+        """
+        if self.payments_loader.SUPPORTS_QUERIES:
+            async with self.__GetLoaderLock():
+                return await self.payments_loader.LoadExpired()
+        return (await self.GetAll()).FilterExpired()
+
+    async def GetExpiringInDays(self,
+                                days: int) -> PaymentsDataBase:
+        """
+        Get payments expiring within the specified days.
+        If supported, they are queried directly from the source, otherwise they are filtered from all payments.
+
+        Args:
+            days: Number of days.
+
+        Returns:
+            Payments data containing expiring payments.
+        """
+        if self.payments_loader.SUPPORTS_QUERIES:
+            async with self.__GetLoaderLock():
+                return await self.payments_loader.LoadExpiringInDays(days)
+        return (await self.GetAll()).FilterExpiringInDays(days)
+
+    async def CheckForErrors(self) -> PaymentsDataErrors:
+        """
+        Check payments data for errors.
+        Errors are got from the same cached load of payments data.
+
+        Returns:
+            PaymentsDataErrors containing all found errors.
+        """
+        return (await self.__GetLoadResult()).Errors()
+
+    async def Reload(self) -> PaymentsDataBase:
+        """
+        Force a reload of payments data, invalidating any state kept by the loader.
+        If a load is already in progress, it is waited for before starting a new one.
+
+        Returns:
+            Payments data containing all payments.
+        """
+        if self.load_task is not None and not self.load_task.done():
+            await asyncio.wait([self.load_task])
+        async with self.__GetLoaderLock():
+            self.payments_loader.Invalidate()
+        return await self.__WaitLoad()
+
+    def GetLastDiff(self) -> Optional[PaymentsDataDiff]:
+        """
+        Get the differences between the last loaded payments data and the previous one.
+
+        Returns:
+            PaymentsDataDiff, or None if not computed (e.g. at the first load or if data was not modified).
+        """
+        return self.payments_diff
+
+    def Invalidate(self) -> None:
+        """
+        Invalidate the cached payments data, so that the next access loads it again.
+        A load already in progress is not cached, since it may have started before the source changed.
+        """
+        self.load_version += 1
+        self.load_result = None
+
+    async def Close(self) -> None:
+        """
+        Stop watching the payments source and close the resources of the payments loader.
+        A load in progress is cancelled, and any other use of the loader is waited for before closing it.
+        """
+        if self.watch_task is not None:
+            self.watch_task.cancel()
+            self.watch_task = None
+        if self.load_task is not None:
+            self.load_task.cancel()
+            await asyncio.wait([self.load_task])
+            self.load_task = None
+
+        async with self.__GetLoaderLock():
+            await self.payments_loader.Close()
+
+    def __GetLoaderLock(self) -> asyncio.Lock:
+        """
+        Get the lock for using the payments loader, creating it at the first use (i.e. in the running event loop).
+
+        Returns:
+            Loader lock.
+        """
+        if self.loader_lock is None:
+            self.loader_lock = asyncio.Lock()
+        return self.loader_lock
+
+    def __Age(self) -> float:
+        """
+        Get the age of the cached payments data.
+
+        Returns:
+            Age in seconds.
+        """
+        return time.monotonic() - self.load_time
+
+    def __Ttl(self) -> int:
+        """
+        Get the configured TTL.
+
+        Returns:
+            TTL in seconds.
+        """
+        return self.config.GetValue(BotConfigTypes.PAYMENT_CACHE_TTL_SEC)
+
+    def __StaleTime(self) -> int:
+        """
+        Get the configured time during which stale payments data is served while refreshing.
+
+        Returns:
+            Stale time in seconds.
+        """
+        return self.config.GetValue(BotConfigTypes.PAYMENT_CACHE_STALE_SEC)
+
+    async def __GetLoadResult(self) -> PaymentsLoadResult:
+        """
+        Get the load result of all payments, loading them if not cached or expired.
+
+        Returns:
+            Load result.
+        """
+        if self.load_result is None or self.__Age() >= self.__Ttl() + self.__StaleTime():
+            return await self.__WaitLoadResult()
+
+        if self.__Age() >= self.__Ttl():
+            self.logger.GetLogger().info("Payments data is stale, refreshing it in background")
+            self.__StartLoad()
+
+        return self.load_result
+
+    async def __WaitLoad(self) -> PaymentsDataBase:
+        """
+        Load payments data and wait for it, joining the in-flight load if any.
+
+        Returns:
+            Payments data containing all payments.
+        """
+        return (await self.__WaitLoadResult()).Data()
+
+    async def __WaitLoadResult(self) -> PaymentsLoadResult:
+        """
+        Load payments data and errors and wait for them, joining the in-flight load if any.
+
+        Returns:
+            Load result.
+        """
+        # Shield the load, so that a cancelled caller does not cancel it for the other ones
+        return await asyncio.shield(self.__StartLoad())
+
+    def __StartLoad(self) -> asyncio.Future:
+        """
+        Start loading payments data, unless a load of the current version is already in progress.
+
+        Returns:
+            Load task.
+        """
+        if self.load_task is None or self.load_task.done() or self.load_task_version != self.load_version:
+            self.load_task = asyncio.ensure_future(self.__Load(self.load_version))
+            self.load_task_version = self.load_version
+            self.load_task.add_done_callback(self.__LoadDone)
+        if self.watch_task is None and self.config.GetValue(BotConfigTypes.PAYMENT_WATCH_PERIOD_SEC) > 0:
+            self.watch_task = asyncio.ensure_future(self.__WatchSource())
+        return self.load_task
+
+    async def __Load(self,
+                     version: int) -> PaymentsLoadResult:
+        """
+        Load payments data and update the cache, unless it was invalidated in the meantime.
+        A load of an invalidated version still in progress is waited for, since the loader is locked.
+
+        Args:
+            version: Cache version the load is started for.
+
+        Returns:
+            Load result.
+        """
+        async with self.__GetLoaderLock():
+            load_result = await self.payments_loader.LoadResult()
+        if version != self.load_version:
+            self.logger.GetLogger().info("Payments data invalidated while loading, the loaded data is not cached")
+            return load_result
+
+        payments = load_result.Data()
+        prev_payments = self.load_result.Data() if self.load_result is not None else None
+
+        self.payments_diff = None
+        if (prev_payments is not None and
+                payments is not prev_payments and
+                self.config.GetValue(BotConfigTypes.PAYMENT_STORAGE_TYPE) != PaymentsStorageTypes.LAZY):
+            self.payments_diff = payments.Diff(prev_payments)
+            self.logger.GetLogger().info(f"Payments data changed since last load ({self.payments_diff})")
+
+        self.load_result = load_result
+        self.load_time = time.monotonic()
+
+        return load_result
+
+    def __LoadDone(self,
+                   load_task: asyncio.Future) -> None:
+        """
+        Callback called when the load task is completed.
+
+        Args:
+            load_task: Load task.
+        """
+        if self.load_task is load_task:
+            self.load_task = None
+        if not load_task.cancelled() and load_task.exception() is not None:
+            self.logger.GetLogger().error(f"Error while loading payments data: {load_task.exception()}")
+
+    async def __WatchSource(self) -> None:
+        """Periodically check if the payments source was modified, and reload payments data in background if so."""
+        watch_period = self.config.GetValue(BotConfigTypes.PAYMENT_WATCH_PERIOD_SEC)
+
+        while True:
+            await asyncio.sleep(watch_period)
+
+            try:
+                async with self.__GetLoaderLock():
+                    is_modified = await self.payments_loader.IsSourceModified()
+                if is_modified:
+                    self.logger.GetLogger().info("Payments source modified, reloading payments data in background")
+                    self.__StartLoad()
+            except Exception as ex:
+                self.logger.GetLogger().error(f"Error while checking payments source: {ex}")
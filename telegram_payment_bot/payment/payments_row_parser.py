@@ -0,0 +1,372 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import re
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Pattern, Set, Tuple
+
+import xlrd
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.logger.logger import Logger
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import (
+    PaymentError,
+    PaymentErrorTypes,
+    PaymentRow,
+    PaymentsDataBase,
+    SinglePayment,
+)
+
+
+# Parsed cells of rows, as dictionary of (email, user string, expiration) to (user, expiration date)
+RowsCellsType = Dict[Tuple[str, str, Any], Tuple[User, Optional[date]]]
+
+
+class PaymentsRowParserConst:
+    """Constants for payments row parser class."""
+
+    # Maximum number of parsed expiration dates kept in memory
+    DATES_CACHE_MAX_SIZE: int = 4096
+    # Regular expressions of the numeric date directives supported by the fast date parser
+    FAST_DATE_DIRECTIVES: Dict[str, str] = {
+        "d": r"(?P<d>[0-9]{1,2})",
+        "m": r"(?P<m>[0-9]{1,2})",
+        "Y": r"(?P<Y>[0-9]{4})",
+    }
+    FAST_DATE_FORMAT_REGEX: str = r"%([dmY])([^%]+)%([dmY])([^%]+)%([dmY])"
+
+
+class PaymentsRowParser:
+    """
+    Parser for payment rows.
+    Rows are parsed one at a time, keeping track of the already parsed users and emails
+    so that duplicated data is detected in the same way as when adding payments to payments data.
+    The parsed cells of rows can be kept, up to the configured rows cache size, so that unchanged rows are not parsed
+    again at the next load (only duplicated data is checked again, since it depends on the other rows).
+    """
+
+    config: ConfigObject
+    logger: Optional[Logger]
+    check_dup_email: bool
+    users: Set[Any]
+    emails: Set[str]
+    count: int
+    date_format: str
+    fast_date_regex: Optional[Pattern]
+    dates_cache: Dict[Any, Optional[date]]
+    prev_rows_cells: Optional[RowsCellsType]
+    rows_cells: Optional[RowsCellsType]
+    rows_cache_size: int
+    reused_rows_count: int
+    parsed_rows_count: int
+
+    def __init__(self,
+                 config: ConfigObject,
+                 logger: Optional[Logger],
+                 prev_rows_cells: Optional[RowsCellsType] = None) -> None:
+        """
+        Initialize the row parser.
+
+        Args:
+            config: Configuration object.
+            logger: Logger instance (None for not logging, e.g. when parsing in a separate process).
+            prev_rows_cells: Parsed cells of rows from the previous load (None for not keeping parsed cells).
+        """
+        self.config = config
+        self.logger = logger
+        self.check_dup_email = config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL)
+        self.users = set()
+        self.emails = set()
+        self.count = 0
+        self.date_format = config.GetValue(BotConfigTypes.PAYMENT_DATE_FORMAT)
+        self.fast_date_regex = self.__CompileFastDateFormat(self.date_format)
+        self.dates_cache = {}
+        self.prev_rows_cells = prev_rows_cells
+        self.rows_cache_size = config.GetValue(BotConfigTypes.PAYMENT_ROWS_CACHE_SIZE)
+        self.rows_cells = {} if prev_rows_cells is not None and self.rows_cache_size > 0 else None
+        self.reused_rows_count = 0
+        self.parsed_rows_count = 0
+
+    def Parse(self,
+              row_idx: int,
+              email: str,
+              user_str: str,
+              expiration: Any) -> Optional[PaymentRow]:
+        """
+        Parse a row.
+
+        Args:
+            row_idx: Row index (1-based).
+            email: Email address.
+            user_str: User string.
+            expiration: Expiration date.
+
+        Returns:
+            PaymentRow, or None if the row shall be ignored (i.e. the user is not valid).
+        """
+        user, expiration_date = self.__ParseCells(email, user_str, expiration)
+        if not user.IsValid():
+            return None
+        return self.__ParseRow(row_idx, email, user, expiration, expiration_date)
+
+    def ParseWithUser(self,
+                      row_idx: int,
+                      email: str,
+                      user: User,
+                      expiration: Any) -> PaymentRow:
+        """
+        Parse a row whose user was already parsed.
+
+        Args:
+            row_idx: Row index (1-based).
+            email: Email address.
+            user: User (shall be valid).
+            expiration: Expiration date.
+
+        Returns:
+            PaymentRow.
+        """
+        return self.__ParseRow(row_idx, email, user, expiration, self.__ParseExpiration(expiration))
+
+    def RowsCells(self) -> Optional[RowsCellsType]:
+        """
+        Get the parsed cells of the rows parsed so far.
+
+        Returns:
+            Parsed cells of rows (None if not kept).
+        """
+        return self.rows_cells
+
+    def ReusedRowsCount(self) -> int:
+        """
+        Get the number of rows whose cells were reused from the previous load.
+
+        Returns:
+            Number of reused rows.
+        """
+        return self.reused_rows_count
+
+    def ParsedRowsCount(self) -> int:
+        """
+        Get the number of rows whose cells were parsed.
+
+        Returns:
+            Number of parsed rows.
+        """
+        return self.parsed_rows_count
+
+    def __ParseCells(self,
+                     email: str,
+                     user_str: str,
+                     expiration: Any) -> Tuple[User, Optional[date]]:
+        """
+        Parse the cells of a row, reusing them from the previous load if the row did not change.
+
+        Args:
+            email: Email address.
+            user_str: User string.
+            expiration: Expiration date.
+
+        Returns:
+            Tuple of (user, expiration date or None if not valid).
+        """
+        cells = (email, user_str, expiration)
+        try:
+            prev_parsed_cells = self.prev_rows_cells.get(cells) if self.prev_rows_cells is not None else None
+            if prev_parsed_cells is not None:
+                parsed_cells = prev_parsed_cells
+                self.reused_rows_count += 1
+            else:
+                parsed_cells = self.__ParseUserAndExpiration(user_str, expiration)
+                self.parsed_rows_count += 1
+            if self.rows_cells is not None and len(self.rows_cells) < self.rows_cache_size:
+                self.rows_cells[cells] = parsed_cells
+        except TypeError:
+            # Not hashable cells (e.g. not valid values from JSON) cannot be kept
+            parsed_cells = self.__ParseUserAndExpiration(user_str, expiration)
+            self.parsed_rows_count += 1
+        return parsed_cells
+
+    def __ParseUserAndExpiration(self,
+                                 user_str: str,
+                                 expiration: Any) -> Tuple[User, Optional[date]]:
+        """
+        Parse the user and the expiration date of a row (the expiration date is not parsed if the user is not valid).
+
+        Args:
+            user_str: User string.
+            expiration: Expiration date.
+
+        Returns:
+            Tuple of (user, expiration date or None if not valid).
+        """
+        user = User.FromString(self.config, user_str)
+        return user, (self.__ParseExpiration(expiration) if user.IsValid() else None)
+
+    def __ParseRow(self,
+                   row_idx: int,
+                   email: str,
+                   user: User,
+                   expiration: Any,
+                   expiration_date: Optional[date]) -> PaymentRow:
+        """
+        Build the row of a parsed user and expiration date, checking for duplicated data.
+
+        Args:
+            row_idx: Row index (1-based).
+            email: Email address.
+            user: User (shall be valid).
+            expiration: Expiration date, as read.
+            expiration_date: Parsed expiration date (None if not valid).
+
+        Returns:
+            PaymentRow.
+        """
+        if expiration_date is None:
+            return self.__Error(PaymentError(PaymentErrorTypes.INVALID_DATE_ERR, row_idx, user, expiration))
+
+        user_key = user.GetAsKey()
+        norm_email = PaymentsDataBase.NormalizeEmail(email)
+        if user_key in self.users or (self.check_dup_email and norm_email != "" and norm_email in self.emails):
+            return self.__Error(PaymentError(PaymentErrorTypes.DUPLICATED_DATA_ERR, row_idx, user, None))
+
+        self.users.add(user_key)
+        if self.check_dup_email:
+            self.emails.add(norm_email)
+        self.count += 1
+
+        if self.logger is not None:
+            self.logger.GetLogger().debug(
+                f"{self.count:4d} - Row {row_idx:4d} | {email} | {user} | {expiration_date}"
+            )
+
+        return PaymentRow(row_idx, payment=SinglePayment(email, user, expiration_date))
+
+    @staticmethod
+    def ErrorToString(error: PaymentError) -> str:
+        """
+        Convert a row error to string, for logging it.
+
+        Args:
+            error: Row error.
+
+        Returns:
+            String representation.
+        """
+        if error.Type() == PaymentErrorTypes.INVALID_DATE_ERR:
+            return (f"Expiration date for user {error.User()} at row {error.Row()} "
+                    f"is not valid ({error.ExpirationDate()}), skipped")
+        if error.Type() == PaymentErrorTypes.CROSS_SOURCE_CONFLICT_ERR:
+            return (f"User {error.User()} has conflicting payment data in different sources "
+                    f"(expiration date: {error.ExpirationDate()})")
+        return f"Row {error.Row()} contains duplicated data, skipped"
+
+    def __Error(self,
+                error: PaymentError) -> PaymentRow:
+        """
+        Build the row of an error, logging it.
+
+        Args:
+            error: Row error.
+
+        Returns:
+            PaymentRow containing the error.
+        """
+        if self.logger is not None:
+            self.logger.GetLogger().warning(self.ErrorToString(error))
+        return PaymentRow(error.Row(), error=error)
+
+    def __ParseExpiration(self,
+                          expiration: Any) -> Optional[date]:
+        """
+        Parse an expiration date.
+        Since expiration dates are usually repeated many times, parsed dates are cached.
+
+        Args:
+            expiration: Expiration date, as datetime, Excel serial number or string.
+
+        Returns:
+            Expiration date, or None if not valid.
+        """
+        if isinstance(expiration, datetime):
+            return expiration.date()
+        if not isinstance(expiration, (str, int, float)):
+            return None
+
+        try:
+            return self.dates_cache[expiration]
+        except KeyError:
+            pass
+
+        expiration_date = self.__ParseExpirationValue(expiration)
+        if len(self.dates_cache) < PaymentsRowParserConst.DATES_CACHE_MAX_SIZE:
+            self.dates_cache[expiration] = expiration_date
+        return expiration_date
+
+    def __ParseExpirationValue(self,
+                               expiration: Any) -> Optional[date]:
+        """
+        Parse an expiration date value.
+
+        Args:
+            expiration: Expiration date, as Excel serial number or string.
+
+        Returns:
+            Expiration date, or None if not valid.
+        """
+        try:
+            if isinstance(expiration, (int, float)):
+                return xlrd.xldate_as_datetime(expiration, 0).date()
+
+            expiration = expiration.strip()
+            if self.fast_date_regex is not None:
+                match = self.fast_date_regex.fullmatch(expiration)
+                if match is not None:
+                    return date(int(match.group("Y")), int(match.group("m")), int(match.group("d")))
+            return datetime.strptime(expiration, self.date_format).date()
+        except (ValueError, AttributeError, OverflowError):
+            return None
+
+    @staticmethod
+    def __CompileFastDateFormat(date_format: str) -> Optional[Pattern]:
+        """
+        Compile a date format to a regular expression, if it only contains day, month and year as numbers
+        (e.g. %d/%m/%Y or %Y-%m-%d). Matching it is much faster than strptime.
+
+        Args:
+            date_format: Date format.
+
+        Returns:
+            Compiled regular expression, or None if the date format is not supported.
+        """
+        match = re.fullmatch(PaymentsRowParserConst.FAST_DATE_FORMAT_REGEX, date_format)
+        if match is None:
+            return None
+
+        directives: Tuple[str, ...] = match.group(1, 3, 5)
+        if len(set(directives)) != len(directives):
+            return None
+        return re.compile(
+            PaymentsRowParserConst.FAST_DATE_DIRECTIVES[directives[0]] + re.escape(match.group(2)) +
+            PaymentsRowParserConst.FAST_DATE_DIRECTIVES[directives[1]] + re.escape(match.group(4)) +
+            PaymentsRowParserConst.FAST_DATE_DIRECTIVES[directives[2]]
+        )
@@ -0,0 +1,310 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import datetime
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+
+from typing_extensions import override
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.database.database_pool_base import DatabasePoolBase
+from telegram_payment_bot.database.database_pool_factory import DatabasePoolFactory
+from telegram_payment_bot.logger.logger import Logger
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase, PaymentsDataErrors, SinglePayment
+from telegram_payment_bot.payment.payments_data_factory import PaymentsDataFactory
+from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+from telegram_payment_bot.payment.payments_row_parser import PaymentsRowParser
+
+
+class PaymentsSqlLoader(PaymentsLoaderBase):
+    """
+    Loader for payment data from SQL databases (PostgreSQL or SQLite), through a connection pool.
+    The email, user and expiration columns of the table are mapped by the payment column configuration.
+    Rows are ordered by the configured order column (or by the physical row identifier), so that the valid row of
+    users with more rows does not depend on the query plan.
+    Expired and expiring payments are filtered by the database, so the expiration column shall be a date
+    (or a text in ISO format, i.e. YYYY-MM-DD). Columns are compared as text, so that they can be either texts or
+    dates (or integers, for user IDs).
+    Since duplicated emails depend on the rows of other users, if they are checked all payments are loaded and
+    filtered, so that queries always give the same payments of LoadAll.
+    """
+
+    SUPPORTS_QUERIES: bool = True
+
+    db_pool: DatabasePoolBase
+
+    def __init__(self,
+                 config: ConfigObject,
+                 logger: Logger) -> None:
+        """
+        Initialize the SQL payments loader.
+
+        Args:
+            config: Configuration object.
+            logger: Logger instance.
+        """
+        super().__init__(config, logger)
+        self.db_pool = DatabasePoolFactory.CreatePool(config.GetValue(BotConfigTypes.PAYMENT_DB_URL),
+                                                      config.GetValue(BotConfigTypes.PAYMENT_DB_POOL_SIZE))
+
+    @override
+    async def LoadSingleByUser(self,
+                               user: User) -> Optional[SinglePayment]:
+        """
+        Load a single payment by user from database.
+
+        Args:
+            user: User to load payment for.
+
+        Returns:
+            SinglePayment for the user, or None if not found.
+
+        Raises:
+            Exception: If an error occurs while querying the database.
+        """
+        if self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL):
+            return (await self.LoadAll()).GetByUser(user)
+        if not user.IsValid():
+            return None
+
+        try:
+            rows = await self.db_pool.Fetch(
+                f"{self.__SelectQuery()} WHERE {self.__UserKeyExpression()} = {self.db_pool.Placeholder(1)} {self.__OrderBy()}",
+                str(user.GetAsKey())
+            )
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading user {user} from database")
+            raise
+
+        return self._FindSinglePayment(self.__ToRawRows(rows), user)
+
+    @override
+    async def LoadExpired(self) -> PaymentsDataBase:
+        """
+        Load expired payments from database.
+
+        Returns:
+            Payments data containing expired payments, sorted by expiration date.
+        """
+        if self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL):
+            return await super().LoadExpired()
+        return await self.__LoadExpiringBefore(datetime.date.today())
+
+    @override
+    async def LoadExpiringInDays(self,
+                                 days: int) -> PaymentsDataBase:
+        """
+        Load payments expiring within the specified days from database.
+
+        Args:
+            days: Number of days.
+
+        Returns:
+            Payments data containing expiring payments, sorted by expiration date.
+        """
+        if self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL):
+            return await super().LoadExpiringInDays(days)
+        return await self.__LoadExpiringBefore(datetime.date.today() + datetime.timedelta(days=days))
+
+    @override
+    async def Close(self) -> None:
+        """Close the connection pool."""
+        await self.db_pool.Close()
+
+    @override
+    async def _LoadAndCheckAll(self) -> Tuple[PaymentsDataBase, Optional[PaymentsDataErrors]]:
+        """
+        Load and check all payments from database.
+
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors or None if collected by lazy payments data).
+
+        Raises:
+            Exception: If an error occurs while querying the database.
+        """
+        table = self.config.GetValue(BotConfigTypes.PAYMENT_DB_TABLE)
+
+        try:
+            self.logger.GetLogger().info(f"Loading database table '{table}'...")
+
+            payments_data, payments_data_err = await super()._LoadAndCheckAll()
+            self.logger.GetLogger().info(
+                f"Database table '{table}' successfully loaded, number of rows: {payments_data.LoadedCount()}"
+            )
+
+            return payments_data, payments_data_err
+
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading database table '{table}'")
+            raise
+
+    @override
+    async def _IterRawRows(self) -> AsyncIterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of the table, in order.
+        Rows are fetched in chunks.
+
+        Returns:
+            Asynchronous iterator over tuples of (row index, email, user string, expiration).
+        """
+        row_idx = 1
+        async for row in self.db_pool.Iterate(f"{self.__SelectQuery()} {self.__OrderBy()}"):
+            yield self.__ToRawRow(row_idx, row)
+            row_idx += 1
+
+    async def __LoadExpiringBefore(self,
+                                   limit_date: datetime.date) -> PaymentsDataBase:
+        """
+        Load payments expiring before the specified date.
+
+        Args:
+            limit_date: Limit date (excluded).
+
+        Returns:
+            Payments data containing the payments, sorted by expiration date.
+
+        Raises:
+            Exception: If an error occurs while querying the database.
+        """
+        expiration_col = self.__Identifier(BotConfigTypes.PAYMENT_EXPIRATION_COL)
+        user_key_expr = self.__UserKeyExpression()
+
+        # All rows of the users with an expiring row are selected, since the valid row of a user may be another one
+        try:
+            rows = await self.db_pool.Fetch(
+                f"{self.__SelectQuery()} WHERE {user_key_expr} IN ("
+                f"SELECT {user_key_expr} FROM {self.__Identifier(BotConfigTypes.PAYMENT_DB_TABLE)} "
+                f"WHERE CAST({expiration_col} AS TEXT) < {self.db_pool.Placeholder(1)}"
+                f") {self.__OrderBy()}",
+                limit_date.isoformat()
+            )
+        except Exception:
+            self.logger.GetLogger().exception("An error occurred while loading expiring payments from database")
+            raise
+
+        # Rows are parsed without logging, since errors are reported when loading all payments
+        row_parser = PaymentsRowParser(self.config, None)
+        payments = []
+        for raw_row in self.__ToRawRows(rows):
+            payment_row = row_parser.Parse(*raw_row)
+            payment = payment_row.Payment() if payment_row is not None else None
+            if payment is not None and payment.ExpirationDate() < limit_date:
+                payments.append(payment)
+
+        payments_data = PaymentsDataFactory(self.config).CreateData()
+        for payment in sorted(payments, key=lambda payment: payment.ExpirationDate()):
+            payments_data.AddPayment(payment.Email(), payment.User(), payment.ExpirationDate())
+
+        return payments_data
+
+    def __SelectQuery(self) -> str:
+        """
+        Get the query for selecting the email, user and expiration columns, to be completed with further clauses.
+        Table and column names are validated when loading the configuration, since they cannot be query parameters.
+
+        Returns:
+            Query string.
+        """
+        return (f"SELECT {self.__Identifier(BotConfigTypes.PAYMENT_EMAIL_COL)}, "
+                f"{self.__Identifier(BotConfigTypes.PAYMENT_USER_COL)}, "
+                f"{self.__Identifier(BotConfigTypes.PAYMENT_EXPIRATION_COL)} "
+                f"FROM {self.__Identifier(BotConfigTypes.PAYMENT_DB_TABLE)}")
+
+    def __OrderBy(self) -> str:
+        """
+        Get the clause for ordering rows by the configured order column, or by the physical row identifier if not
+        configured.
+
+        Returns:
+            Clause string.
+        """
+        order_col = self.config.GetValue(BotConfigTypes.PAYMENT_DB_ORDER_COL)
+        return f"ORDER BY {self.__Identifier(BotConfigTypes.PAYMENT_DB_ORDER_COL) if order_col != '' else self.db_pool.RowIdExpression()}"
+
+    def __UserKeyExpression(self) -> str:
+        """
+        Get the expression of the user key, as text, in the same way as users are parsed.
+        For usernames, a leading @ is removed and the username is lowercased. For user IDs, a trailing .0 is removed
+        (i.e. IDs stored as floating point numbers).
+
+        Returns:
+            Expression string.
+        """
+        user_col = f"trim(CAST({self.__Identifier(BotConfigTypes.PAYMENT_USER_COL)} AS TEXT))"
+        if self.config.GetValue(BotConfigTypes.PAYMENT_USE_USER_ID):
+            return f"(CASE WHEN {user_col} LIKE '%.0' THEN substr({user_col}, 1, length({user_col}) - 2) ELSE {user_col} END)"
+        return f"lower(CASE WHEN {user_col} LIKE '@%' THEN substr({user_col}, 2) ELSE {user_col} END)"
+
+    def __Identifier(self,
+                     config_type: BotConfigTypes) -> str:
+        """
+        Get a table or column name from the configuration, as a quoted identifier.
+        Names are quoted, so that they can be also reserved words (e.g. user) and their case is preserved.
+
+        Args:
+            config_type: Configuration type of the name.
+
+        Returns:
+            Quoted identifier.
+        """
+        return f"\"{self.config.GetValue(config_type)}\""
+
+    def __ToRawRows(self,
+                    rows: List[Tuple[Any, ...]]) -> Iterator[Tuple[int, str, str, Any]]:
+        """
+        Convert the rows returned by the database to raw rows.
+
+        Args:
+            rows: Rows, as tuples of (email, user, expiration).
+
+        Returns:
+            Iterator over tuples of (row index, email, user string, expiration).
+        """
+        for row_idx, row in enumerate(rows, start=1):
+            yield self.__ToRawRow(row_idx, row)
+
+    @staticmethod
+    def __ToRawRow(row_idx: int,
+                   row: Tuple[Any, ...]) -> Tuple[int, str, str, Any]:
+        """
+        Convert a row returned by the database to a raw row.
+        Dates are converted to datetime objects, as well as texts in ISO format. Other texts are left unchanged,
+        so that they are parsed with the configured date format.
+
+        Args:
+            row_idx: Row index (1-based).
+            row: Row, as tuple of (email, user, expiration).
+
+        Returns:
+            Tuple of (row index, email, user string, expiration).
+        """
+        email, user, expiration = row
+
+        if isinstance(expiration, datetime.date) and not isinstance(expiration, datetime.datetime):
+            expiration = datetime.datetime.combine(expiration, datetime.time())
+        elif isinstance(expiration, str):
+            try:
+                expiration = datetime.datetime.fromisoformat(expiration.strip())
+            except ValueError:
+                pass
+
+        return row_idx, str(email or "").strip(), str(user or "").strip(), expiration
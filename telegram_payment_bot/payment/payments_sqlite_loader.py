@@ -0,0 +1,445 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import datetime
+import os
+import sqlite3
+from contextlib import closing
+from typing import Any, AsyncIterator, Iterator, Optional, Tuple
+from urllib.request import pathname2url
+
+from typing_extensions import override
+
+from telegram_payment_bot.bot.bot_config_types import BotConfigTypes
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.logger.logger import Logger
+from telegram_payment_bot.misc.async_helpers import to_thread
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import (
+    PaymentError,
+    PaymentErrorTypes,
+    PaymentRow,
+    PaymentsDataBase,
+    PaymentsDataErrors,
+    SinglePayment,
+)
+from telegram_payment_bot.payment.payments_data_factory import PaymentsDataFactory
+from telegram_payment_bot.payment.payments_loader_base import PaymentsLoaderBase
+from telegram_payment_bot.payment.payments_row_parser import PaymentsRowParser
+
+
+class PaymentsSqliteLoaderConst:
+    """Constants for payment SQLite loader class."""
+
+    # Keys used for looking up users, in the same way as users are parsed (README suggests indexes on them)
+    USERNAME_KEY_EXPR: str = ("lower(CASE WHEN trim({alias}.\"user\") LIKE '@%' "
+                              "THEN substr(trim({alias}.\"user\"), 2) "
+                              "ELSE trim({alias}.\"user\") END)")
+    USER_ID_KEY_EXPR: str = ("(CASE WHEN trim({alias}.\"user\") LIKE '%.0' "
+                             "THEN substr(trim({alias}.\"user\"), 1, length(trim({alias}.\"user\")) - 2) "
+                             "ELSE trim({alias}.\"user\") END)")
+    # Only existing dates in YYYY-MM-DD format are valid (date() alone would also accept e.g. 'now' or Julian day
+    # numbers, and days not existing in the month, which are only normalized if a modifier is specified)
+    EXPIRATION_EXPR: str = ("(CASE WHEN trim({alias}.expiration) GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]' "
+                            "AND trim({alias}.expiration) >= '0001-01-01' "
+                            "AND date(trim({alias}.expiration), '+0 days') = trim({alias}.expiration) "
+                            "THEN trim({alias}.expiration) END)")
+    # Key used for comparing emails (like PaymentsDataBase.NormalizeEmail, but case folding is ASCII-only)
+    EMAIL_KEY_EXPR: str = "lower(trim(CAST({alias}.email AS TEXT), ' ' || char(9, 10, 11, 12, 13)))"
+
+
+class PaymentsSqliteLoader(PaymentsLoaderBase):
+    """
+    Loader for payment data from SQLite databases.
+    The database is opened read-only. Expiration dates are stored in ISO format (i.e. YYYY-MM-DD), since they are
+    compared directly in queries.
+    Rows are classified in the same way as the other sources: a row is duplicated if a previous valid row has the
+    same user (or the same email, if enabled). Single users, expired and expiring payments are got by queries without
+    loading the whole table, since a row is valid if no previous row of the same user has a valid expiration date.
+    If emails are checked, this only holds if no email is shared by different users, which is checked by the database
+    as well. Otherwise, they are got from all payments, since the valid rows depend on the whole table.
+    """
+
+    SUPPORTS_QUERIES: bool = True
+    # Expiration dates are validated by the database, so rows are never loaded as raw rows
+    SUPPORTS_LAZY_PARSING: bool = False
+
+    shared_emails_warned: bool
+
+    def __init__(self,
+                 config: ConfigObject,
+                 logger: Logger) -> None:
+        """
+        Initialize the SQLite payments loader.
+
+        Args:
+            config: Configuration object.
+            logger: Logger instance.
+        """
+        super().__init__(config, logger)
+        self.shared_emails_warned = False
+
+    @override
+    async def LoadSingleByUser(self,
+                               user: User) -> Optional[SinglePayment]:
+        """
+        Load a single payment by user from SQLite database.
+
+        Args:
+            user: User to load payment for.
+
+        Returns:
+            SinglePayment for the user, or None if not found.
+
+        Raises:
+            Exception: If an error occurs while querying the database.
+        """
+        if not user.IsValid():
+            return None
+        if not await self.__CanQueryPayments(user):
+            return (await self.LoadAll()).GetByUser(user)
+
+        try:
+            payments_data = await self.__QueryPayments(
+                f"{self.__PaymentsQuery()} AND {self.__UserKey('p')} = ? ORDER BY p.rowid LIMIT 1",
+                (str(user.GetAsKey()),)
+            )
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading user {user} from database")
+            raise
+
+        return payments_data.GetByUser(user)
+
+    @override
+    async def LoadExpired(self) -> PaymentsDataBase:
+        """
+        Load expired payments from SQLite database.
+
+        Returns:
+            Payments data containing expired payments, sorted by expiration date.
+        """
+        if not await self.__CanQueryPayments():
+            return await super().LoadExpired()
+        return await self.__LoadExpiringBefore(datetime.date.today())
+
+    @override
+    async def LoadExpiringInDays(self,
+                                 days: int) -> PaymentsDataBase:
+        """
+        Load payments expiring within the specified days from SQLite database.
+
+        Args:
+            days: Number of days.
+
+        Returns:
+            Payments data containing expiring payments, sorted by expiration date.
+        """
+        if not await self.__CanQueryPayments():
+            return await super().LoadExpiringInDays(days)
+        return await self.__LoadExpiringBefore(datetime.date.today() + datetime.timedelta(days=days))
+
+    @override
+    async def _LoadAndCheckAll(self) -> Tuple[PaymentsDataBase, Optional[PaymentsDataErrors]]:
+        """
+        Load and check all payments from SQLite database.
+
+        Returns:
+            Tuple of (payments data, PaymentsDataErrors or None if collected by lazy payments data).
+
+        Raises:
+            Exception: If an error occurs while querying the database.
+        """
+        payment_file = self.config.GetValue(BotConfigTypes.PAYMENT_SQLITE_FILE)
+
+        try:
+            self.logger.GetLogger().info(f"Loading database '{payment_file}'...")
+
+            payments_data, payments_data_err = await super()._LoadAndCheckAll()
+            self.logger.GetLogger().info(
+                f"Database '{payment_file}' successfully loaded, number of rows: {payments_data.LoadedCount()}"
+            )
+
+            return payments_data, payments_data_err
+
+        except Exception:
+            self.logger.GetLogger().exception(f"An error occurred while loading database '{payment_file}'")
+            raise
+
+    @override
+    async def _GetSourceVersion(self) -> Optional[Tuple[Any, ...]]:
+        """
+        Get the database version, i.e. the version of the database file and of its write-ahead log (if any).
+
+        Returns:
+            Tuple of database file and write-ahead log versions, or None if the database cannot be accessed.
+        """
+        payment_file = self.config.GetValue(BotConfigTypes.PAYMENT_SQLITE_FILE)
+
+        db_version = await self._GetFileVersion(payment_file, False)
+        if db_version is None:
+            return None
+        return db_version, await self._GetFileVersion(payment_file + "-wal", False)
+
+    @override
+    async def IterPayments(self) -> AsyncIterator[PaymentRow]:
+        """
+        Iterate over payment rows as they are read, without keeping them in memory.
+        Expiration dates are validated by the database, in the same way as queries do, while duplicated data is
+        detected by the row parser, like for the other sources.
+
+        Returns:
+            Asynchronous iterator over payment rows.
+        """
+        row_parser = PaymentsRowParser(self.config, self.logger)
+        async for row_idx, email, user_str, expiration_date, expiration_str in self._IterRowsInThread(self.__IterTableRows()):
+            user = User.FromString(self.config, user_str)
+            if not user.IsValid():
+                continue
+
+            if expiration_date is None:
+                error = PaymentError(PaymentErrorTypes.INVALID_DATE_ERR, row_idx, user, expiration_str)
+                self.logger.GetLogger().warning(PaymentsRowParser.ErrorToString(error))
+                yield PaymentRow(row_idx, error=error)
+            else:
+                yield row_parser.ParseWithUser(row_idx, email, user, expiration_date)
+
+    @override
+    async def _IterRawRows(self) -> AsyncIterator[Tuple[int, str, str, Any]]:
+        """
+        Iterate over the rows of the table.
+        Rows are read in chunks in a separate thread, not valid expiration dates are returned as None.
+
+        Returns:
+            Asynchronous iterator over tuples of (row index, email, user string, expiration).
+        """
+        async for row_idx, email, user_str, expiration_date, _ in self._IterRowsInThread(self.__IterTableRows()):
+            yield row_idx, email, user_str, expiration_date
+
+    async def __LoadExpiringBefore(self,
+                                   limit_date: datetime.date) -> PaymentsDataBase:
+        """
+        Load payments expiring before the specified date.
+
+        Args:
+            limit_date: Limit date (excluded).
+
+        Returns:
+            Payments data containing the payments, sorted by expiration date.
+
+        Raises:
+            Exception: If an error occurs while querying the database.
+        """
+        expiration = self.__Expiration("p")
+
+        try:
+            return await self.__QueryPayments(
+                f"{self.__PaymentsQuery()} AND {expiration} < ? ORDER BY {expiration}, p.rowid",
+                (limit_date.isoformat(),)
+            )
+        except Exception:
+            self.logger.GetLogger().exception("An error occurred while loading expiring payments from database")
+            raise
+
+    async def __CanQueryPayments(self,
+                                 user: Optional[User] = None) -> bool:
+        """
+        Get if payments can be got by queries, i.e. if emails are not checked or no email is shared by different
+        users (only the emails of the specified user, if any). A warning is logged the first time it is not possible.
+
+        Args:
+            user: User to check emails for (None for checking all emails).
+
+        Returns:
+            True if payments can be got by queries, false otherwise.
+
+        Raises:
+            Exception: If an error occurs while querying the database.
+        """
+        if not self.config.GetValue(BotConfigTypes.PAYMENT_CHECK_DUP_EMAIL):
+            return True
+
+        try:
+            shared_emails = await to_thread(self.__HasSharedEmailsBlocking, user)
+        except Exception:
+            self.logger.GetLogger().exception("An error occurred while checking emails in database")
+            raise
+
+        if shared_emails and not self.shared_emails_warned:
+            self.logger.GetLogger().warning(
+                "Emails shared by different users found in database, payments are got by loading the whole table "
+                "(set payment_check_dup_email to false for always querying them)"
+            )
+            self.shared_emails_warned = True
+        return not shared_emails
+
+    def __HasSharedEmailsBlocking(self,
+                                  user: Optional[User]) -> bool:
+        """
+        Get if any email is shared by different users with a valid expiration date (blocking).
+
+        Args:
+            user: User to check emails for (None for checking all emails).
+
+        Returns:
+            True if any email is shared, false otherwise.
+        """
+        table = self.__Table()
+        email_key = PaymentsSqliteLoaderConst.EMAIL_KEY_EXPR.format(alias="p")
+        user_key = self.__UserKey("p")
+
+        query = (f"SELECT 1 FROM {table} p "
+                 f"WHERE {self.__Expiration('p')} IS NOT NULL AND {user_key} != '' AND {email_key} != '' ")
+        params: Tuple[Any, ...] = ()
+        if user is not None:
+            query += (f"AND {email_key} IN (SELECT {PaymentsSqliteLoaderConst.EMAIL_KEY_EXPR.format(alias='q')} "
+                      f"FROM {table} q WHERE {self.__UserKey('q')} = ? AND {self.__Expiration('q')} IS NOT NULL) ")
+            params = (str(user.GetAsKey()),)
+        query += f"GROUP BY {email_key} HAVING count(DISTINCT {user_key}) > 1 LIMIT 1"
+
+        with closing(self.__Connect()) as conn:
+            return conn.execute(query, params).fetchone() is not None
+
+    async def __QueryPayments(self,
+                              query: str,
+                              params: Tuple[Any, ...]) -> PaymentsDataBase:
+        """
+        Execute a payments query in a separate thread, building payments data from the returned rows.
+
+        Args:
+            query: Query string.
+            params: Query parameters.
+
+        Returns:
+            Payments data.
+        """
+        return await to_thread(self.__QueryPaymentsBlocking, query, params)
+
+    def __QueryPaymentsBlocking(self,
+                                query: str,
+                                params: Tuple[Any, ...]) -> PaymentsDataBase:
+        """
+        Execute a payments query, building payments data from the returned rows (blocking).
+
+        Args:
+            query: Query string.
+            params: Query parameters.
+
+        Returns:
+            Payments data.
+        """
+        payments_data = PaymentsDataFactory(self.config).CreateData()
+        with closing(self.__Connect()) as conn:
+            for _, email, user_str, expiration in conn.execute(query, params):
+                user = User.FromString(self.config, str(user_str).strip())
+                if user.IsValid():
+                    payments_data.AddPayment(str(email or "").strip(), user, datetime.date.fromisoformat(expiration))
+        return payments_data
+
+    def __PaymentsQuery(self) -> str:
+        """
+        Get the query for selecting valid payments, to be completed with further conditions.
+        A row is valid if it has a valid expiration date and no previous row of the same user has one
+        (only valid if emails are not checked or not shared by different users).
+
+        Returns:
+            Query string.
+        """
+        table = self.__Table()
+        expiration = self.__Expiration("p")
+        user_key = self.__UserKey("p")
+        return (f"SELECT p.rowid, p.email, p.\"user\", {expiration} FROM {table} p "
+                f"WHERE {expiration} IS NOT NULL AND {user_key} != '' "
+                f"AND NOT EXISTS (SELECT 1 FROM {table} q WHERE {self.__UserKey('q')} = {user_key} "
+                f"AND q.rowid < p.rowid AND {self.__Expiration('q')} IS NOT NULL)")
+
+    def __Table(self) -> str:
+        """
+        Get the table name.
+
+        Returns:
+            Table name.
+        """
+        return self.config.GetValue(BotConfigTypes.PAYMENT_SQLITE_TABLE)
+
+    def __UserKey(self,
+                  alias: str) -> str:
+        """
+        Get the user key expression for a table alias.
+
+        Args:
+            alias: Table alias.
+
+        Returns:
+            Expression string.
+        """
+        user_key_expr = (PaymentsSqliteLoaderConst.USER_ID_KEY_EXPR
+                         if self.config.GetValue(BotConfigTypes.PAYMENT_USE_USER_ID)
+                         else PaymentsSqliteLoaderConst.USERNAME_KEY_EXPR)
+        return user_key_expr.format(alias=alias)
+
+    @staticmethod
+    def __Expiration(alias: str) -> str:
+        """
+        Get the expiration date expression for a table alias (NULL if the date is not valid).
+
+        Args:
+            alias: Table alias.
+
+        Returns:
+            Expression string.
+        """
+        return PaymentsSqliteLoaderConst.EXPIRATION_EXPR.format(alias=alias)
+
+    def __IterTableRows(self) -> Iterator[Tuple[int, str, str, Optional[datetime.datetime], Any]]:
+        """
+        Iterate over the rows of the table (blocking).
+        The database is opened when the iteration starts and closed as soon as it ends.
+
+        Returns:
+            Iterator over tuples of (row index, email, user string, expiration date (None if not valid),
+            expiration as stored).
+        """
+        with closing(self.__Connect()) as conn:
+            cursor = conn.execute(
+                f"SELECT p.rowid, p.email, p.\"user\", {self.__Expiration('p')}, p.expiration "
+                f"FROM {self.__Table()} p ORDER BY p.rowid"
+            )
+            for row_idx, email, user_str, expiration_date, expiration_str in cursor:
+                yield (row_idx,
+                       str(email or "").strip(),
+                       str(user_str or "").strip(),
+                       datetime.datetime.fromisoformat(expiration_date) if expiration_date is not None else None,
+                       expiration_str)
+
+    def __Connect(self) -> sqlite3.Connection:
+        """
+        Connect to the database in read-only mode, so that it is never modified.
+        The connection can be used by different threads, since rows are read in chunks by the thread pool.
+
+        Returns:
+            Database connection.
+        """
+        payment_file = self.config.GetValue(BotConfigTypes.PAYMENT_SQLITE_FILE)
+        if not os.path.isfile(payment_file):
+            raise FileNotFoundError(f"Database file '{payment_file}' not found")
+
+        return sqlite3.connect(f"file:{pathname2url(os.path.abspath(payment_file))}?mode=ro",
+                               uri=True,
+                               check_same_thread=False)
@@ -18,15 +18,19 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+from typing_extensions import override
+
 from telegram_payment_bot.bot.bot_base import BotBase
 from telegram_payment_bot.bot.bot_config import BotConfig
 from telegram_payment_bot.bot.bot_handlers_config import BotHandlersConfig
 from telegram_payment_bot.payment.payments_check_scheduler import PaymentsCheckScheduler
+from telegram_payment_bot.payment.payments_repository import PaymentsRepository
 
 
 class PaymentBot(BotBase):
     """Payment bot for managing Telegram group payments."""
 
+    payments_repository: PaymentsRepository
     payments_check_scheduler: PaymentsCheckScheduler
 
     def __init__(self,
@@ -40,8 +44,19 @@ class PaymentBot(BotBase):
         super().__init__(config_file,
                          BotConfig,
                          BotHandlersConfig)
+        # Initialize payments repository, shared by all payment consumers
+        self.payments_repository = PaymentsRepository(self.config, self.logger)
         # Initialize payment check scheduler
         self.payments_check_scheduler = PaymentsCheckScheduler(self.client,
                                                                self.config,
                                                                self.logger,
-                                                               self.translator)
+                                                               self.translator,
+                                                               self.payments_repository)
+
+    @override
+    async def Run(self) -> None:
+        """Run the bot, closing the payments repository when stopped."""
+        try:
+            await super().Run()
+        finally:
+            await self.payments_repository.Close()
@@ -0,0 +1,57 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import configparser
+import logging
+
+from telegram_payment_bot.bot.bot_config import BotConfig
+from telegram_payment_bot.config.config_object import ConfigObject
+from telegram_payment_bot.config.config_sections_loader import ConfigSectionsLoader
+
+
+class LoggerStub:
+    """Logger stub, forwarding to the standard logging module."""
+
+    def GetLogger(self) -> logging.Logger:
+        """
+        Get logger.
+
+        Returns:
+            Logger instance.
+        """
+        return logging.getLogger("telegram_payment_bot.tests")
+
+
+def CreatePaymentConfig(**fields: str) -> ConfigObject:
+    """
+    Create a configuration object with the payment section only, applying default values for missing fields.
+
+    Args:
+        **fields: Payment fields, as they would be written in the configuration file.
+
+    Returns:
+        ConfigObject instance.
+    """
+    fields.setdefault("payment_type", "excel_file")
+    fields.setdefault("payment_excel_file", "payments.xlsx")
+
+    config_parser = configparser.ConfigParser()
+    config_parser.read_dict({"payment": fields})
+    return ConfigSectionsLoader(config_parser).LoadSections({"payment": BotConfig["payment"]})
@@ -0,0 +1,289 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import httplib2
+import pygsheets
+import pytest
+from googleapiclient.errors import HttpError
+
+from telegram_payment_bot.google import google_sheet_pool
+from telegram_payment_bot.google.google_request_limiter import GoogleRequestLimiter, GoogleRequestLimiterConst
+from telegram_payment_bot.google.google_sheet_pool import GoogleSheetPool
+from telegram_payment_bot.google.google_sheet_rows_getter import GoogleSheetRowsGetter
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+COLUMNS = {
+    "A": ["Email", "a@test.com", "b@test.com"],
+    "B": ["User", "@a", "@b"],
+}
+
+
+class FakeWorksheet:
+    id = 0
+    title = "Payments"
+
+    def __init__(self, client):
+        self.client = client
+        self.requests = 0
+        self.rows = 0
+
+    def get_values_batch(self, ranges, majdim):
+        assert majdim == "COLUMNS"
+        self.requests += 1
+        if self.client.failures:
+            raise HttpError(httplib2.Response({"status": self.client.failures.pop(0)}), b"")
+        return [[COLUMNS[curr_range.split(":")[0]]] for curr_range in ranges]
+
+    def refresh(self):
+        self.rows = len(self.client.paged_rows)
+
+
+class FakeSpreadsheet:
+    def __init__(self, client, key):
+        self.id = key
+        self.client = SimpleNamespace(oauth=None)
+        self.worksheet = FakeWorksheet(client)
+        self.worksheet.spreadsheet = self
+        self.updated = "2026-01-01T00:00:00.000Z"
+
+    def __getitem__(self, idx):
+        assert idx == 0
+        return self.worksheet
+
+
+class FakeSheetsClient:
+    """Local replacement of the pygsheets client, counting authorizations, opened sheets and page requests."""
+
+    def __init__(self):
+        self.authorize_count = 0
+        self.opened_keys = []
+        self.failures = []
+        self.spreadsheets = {}
+        # Rows returned by get_range, with the delay and the failures of each page (keyed by its first row)
+        self.paged_rows = []
+        self.page_delays = {}
+        self.page_failures = {}
+        self.page_requests = []
+        self.active_requests = 0
+        self.max_active_requests = 0
+        self.lock = threading.Lock()
+
+    def authorize(self, **kwargs):
+        assert kwargs["retries"] == 0
+        self.authorize_count += 1
+        return self
+
+    def open_by_key(self, key):
+        self.opened_keys.append(key)
+        self.spreadsheets[key] = FakeSpreadsheet(self, key)
+        return self.spreadsheets[key]
+
+    def get_range(self, spreadsheet_id, value_ranges, major_dimension):
+        assert spreadsheet_id in self.spreadsheets
+        ranges = [re.fullmatch(r"'Payments'!([A-Z]*)(\d+):\1(\d+)", label).groups() for label in value_ranges]
+        first_row = int(ranges[0][1])
+        with self.lock:
+            self.page_requests.append(first_row)
+            self.active_requests += 1
+            self.max_active_requests = max(self.max_active_requests, self.active_requests)
+        try:
+            time.sleep(self.page_delays.get(first_row, 0.01))
+            if self.page_failures.get(first_row):
+                raise HttpError(httplib2.Response({"status": self.page_failures[first_row].pop(0)}), b"")
+            return [self.__GetValues(col, int(first), int(last), major_dimension) for col, first, last in ranges]
+        finally:
+            with self.lock:
+                self.active_requests -= 1
+
+    def __GetValues(self, col, first_row, last_row, major_dimension):
+        # Like the Google API, trailing empty values are not returned and a range without values is [[""]]
+        rows = self.paged_rows[first_row - 1:last_row]
+        if col:
+            assert major_dimension == "COLUMNS"
+            values = [[row[ord(col) - ord("A")] for row in rows]]
+            values = [values[0][:max((i + 1 for i, value in enumerate(values[0]) if value), default=0)]]
+        else:
+            assert major_dimension == "ROWS"
+            values = [row[:max((i + 1 for i, value in enumerate(row) if value), default=0)]
+                      for row in rows[:max((i + 1 for i, row in enumerate(rows) if any(row)), default=0)]]
+        return values if values and values[0] else [[""]]
+
+
+@pytest.fixture
+def sheets_client(monkeypatch):
+    client = FakeSheetsClient()
+    monkeypatch.setattr(pygsheets, "authorize", client.authorize)
+    monkeypatch.setattr(google_sheet_pool, "Client", lambda *args, **kwargs: client)
+    monkeypatch.setattr(GoogleSheetPool, "handles", {})
+    monkeypatch.setattr(GoogleSheetPool, "limiters", {})
+    monkeypatch.setattr(GoogleRequestLimiterConst, "BACKOFF_BASE_SEC", 0.001)
+    return client
+
+
+def _GetPages(rows_getter, page_size, max_concurrency, cols=None):
+    async def get_pages():
+        return [page async for page in rows_getter.GetRowsPaged(0, page_size, max_concurrency, cols)]
+
+    return asyncio.run(get_pages())
+
+
+def _CreateConfig(cred_file="cred.json", sheet_id="sheet", **fields):
+    return CreatePaymentConfig(
+        payment_type="google_sheet",
+        payment_google_cred_type="service_account",
+        payment_google_cred=cred_file,
+        payment_google_sheet_id=sheet_id,
+        payment_google_cred_path="cred_path",
+        **fields
+    )
+
+
+class TestGoogleSheet:
+
+    def test_handle_reused(self, sheets_client):
+        config = _CreateConfig()
+
+        async def get_columns():
+            for _ in range(2):
+                for rows_getter in (GoogleSheetRowsGetter(config, LoggerStub()),  # type: ignore[arg-type]
+                                    GoogleSheetRowsGetter(config, LoggerStub())):  # type: ignore[arg-type]
+                    assert await rows_getter.GetColumns(0, ["A", "B"]) == [COLUMNS["A"], COLUMNS["B"]]
+
+        asyncio.run(get_columns())
+
+        assert sheets_client.authorize_count == 1
+        assert sheets_client.opened_keys == ["sheet"]
+        assert sheets_client.spreadsheets["sheet"].worksheet.requests == 4
+
+    def test_limiter_per_credentials(self, sheets_client):
+        config = _CreateConfig(payment_google_quota_min="10")
+        other_sheet_config = _CreateConfig(sheet_id="other_sheet", payment_google_quota_min="20")
+        other_cred_config = _CreateConfig(cred_file="other_cred.json", payment_google_quota_min="30")
+
+        assert GoogleSheetPool.GetLimiter(config) is GoogleSheetPool.GetLimiter(other_sheet_config)
+        assert GoogleSheetPool.GetLimiter(config) is not GoogleSheetPool.GetLimiter(other_cred_config)
+        assert GoogleSheetPool.GetLimiter(config).quota_per_min == 10
+        assert GoogleSheetPool.GetLimiter(other_cred_config).quota_per_min == 30
+
+    @pytest.mark.parametrize("status", [429, 500, 503])
+    def test_retry_on_overload(self, sheets_client, status):
+        sheets_client.failures.extend([status, status])
+        rows_getter = GoogleSheetRowsGetter(_CreateConfig(), LoggerStub())  # type: ignore[arg-type]
+
+        columns = asyncio.run(rows_getter.GetColumns(0, ["A"]))
+
+        stats = rows_getter.GetRequestStats()
+        assert columns == [COLUMNS["A"]]
+        assert sheets_client.spreadsheets["sheet"].worksheet.requests == 3
+        assert stats.retries == 2
+        assert stats.failures == 0
+
+    def test_no_retry_on_client_error(self, sheets_client):
+        sheets_client.failures.append(400)
+        rows_getter = GoogleSheetRowsGetter(_CreateConfig(), LoggerStub())  # type: ignore[arg-type]
+
+        with pytest.raises(HttpError):
+            asyncio.run(rows_getter.GetColumns(0, ["A"]))
+
+        stats = rows_getter.GetRequestStats()
+        assert stats.retries == 0
+        assert stats.failures == 1
+
+    def test_retries_exhausted(self, sheets_client):
+        sheets_client.failures.extend([503] * 3)
+        rows_getter = GoogleSheetRowsGetter(
+            _CreateConfig(payment_google_max_retries="1"), LoggerStub()  # type: ignore[arg-type]
+        )
+
+        with pytest.raises(HttpError):
+            asyncio.run(rows_getter.GetColumns(0, ["A"]))
+
+        stats = rows_getter.GetRequestStats()
+        assert sheets_client.spreadsheets["sheet"].worksheet.requests == 2
+        assert stats.retries == 1
+        assert stats.failures == 1
+
+    def test_paged_rows_order(self, sheets_client):
+        sheets_client.paged_rows = [[f"user{i}@test.com", f"@user{i}"] for i in range(1, 11)]
+        # First pages are the slowest, so the following ones complete before them
+        sheets_client.page_delays = {1: 0.2, 3: 0.1}
+        rows_getter = GoogleSheetRowsGetter(_CreateConfig(), LoggerStub())  # type: ignore[arg-type]
+
+        pages = _GetPages(rows_getter, 2, 3)
+
+        assert pages == [sheets_client.paged_rows[i:i + 2] for i in range(0, 10, 2)]
+        assert sorted(sheets_client.page_requests) == [1, 3, 5, 7, 9]
+        assert sheets_client.max_active_requests == 3
+
+    @pytest.mark.parametrize("cols", [None, ["B", "A"]])
+    def test_paged_rows_trailing_empty(self, sheets_client, cols):
+        sheets_client.paged_rows = ([["a@test.com", "@a"], ["", ""], ["", ""]]
+                                    + [["b@test.com", "@b"]]
+                                    + [["", ""]] * 6)
+        rows_getter = GoogleSheetRowsGetter(_CreateConfig(), LoggerStub())  # type: ignore[arg-type]
+
+        pages = _GetPages(rows_getter, 3, 2, cols)
+
+        # Empty rows followed by a non-empty one are kept, even across pages, while the trailing ones are not
+        empty_row = ["", ""] if cols else []
+        rows = ([["@a", "a@test.com"], empty_row, empty_row, ["@b", "b@test.com"]] if cols
+                else [["a@test.com", "@a"], empty_row, empty_row, ["b@test.com", "@b"]])
+        assert pages == [rows[:1], rows[1:]]
+        assert sorted(sheets_client.page_requests) == [1, 4, 7, 10]
+
+    def test_paged_rows_retry(self, sheets_client):
+        sheets_client.paged_rows = [[f"user{i}@test.com", f"@user{i}"] for i in range(1, 7)]
+        sheets_client.page_failures = {3: [429]}
+        rows_getter = GoogleSheetRowsGetter(_CreateConfig(), LoggerStub())  # type: ignore[arg-type]
+
+        pages = _GetPages(rows_getter, 2, 3)
+
+        stats = rows_getter.GetRequestStats()
+        assert pages == [sheets_client.paged_rows[i:i + 2] for i in range(0, 6, 2)]
+        # Only the failing page is fetched again
+        assert sorted(sheets_client.page_requests) == [1, 3, 3, 5]
+        assert stats.retries == 1
+        assert stats.failures == 0
+
+    def test_quota_wait(self):
+        # 10 requests per second, with a bucket of 600 tokens
+        limiter = GoogleRequestLimiter(600, 0)
+
+        async def request():
+            return None
+
+        async def execute_all():
+            start_time = time.monotonic()
+            for _ in range(602):
+                await limiter.Execute(request)
+            return time.monotonic() - start_time
+
+        elapsed_sec = asyncio.run(execute_all())
+
+        assert limiter.Stats().requests == 602
+        assert limiter.Stats().throttled >= 1
+        assert elapsed_sec >= 0.1
@@ -0,0 +1,132 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import datetime
+from typing import AsyncIterator, List, Optional
+
+import pyrogram
+from pyrogram.enums import ChatMemberStatus
+
+from telegram_payment_bot.member.members_payment_getter import MembersPaymentGetter
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentsDataBase, SinglePayment
+from telegram_payment_bot.payment.payments_data_lazy import PaymentsDataLazy
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+USERS_NUM = 1000
+DATE_FORMAT = "%d/%m/%Y"
+
+
+class ClientStub:
+    """Pyrogram client stub, returning a fixed list of chat members."""
+
+    def __init__(self,
+                 members: List[pyrogram.types.ChatMember]) -> None:
+        self.members = members
+
+    async def get_chat_members(self, chat_id, filter=None) -> AsyncIterator[pyrogram.types.ChatMember]:
+        for member in self.members:
+            yield member
+
+
+class RepositoryStub:
+    """Payments repository stub, returning fixed payments data."""
+
+    def __init__(self,
+                 payments: PaymentsDataBase) -> None:
+        self.payments = payments
+
+    async def GetAll(self) -> PaymentsDataBase:
+        return self.payments
+
+
+def _CreateMember(user_id: int,
+                  username: Optional[str]) -> pyrogram.types.ChatMember:
+    return pyrogram.types.ChatMember(
+        status=ChatMemberStatus.MEMBER,
+        user=pyrogram.types.User(id=user_id, username=username)
+    )
+
+
+def _FormatDate(days: int) -> str:
+    return (datetime.date.today() + datetime.timedelta(days=days)).strftime(DATE_FORMAT)
+
+
+def _CreateLazyPayments(config) -> PaymentsDataLazy:
+    payments = PaymentsDataLazy(config)
+    payments.AddRawRow(2, "expired@test.com", User("expired"), _FormatDate(-1))
+    payments.AddRawRow(3, "expiring@test.com", User("expiring"), _FormatDate(5))
+    payments.AddRawRow(4, "ok@test.com", User("ok"), _FormatDate(100))
+    for i in range(USERS_NUM):
+        payments.AddRawRow(i + 5, f"user{i}@test.com", User(f"user{i}"), _FormatDate(100))
+    return payments
+
+
+def _CreateGetter(config, payments: PaymentsDataBase) -> MembersPaymentGetter:
+    members = [
+        _CreateMember(1, "expired"),
+        _CreateMember(2, "expiring"),
+        _CreateMember(3, "ok"),
+        _CreateMember(4, "missing"),
+        _CreateMember(5, None),
+    ]
+    return MembersPaymentGetter(ClientStub(members), config, LoggerStub(), RepositoryStub(payments))  # type: ignore[arg-type]
+
+
+def _GetUnresolvedUsers(payments: PaymentsDataLazy) -> List[str]:
+    return [f"user{i}" for i in range(USERS_NUM) if not isinstance(payments.entries[f"user{i}"], SinglePayment)]
+
+
+class TestMembersPaymentGetter:
+
+    def test_expired_members_lazy(self):
+        config = CreatePaymentConfig(payment_storage_type="lazy")
+        payments = _CreateLazyPayments(config)
+        getter = _CreateGetter(config, payments)
+
+        members = asyncio.run(getter.GetAllMembersWithExpiredPayment(pyrogram.types.Chat(id=-100)))
+
+        assert sorted(member.user.id for member in members) == [1, 4, 5]
+        assert payments.resolved_data is None
+        assert len(_GetUnresolvedUsers(payments)) == USERS_NUM
+
+    def test_expiring_members_lazy(self):
+        config = CreatePaymentConfig(payment_storage_type="lazy")
+        payments = _CreateLazyPayments(config)
+        getter = _CreateGetter(config, payments)
+
+        members = asyncio.run(getter.GetAllMembersWithExpiringPayment(pyrogram.types.Chat(id=-100), 10))
+
+        assert sorted(member.user.id for member in members) == [1, 2, 4, 5]
+        assert payments.resolved_data is None
+        assert len(_GetUnresolvedUsers(payments)) == USERS_NUM
+
+    def test_empty_lazy(self):
+        config = CreatePaymentConfig(payment_storage_type="lazy")
+        payments = PaymentsDataLazy(config)
+        payments.AddRawRow(2, "invalid@test.com", User("invalid"), "not a date")
+        getter = _CreateGetter(config, payments)
+
+        members = asyncio.run(getter.GetAllMembersWithExpiredPayment(pyrogram.types.Chat(id=-100)))
+
+        assert payments.Empty()
+        assert members.Empty()
@@ -0,0 +1,114 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import datetime
+import random
+
+import pytest
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentsData
+from telegram_payment_bot.payment.payments_data_compact import PaymentsDataCompact
+from tests.helpers import CreatePaymentConfig
+
+
+def _CreateRandomPayments(payments_class, seed):
+    rnd = random.Random(seed)
+    payments = payments_class(CreatePaymentConfig(payment_check_dup_email="false"))
+    for i in rnd.sample(range(300), 200):
+        payments.AddPayment(f"email{i}@test.com",
+                            User(f"user{i}"),
+                            datetime.date(2030, 1, 1) + datetime.timedelta(days=rnd.randrange(3)))
+    return payments
+
+
+def _DiffToDict(diff):
+    return {
+        name: {key: (payment.Email(), payment.User().GetAsKey(), payment.ExpirationDate())
+               for key, payment in payments.items()}
+        for name, payments in (("added", diff.Added()),
+                               ("removed", diff.Removed()),
+                               ("renewed", diff.Renewed()),
+                               ("expired", diff.Expired()))
+    }
+
+
+class TestPaymentsData:
+
+    @pytest.mark.parametrize("prev_payments_class", [PaymentsData, PaymentsDataCompact])
+    def test_compact_diff_matches_dict_diff(self, prev_payments_class):
+        dict_diff = _CreateRandomPayments(PaymentsData, 1).Diff(_CreateRandomPayments(PaymentsData, 0))
+        compact_diff = _CreateRandomPayments(PaymentsDataCompact, 1).Diff(_CreateRandomPayments(prev_payments_class, 0))
+
+        assert dict_diff.Any()
+        assert all(_DiffToDict(dict_diff).values())
+        assert _DiffToDict(compact_diff) == _DiffToDict(dict_diff)
+
+    def test_email_index(self):
+        payments = PaymentsData(CreatePaymentConfig(payment_check_dup_email="true"))
+        expiration = datetime.date(2030, 1, 1)
+
+        assert payments.AddPayment("A@Test.com", User("a"), expiration)
+        assert not payments.AddPayment(" a@test.COM ", User("b"), expiration)
+        assert payments.AddPayment("", User("c"), expiration)
+        assert payments.AddPayment("", User("d"), expiration)
+
+        payment = payments.GetByEmail("a@test.com")
+        assert payment is not None
+        assert payment.User().GetAsKey() == "a"
+        assert payments.GetByEmail("") is None
+
+        payments.RemoveSingle(User("a").GetAsKey())
+        assert payments.GetByEmail("a@test.com") is None
+        assert payments.AddPayment("a@test.com", User("b"), expiration)
+
+    def test_email_index_duplicated_emails(self):
+        payments = PaymentsData(CreatePaymentConfig(payment_check_dup_email="false"))
+        expiration = datetime.date(2030, 1, 1)
+        for user in ("a", "b", "c"):
+            assert payments.AddPayment("same@test.com", User(user), expiration)
+
+        def email_user():
+            payment = payments.GetByEmail("same@test.com")
+            return None if payment is None else payment.User().GetAsKey()
+
+        assert email_user() == "a"
+        payments.RemoveSingle(User("b").GetAsKey())
+        assert email_user() == "a"
+        payments.RemoveSingle(User("a").GetAsKey())
+        assert email_user() == "c"
+        payments.RemoveSingle(User("c").GetAsKey())
+        assert email_user() is None
+        assert payments.email_index == {}
+
+    def test_email_index_of_filtered_data(self):
+        payments = PaymentsData(CreatePaymentConfig())
+        today = datetime.date.today()
+        payments.AddPayment("expired@test.com", User("expired"), today - datetime.timedelta(days=1))
+        payments.AddPayment("expiring@test.com", User("expiring"), today + datetime.timedelta(days=2))
+        payments.AddPayment("valid@test.com", User("valid"), today + datetime.timedelta(days=30))
+
+        expired = payments.FilterExpired()
+        expiring = payments.FilterExpiringInDays(7)
+
+        assert expired.GetByEmail("expired@test.com") is not None
+        assert expired.GetByEmail("expiring@test.com") is None
+        assert expiring.GetByEmail("expiring@test.com") is not None
+        assert expiring.GetByEmail("valid@test.com") is None
@@ -0,0 +1,204 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+from collections import Counter
+from typing import Optional
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_http_loader import PaymentsHttpLoader
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+class PaymentsServerStub:
+    """Payments endpoint stub, serving pages with ETag and counting the requests of each page."""
+
+    def __init__(self) -> None:
+        self.pages = {
+            "/payments": {
+                "payments": [{"email": "user1@test.com", "user": "@user1", "expiration": "01/01/2100"}],
+                "next": "/payments/2",
+            },
+            "/payments/2": {
+                "payments": [
+                    {"email": "user2@test.com", "user": "@user2", "expiration": "01/01/2100"},
+                    "not an object",
+                    {"email": "user3@test.com", "user": "@user3", "expiration": "01/01/2000"},
+                ],
+            },
+            "/users/user1": {
+                "payments": [{"email": "user1@test.com", "user": "@user1", "expiration": "01/01/2100"}],
+            },
+        }
+        self.etags = {path: "v1" for path in self.pages}
+        self.requests: Counter = Counter()
+        self.server: Optional[TestServer] = None
+
+    async def Start(self) -> str:
+        app = web.Application()
+        app.router.add_get("/{path:.*}", self.__Handle)
+        server = TestServer(app)
+        await server.start_server()
+        self.server = server
+        return str(server.make_url("/"))
+
+    async def Stop(self) -> None:
+        if self.server is not None:
+            await self.server.close()
+
+    def Update(self, path, page) -> None:
+        self.pages[path] = page
+        self.etags[path] += "1"
+
+    async def __Handle(self, request):
+        path = request.path
+        self.requests[path] += 1
+        if path not in self.pages:
+            raise web.HTTPNotFound()
+        if request.headers.get("If-None-Match") == self.etags[path]:
+            return web.Response(status=304)
+        return web.json_response(self.pages[path], headers={"ETag": self.etags[path]})
+
+
+def _RunWithServer(test_fct, **fields):
+    async def run():
+        server = PaymentsServerStub()
+        url = await server.Start()
+        config = CreatePaymentConfig(
+            payment_type="http_json",
+            payment_http_url=url + "payments",
+            **{name: value.replace("{url}", url) for name, value in fields.items()}
+        )
+        loader = PaymentsHttpLoader(config, LoggerStub())  # type: ignore[arg-type]
+        try:
+            await test_fct(server, loader, url)
+        finally:
+            await loader.Close()
+            await server.Stop()
+
+    asyncio.run(run())
+
+
+class TestPaymentsHttpLoader:
+
+    def test_load_all_pages(self):
+        async def test(server, loader, _):
+            payments = await loader.LoadAll()
+            errors = await loader.CheckForErrors()
+
+            assert payments.Count() == 3
+            assert payments.GetByUser(User("user2")) is not None
+            assert errors.Empty()
+            assert loader.session is not None
+
+        _RunWithServer(test)
+
+    def test_not_modified_reused(self):
+        async def test(server, loader, _):
+            payments = await loader.LoadAll()
+            server.requests.clear()
+
+            assert not await loader.IsSourceModified()
+            assert await loader.LoadAll() is payments
+            assert server.requests == Counter({"/payments": 2, "/payments/2": 2})
+
+        _RunWithServer(test)
+
+    def test_later_page_modified(self):
+        async def test(server, loader, _):
+            await loader.LoadAll()
+            server.Update("/payments/2", {
+                "payments": [{"email": "user4@test.com", "user": "@user4", "expiration": "01/01/2100"}],
+            })
+            server.requests.clear()
+
+            assert await loader.IsSourceModified()
+            payments = await loader.LoadAll()
+
+            assert payments.Count() == 2
+            assert payments.GetByUser(User("user4")) is not None
+            # The modified page is downloaded once, while checking if the source was modified
+            assert server.requests == Counter({"/payments": 3, "/payments/2": 2})
+            assert not await loader.IsSourceModified()
+
+        _RunWithServer(test)
+
+    def test_missing_page_raises(self):
+        async def test(server, loader, _):
+            server.pages["/payments"]["next"] = "/payments/missing"
+
+            with pytest.raises(aiohttp.ClientResponseError):
+                await loader.LoadAll()
+
+        _RunWithServer(test)
+
+    def test_single_user_endpoint(self):
+        async def test(server, loader, url):
+            payment = await loader.LoadSingleByUser(User("user1"))
+
+            assert payment is not None
+            assert payment.Email() == "user1@test.com"
+            assert await loader.LoadSingleByUser(User("user9")) is None
+
+        _RunWithServer(test, payment_http_user_url="{url}users/{user}")
+
+    def test_close(self):
+        async def test(server, loader, _):
+            await loader.LoadAll()
+            session = loader.session
+            await loader.Close()
+
+            assert session.closed
+            assert loader.session is None
+
+        _RunWithServer(test)
+
+    def test_row_indexes_count_skipped_payments(self):
+        async def test(server, loader, _):
+            page = dict(server.pages["/payments/2"])
+            page["next"] = "/payments/3"
+            server.Update("/payments/2", page)
+            server.pages["/payments/3"] = {
+                "payments": [{"email": "user5@test.com", "user": "@user5", "expiration": "not a date"}],
+            }
+            server.etags["/payments/3"] = "v1"
+
+            errors = await loader.CheckForErrors()
+
+            assert [error.Row() for error in errors] == [5]
+
+        _RunWithServer(test)
+
+    def test_looping_pages(self):
+        async def test(server, loader, _):
+            page = dict(server.pages["/payments/2"])
+            page["next"] = "/payments"
+            server.Update("/payments/2", page)
+
+            with pytest.raises(ValueError):
+                await loader.LoadAll()
+            assert server.requests == Counter({"/payments": 1, "/payments/2": 1})
+
+        _RunWithServer(test)
@@ -0,0 +1,120 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import csv
+import random
+
+import pytest
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_csv_loader import PaymentsCsvLoader
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+ROWS_NUM = 2000
+USERS_NUM = 150
+EMAILS_NUM = 100
+
+
+def _CreateDuplicatedRows():
+    rnd = random.Random(0)
+    rows = []
+    for _ in range(ROWS_NUM):
+        user = f"@user{rnd.randrange(USERS_NUM)}" if rnd.random() > 0.05 else ""
+        email = f"email{rnd.randrange(EMAILS_NUM)}@test.com" if rnd.random() > 0.1 else ""
+        expiration = (f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(2000, 2100)}"
+                      if rnd.random() > 0.3
+                      else "not a date")
+        rows.append((email, user, expiration))
+    return rows
+
+
+def _PaymentToTuple(payment):
+    return None if payment is None else (payment.Email(), payment.User().GetAsKey(), payment.ExpirationDate())
+
+
+class TestPaymentsLoader:
+
+    @pytest.mark.parametrize("check_dup_email", ["true", "false"])
+    def test_load_single_by_user_matches_load_all(self, tmp_path, check_dup_email):
+        file_name = tmp_path / "payments.csv"
+        with open(file_name, "w", newline="", encoding="utf-8") as fout:
+            writer = csv.writer(fout)
+            writer.writerow(("Email", "User", "Expiration"))
+            writer.writerows(_CreateDuplicatedRows())
+
+        config = CreatePaymentConfig(
+            payment_type="csv_file",
+            payment_csv_file=str(file_name),
+            payment_check_dup_email=check_dup_email
+        )
+
+        async def load_all_and_single():
+            loader = PaymentsCsvLoader(config, LoggerStub())  # type: ignore[arg-type]
+            payments = await loader.LoadAll()
+            users = [User(f"user{i}") for i in range(USERS_NUM + 1)]
+            singles = [await loader.LoadSingleByUser(user) for user in users]
+            return [payments.GetByUser(user) for user in users], singles
+
+        all_payments, single_payments = asyncio.run(load_all_and_single())
+
+        assert any(payment is not None for payment in all_payments)
+        assert any(payment is None for payment in all_payments)
+        assert [_PaymentToTuple(p) for p in single_payments] == [_PaymentToTuple(p) for p in all_payments]
+
+    @pytest.mark.parametrize("rows_cache_size", ["0", "50", "100000"])
+    def test_rows_cache(self, tmp_path, rows_cache_size):
+        file_name = tmp_path / "payments.csv"
+        rows = _CreateDuplicatedRows()
+
+        def write_rows(rows_to_write):
+            with open(file_name, "w", newline="", encoding="utf-8") as fout:
+                writer = csv.writer(fout)
+                writer.writerow(("Email", "User", "Expiration"))
+                writer.writerows(rows_to_write)
+
+        config = CreatePaymentConfig(
+            payment_type="csv_file",
+            payment_csv_file=str(file_name),
+            payment_rows_cache_size=rows_cache_size
+        )
+
+        async def load_twice():
+            loader = PaymentsCsvLoader(config, LoggerStub())  # type: ignore[arg-type]
+            write_rows(rows)
+            await loader.LoadAll()
+            rows_cells = loader.rows_cells
+            # Change the first row, so that the file version changes
+            write_rows([("changed@test.com", "@changed", "01/01/2030")] + rows[1:])
+            payments = await loader.LoadAll()
+            return rows_cells, payments
+
+        rows_cells, payments = asyncio.run(load_twice())
+        cache_size = int(rows_cache_size)
+
+        if cache_size == 0:
+            assert rows_cells is None
+        else:
+            assert rows_cells is not None
+            assert 0 < len(rows_cells) <= cache_size
+        changed_payment = payments.GetByUser(User("changed"))
+        assert changed_payment is not None
+        assert changed_payment.Email() == "changed@test.com"
@@ -0,0 +1,79 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import csv
+import datetime
+
+import pytest
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_csv_loader import PaymentsCsvLoader
+from telegram_payment_bot.payment.payments_data import PaymentErrorTypes
+from telegram_payment_bot.payment.payments_multi_source_loader import PaymentsMultiSourceLoader
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+SOURCES_ROWS = (
+    [("alice@test.com", "@alice", "01/01/2030"),
+     ("shared@test.com", "@bob", "01/01/2030"),
+     # Email duplicated within the source, which allows it
+     ("same@test.com", "@dave", "01/01/2030"),
+     ("same@test.com", "@erin", "01/01/2030")],
+    [("alice@test.com", "@alice", "01/01/2031"),
+     ("shared@test.com", "@carol", "01/01/2031")],
+)
+
+
+def _CreateCsvLoader(file_name, rows, check_dup_email):
+    with open(file_name, "w", newline="", encoding="utf-8") as fout:
+        writer = csv.writer(fout)
+        writer.writerow(("Email", "User", "Expiration"))
+        writer.writerows(rows)
+    config = CreatePaymentConfig(payment_type="csv_file",
+                                 payment_csv_file=str(file_name),
+                                 payment_check_dup_email=check_dup_email)
+    return PaymentsCsvLoader(config, LoggerStub())  # type: ignore[arg-type]
+
+
+class TestPaymentsMultiSourceLoader:
+
+    @pytest.mark.parametrize("check_dup_email", ["true", "false"])
+    def test_merge_keeps_cross_source_duplicated_email(self, tmp_path, check_dup_email):
+        loaders = [_CreateCsvLoader(tmp_path / f"payments{i}.csv", rows, "false" if i == 0 else "true")
+                   for i, rows in enumerate(SOURCES_ROWS)]
+        config = CreatePaymentConfig(payment_check_dup_email=check_dup_email)
+        loader = PaymentsMultiSourceLoader(config, LoggerStub(), loaders)  # type: ignore[arg-type]
+
+        load_result = asyncio.run(loader.LoadResult())
+
+        payments = load_result.Data()
+        assert payments.Count() == 5
+        for user in ("alice", "bob", "carol", "dave", "erin"):
+            assert payments.GetByUser(User(user)) is not None
+        alice_payment = payments.GetByUser(User("alice"))
+        assert alice_payment is not None
+        assert alice_payment.ExpirationDate() == datetime.date(2031, 1, 1)
+
+        errors = load_result.Errors()
+        assert all(error.Type() == PaymentErrorTypes.CROSS_SOURCE_CONFLICT_ERR for error in errors)
+        # Both users of the email duplicated across sources are reported, the ones of the same source are not
+        expected_users = ["alice", "bob", "carol"] if check_dup_email == "true" else ["alice"]
+        assert sorted(error.User().GetAsKey() for error in errors) == expected_users
@@ -0,0 +1,161 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import datetime
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentsData, PaymentsDataErrors
+from telegram_payment_bot.payment.payments_load_result import PaymentsLoadResult
+from telegram_payment_bot.payment.payments_repository import PaymentsRepository
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+class LoaderStub:
+    """Loader returning a new load result at each load, optionally waiting to be released."""
+
+    def __init__(self, config):
+        self.config = config
+        self.loads_count = 0
+        self.single_loads_count = 0
+        self.release_event = None
+        self.active_count = 0
+        self.max_active_count = 0
+        self.closed = False
+
+    async def LoadResult(self):
+        assert not self.closed
+        self.loads_count += 1
+        version = self.loads_count
+        self.__Enter()
+        try:
+            if self.release_event is not None:
+                await self.release_event.wait()
+        finally:
+            self.active_count -= 1
+
+        payments = PaymentsData(self.config)
+        payments.AddPayment(f"email{version}@test.com", User(f"user{version}"), datetime.date(2030, 1, 1))
+        return PaymentsLoadResult(payments, PaymentsDataErrors(), version)
+
+    async def LoadSingleByUser(self, user):
+        assert not self.closed
+        self.single_loads_count += 1
+        self.__Enter()
+        await asyncio.sleep(0)
+        self.active_count -= 1
+
+    def Invalidate(self):
+        pass
+
+    async def Close(self):
+        assert self.active_count == 0
+        self.closed = True
+
+    def __Enter(self):
+        self.active_count += 1
+        self.max_active_count = max(self.max_active_count, self.active_count)
+
+
+def _CreateRepository():
+    config = CreatePaymentConfig()
+    repository = PaymentsRepository(config, LoggerStub())  # type: ignore[arg-type]
+    loader = LoaderStub(config)
+    repository.payments_loader = loader  # type: ignore[assignment]
+    return repository, loader
+
+
+def _Users(payments):
+    return [payment.User().GetAsKey() for payment in payments.Values()]
+
+
+class TestPaymentsRepository:
+
+    def test_errors_share_cached_load(self):
+        repository, loader = _CreateRepository()
+
+        async def get_all_and_errors():
+            await asyncio.gather(repository.GetAll(), repository.CheckForErrors())
+            errors = await repository.CheckForErrors()
+            payments = await repository.GetAll()
+            return payments, errors
+
+        payments, errors = asyncio.run(get_all_and_errors())
+
+        assert loader.loads_count == 1
+        assert _Users(payments) == ["user1"]
+        assert not errors.Any()
+
+    def test_invalidate_during_load(self):
+        repository, loader = _CreateRepository()
+
+        async def invalidate_during_load():
+            loader.release_event = asyncio.Event()
+            first_load = asyncio.ensure_future(repository.GetAll())
+            await asyncio.sleep(0)
+            repository.Invalidate()
+            second_load = asyncio.ensure_future(repository.GetAll())
+            await asyncio.sleep(0)
+            loader.release_event.set()
+            return await first_load, await second_load, await repository.GetAll()
+
+        first_payments, second_payments, cached_payments = asyncio.run(invalidate_during_load())
+
+        # The invalidated load is returned to its callers but not cached
+        assert loader.loads_count == 2
+        assert _Users(first_payments) == ["user1"]
+        assert _Users(second_payments) == ["user2"]
+        assert cached_payments is second_payments
+
+    def test_single_user_during_load(self):
+        repository, loader = _CreateRepository()
+
+        async def get_single_during_load():
+            loader.release_event = asyncio.Event()
+            load = asyncio.ensure_future(repository.GetAll())
+            await asyncio.sleep(0)
+            single = asyncio.ensure_future(repository.GetSingleByUser(User("user1")))
+            await asyncio.sleep(0)
+            loader.release_event.set()
+            await load
+            return await single
+
+        payment = asyncio.run(get_single_during_load())
+
+        # The single user is got from the payments loaded meanwhile
+        assert loader.max_active_count == 1
+        assert loader.single_loads_count == 0
+        assert payment is not None
+        assert payment.User().GetAsKey() == "user1"
+
+    def test_close_during_load(self):
+        repository, loader = _CreateRepository()
+
+        async def close_during_load():
+            loader.release_event = asyncio.Event()
+            load = asyncio.ensure_future(repository.GetAll())
+            await asyncio.sleep(0)
+            await repository.Close()
+            return await asyncio.gather(load, return_exceptions=True)
+
+        load_results = asyncio.run(close_during_load())
+
+        assert loader.closed
+        assert isinstance(load_results[0], asyncio.CancelledError)
@@ -0,0 +1,180 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import datetime
+import sqlite3
+
+import pytest
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_sql_loader import PaymentsSqlLoader
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+def _Date(days):
+    return (datetime.date.today() + datetime.timedelta(days=days)).isoformat()
+
+
+# Rows as (id, email, user, expiration), inserted in a different order than the id one
+ROWS = [
+    (4, "a2@test.com", "@UserA", _Date(-10)),
+    (1, "a1@test.com", "usera", _Date(30)),
+    (2, "b1@test.com", "@userb", "not a date"),
+    (6, "b2@test.com", "userB", _Date(-5)),
+    (3, "c1@test.com", "@userc", _Date(5)),
+    (5, "d1@test.com", "userd", _Date(-1)),
+    (7, "d2@test.com", "@@userd", _Date(100)),
+]
+
+# Rows with emails duplicated by other users
+DUP_EMAIL_ROWS = [
+    (1, "a1@test.com", "usera", _Date(30)),
+    (2, "A1@test.com", "userb", _Date(-5)),
+    (3, "b2@test.com", "userb", _Date(-3)),
+    (4, "b2@test.com", "userc", _Date(5)),
+    (5, "c2@test.com", "userc", _Date(-1)),
+    (6, "c2@test.com", "userd", _Date(-2)),
+]
+
+
+def _CreateDatabase(file_name, user_type="TEXT", rows=ROWS):
+    with sqlite3.connect(file_name) as conn:
+        conn.execute(
+            f'CREATE TABLE "Payments" ("Id" INTEGER, "Email" TEXT, "TelegramUser" {user_type}, "Expiration" TEXT)'
+        )
+        conn.executemany('INSERT INTO "Payments" VALUES (?, ?, ?, ?)', rows)
+
+
+def _CreateLoader(file_name, **fields):
+    config = CreatePaymentConfig(
+        payment_type="sql_database",
+        payment_db_url=f"sqlite:///{file_name}",
+        payment_db_table="Payments",
+        payment_db_order_col="Id",
+        payment_email_col="Email",
+        payment_user_col="TelegramUser",
+        payment_expiration_col="Expiration",
+        **fields
+    )
+    return PaymentsSqlLoader(config, LoggerStub())  # type: ignore[arg-type]
+
+
+def _ToTuples(payments):
+    return [(p.User().GetAsKey(), p.Email(), p.ExpirationDate()) for p in payments.Values()]
+
+
+class TestPaymentsSqlLoader:
+
+    def test_rows_ordered_by_order_column(self, tmp_path):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name)
+        loader = _CreateLoader(file_name)
+
+        async def load():
+            try:
+                return await loader.LoadAll(), await loader.LoadSingleByUser(User("usera"))
+            finally:
+                await loader.Close()
+
+        payments, single_payment = asyncio.run(load())
+
+        assert payments.GetByUser(User("usera")).Email() == "a1@test.com"
+        assert single_payment is not None
+        assert single_payment.Email() == "a1@test.com"
+        assert payments.GetByUser(User("userb")).Email() == "b2@test.com"
+        # A leading @ only is removed, like when users are parsed
+        assert payments.GetByUser(User("@userd")).Email() == "d2@test.com"
+
+    def test_expiring_filtered_by_valid_row(self, tmp_path):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name)
+        loader = _CreateLoader(file_name)
+
+        async def load():
+            try:
+                payments = await loader.LoadAll()
+                return (payments.FilterExpired(),
+                        await loader.LoadExpired(),
+                        payments.FilterExpiringInDays(10),
+                        await loader.LoadExpiringInDays(10))
+            finally:
+                await loader.Close()
+
+        all_expired, expired, all_expiring, expiring = asyncio.run(load())
+
+        assert _ToTuples(expired) == _ToTuples(all_expired)
+        assert sorted(user for user, _, _ in _ToTuples(expired)) == ["userb", "userd"]
+        assert _ToTuples(expiring) == _ToTuples(all_expiring)
+
+    def test_user_ids(self, tmp_path):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name, "REAL", [(1, "a@test.com", 123.0, _Date(-1)), (2, "b@test.com", 456, _Date(10))])
+        loader = _CreateLoader(file_name, payment_use_user_id="true")
+
+        async def load():
+            try:
+                return await loader.LoadSingleByUser(User(123)), await loader.LoadExpired()
+            finally:
+                await loader.Close()
+
+        single_payment, expired = asyncio.run(load())
+
+        assert single_payment is not None
+        assert single_payment.Email() == "a@test.com"
+        assert [user for user, _, _ in _ToTuples(expired)] == [123]
+
+    @pytest.mark.parametrize("check_dup_email", ["true", "false"])
+    def test_queries_match_load_all(self, tmp_path, check_dup_email):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name, rows=DUP_EMAIL_ROWS)
+        loader = _CreateLoader(file_name, payment_check_dup_email=check_dup_email)
+        users = [User(f"user{c}") for c in "abcde"]
+
+        async def load():
+            try:
+                payments = await loader.LoadAll()
+                return (payments,
+                        await loader.LoadExpired(),
+                        await loader.LoadExpiringInDays(10),
+                        [await loader.LoadSingleByUser(user) for user in users])
+            finally:
+                await loader.Close()
+
+        payments, expired, expiring, singles = asyncio.run(load())
+
+        assert _ToTuples(expired) == _ToTuples(payments.FilterExpired())
+        assert _ToTuples(expiring) == _ToTuples(payments.FilterExpiringInDays(10))
+        assert ([None if p is None else (p.Email(), p.ExpirationDate()) for p in singles] ==
+                [None if p is None else (p.Email(), p.ExpirationDate()) for p in map(payments.GetByUser, users)])
+
+    def test_missing_database(self, tmp_path):
+        file_name = tmp_path / "missing.db"
+        loader = _CreateLoader(file_name)
+
+        async def load():
+            try:
+                return await loader.LoadAll()
+            finally:
+                await loader.Close()
+
+        with pytest.raises(FileNotFoundError):
+            asyncio.run(load())
+        assert not file_name.exists()
@@ -0,0 +1,194 @@
+# Copyright (c) 2026 Emanuele Bellocchia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import asyncio
+import datetime
+import logging
+import os
+import sqlite3
+
+import pytest
+
+from telegram_payment_bot.misc.user import User
+from telegram_payment_bot.payment.payments_data import PaymentErrorTypes
+from telegram_payment_bot.payment.payments_sqlite_loader import PaymentsSqliteLoader
+from tests.helpers import CreatePaymentConfig, LoggerStub
+
+
+def _Date(days):
+    return (datetime.date.today() + datetime.timedelta(days=days)).isoformat()
+
+
+# Rows as (email, user, expiration)
+ROWS = [
+    ("x@test.com", "@usera", _Date(30)),
+    ("x@test.com", "userb", _Date(-3)),
+    ("y@test.com", "@userb", _Date(20)),
+    ("z@test.com", "userc", "now"),
+    ("z@test.com", "userc", "2461234.5"),
+    ("w@test.com", "userc", "2026-02-30"),
+    ("w@test.com", "userd", _Date(-1)),
+    ("v@test.com", "@@usere", _Date(5)),
+    ("u@test.com", "usere", _Date(-2)),
+]
+
+
+def _CreateDatabase(file_name, rows=ROWS):
+    with sqlite3.connect(file_name) as conn:
+        conn.execute('CREATE TABLE payments (email TEXT, "user" TEXT, expiration TEXT)')
+        conn.executemany("INSERT INTO payments VALUES (?, ?, ?)", rows)
+    conn.close()
+
+
+def _CreateLoader(file_name, **fields):
+    config = CreatePaymentConfig(payment_type="sqlite", payment_sqlite_file=str(file_name), **fields)
+    return PaymentsSqliteLoader(config, LoggerStub())  # type: ignore[arg-type]
+
+
+def _ToTuples(payments):
+    return [(p.User().GetAsKey(), p.Email(), p.ExpirationDate()) for p in payments.Values()]
+
+
+def _PaymentToTuple(payment):
+    return None if payment is None else (payment.User().GetAsKey(), payment.Email(), payment.ExpirationDate())
+
+
+class TestPaymentsSqliteLoader:
+
+    @pytest.mark.parametrize("check_dup_email", ["true", "false"])
+    def test_queries_match_load_all(self, tmp_path, check_dup_email):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name)
+        loader = _CreateLoader(file_name, payment_check_dup_email=check_dup_email)
+        users = [User(name) for name in ("usera", "userb", "userc", "userd", "usere", "@usere", "userf")]
+
+        async def load():
+            payments = await loader.LoadAll()
+            singles = [await loader.LoadSingleByUser(user) for user in users]
+            return (payments,
+                    singles,
+                    await loader.LoadExpired(),
+                    await loader.LoadExpiringInDays(10))
+
+        payments, singles, expired, expiring = asyncio.run(load())
+
+        assert [_PaymentToTuple(p) for p in singles] == [_PaymentToTuple(payments.GetByUser(user)) for user in users]
+        assert _ToTuples(expired) == _ToTuples(payments.FilterExpired())
+        assert _ToTuples(expiring) == _ToTuples(payments.FilterExpiringInDays(10))
+
+    def test_dup_email_queries(self, tmp_path, caplog):
+        file_name = tmp_path / "payments.db"
+        # Emails differing only by spaces and case are shared, emails of rows without a valid date are not
+        _CreateDatabase(file_name, ROWS + [(" X@Test.com\t", "userf", _Date(2))])
+        loader = _CreateLoader(file_name)
+
+        async def load(users):
+            return ([await loader.LoadSingleByUser(user) for user in users],
+                    await loader.LoadExpired(),
+                    await loader.LoadExpiringInDays(10))
+
+        # Emails of usere and userd are not shared by other users with a valid date, so they are queried directly
+        singles = [asyncio.run(loader.LoadSingleByUser(User(name))) for name in ("usere", "userd")]
+        assert loader.load_result is None
+        assert [_PaymentToTuple(p)[:2] for p in singles] == [("usere", "u@test.com"), ("userd", "w@test.com")]
+
+        # Email of usera is shared, so all payments are loaded
+        with caplog.at_level(logging.WARNING):
+            singles, expired, expiring = asyncio.run(load([User("usera"), User("userb"), User("userf")]))
+        payments = asyncio.run(_CreateLoader(file_name).LoadAll())
+        assert loader.load_result is not None
+        assert [_PaymentToTuple(p) for p in singles] == [_PaymentToTuple(payments.GetByUser(User(name)))
+                                                          for name in ("usera", "userb", "userf")]
+        assert _ToTuples(expired) == _ToTuples(payments.FilterExpired())
+        assert _ToTuples(expiring) == _ToTuples(payments.FilterExpiringInDays(10))
+        assert len([r for r in caplog.records if "Emails shared" in r.getMessage()]) == 1
+
+    def test_dup_email_queries_not_shared(self, tmp_path):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name, [row for row in ROWS if row[0] != "x@test.com"])
+        loader = _CreateLoader(file_name)
+        users = [User(name) for name in ("userb", "userc", "userd", "usere", "@usere")]
+
+        async def load():
+            return ([await loader.LoadSingleByUser(user) for user in users],
+                    await loader.LoadExpired(),
+                    await loader.LoadExpiringInDays(10))
+
+        singles, expired, expiring = asyncio.run(load())
+        payments = asyncio.run(_CreateLoader(file_name).LoadAll())
+
+        assert loader.load_result is None
+        assert [_PaymentToTuple(p) for p in singles] == [_PaymentToTuple(payments.GetByUser(user)) for user in users]
+        assert _ToTuples(expired) == _ToTuples(payments.FilterExpired())
+        assert _ToTuples(expiring) == _ToTuples(payments.FilterExpiringInDays(10))
+
+    def test_duplicated_rows_rules(self, tmp_path):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name)
+        loader = _CreateLoader(file_name)
+
+        async def load():
+            return await loader.LoadAll(), await loader.CheckForErrors()
+
+        payments, errors = asyncio.run(load())
+
+        # Row 2 is duplicated by email, so the following valid row of the same user is taken (and its email is free)
+        assert payments.GetByUser(User("userb")).Email() == "y@test.com"
+        # Rows of userc have no valid date, so their emails are not taken
+        assert payments.GetByUser(User("userd")).Email() == "w@test.com"
+        # Only a leading @ is removed
+        assert payments.GetByUser(User("@usere")).Email() == "v@test.com"
+        assert payments.GetByUser(User("usere")).Email() == "u@test.com"
+        assert [(err.Row(), err.Type()) for err in errors] == [
+            (2, PaymentErrorTypes.DUPLICATED_DATA_ERR),
+            (4, PaymentErrorTypes.INVALID_DATE_ERR),
+            (5, PaymentErrorTypes.INVALID_DATE_ERR),
+            (6, PaymentErrorTypes.INVALID_DATE_ERR),
+        ]
+
+    def test_user_ids(self, tmp_path):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name, [("a@test.com", "123.0", _Date(-1)), ("b@test.com", 456, _Date(10))])
+        loader = _CreateLoader(file_name, payment_use_user_id="true", payment_check_dup_email="false")
+
+        async def load():
+            return await loader.LoadSingleByUser(User(123)), await loader.LoadExpired()
+
+        single_payment, expired = asyncio.run(load())
+
+        assert _PaymentToTuple(single_payment) == (123, "a@test.com", datetime.date.fromisoformat(_Date(-1)))
+        assert [user for user, _, _ in _ToTuples(expired)] == [123]
+
+    def test_database_not_modified(self, tmp_path):
+        file_name = tmp_path / "payments.db"
+        _CreateDatabase(file_name)
+        stat = os.stat(file_name)
+        loader = _CreateLoader(file_name, payment_check_dup_email="false")
+
+        async def load():
+            await loader.LoadAll()
+            await loader.LoadExpired()
+            await loader.LoadSingleByUser(User("usera"))
+            return await loader.IsSourceModified()
+
+        assert not asyncio.run(load())
+        assert (os.stat(file_name).st_mtime_ns, os.stat(file_name).st_size) == (stat.st_mtime_ns, stat.st_size)
+        with sqlite3.connect(file_name) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index'").fetchone() == (0,)